@@ -8,13 +8,30 @@ Task Registry Service (svc_task_core) - мікросервіс управлін
 Версія 2.0.0 - додано комплексування з веб-інтерфейсом.
 """
 
+import json
+import uuid
 import uvicorn
 import mysql.connector
-from fastapi import FastAPI, HTTPException, status
+from mysql.connector import errorcode
+from collections import Counter
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi import Body, FastAPI, Header, HTTPException, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
-from models import TaskCreateRequest, APIResponse, TaskViewModel
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from typing import Any, List, Optional
+from config import DBConfig
+from models import (
+    TaskCreateRequest, APIResponse, TaskViewModel, BulkCreateResponse, BulkItemError,
+    TaskStatusChange, TaskStatusOutcome, BatchStatusResponse
+)
 from registry import ServiceRegistryClient
+from db_pool import get_pool, pools_stats, close_all_pools, PoolTimeoutError
+from db_executor import offload, run_db, executor_stats, shutdown_executor
+from pagination import encode_cursor, decode_cursor, InvalidCursorError
+from health import prober
+from etag import make_etag, etag_matches
 
 # Ініціалізація FastAPI додатку
 app = FastAPI(
@@ -48,57 +65,317 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "DELETE", "PATCH"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "ETag"],
 )
 
 
+def acquire_connection(pool):
+    """
+    Отримання з'єднання з пулу.
+    Вичерпаний пул (таймаут очікування) перетворюється на HTTP 503.
+    """
+    try:
+        return pool.acquire()
+    except PoolTimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Database pool exhausted: {str(e)}"
+        )
+
+
+def require_db_config() -> dict:
+    """
+    Service Discovery для операцій запису: конфігурація БД з Реєстру.
+    Відсутній запис або недоступний Реєстр перетворюються на HTTP 503.
+    """
+    try:
+        # Шукаємо конфіг для ключа svc_task_core (визначено в ПЗ-3)
+        db_config = ServiceRegistryClient.get_db_config('svc_task_core')
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Registry Error: {str(e)}"
+        )
+    if not db_config:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database config not found in Registry"
+        )
+    return db_config
+
+
+INSERT_TASK_SQL = """
+    INSERT INTO Tasks (User_ID, Category_ID, Title, Description, Priority, DueDate)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+# Пакетна вставка з міткою запиту (migrations/003_tasks_bulk_token.sql)
+INSERT_TASK_BULK_SQL = """
+    INSERT INTO Tasks (User_ID, Category_ID, Title, Description, Priority, DueDate, BulkToken)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+# Життєвий цикл завдання: Pending -> In_Progress -> Completed
+VALID_STATUSES = ['Pending', 'In_Progress', 'Completed']
+
+
+def task_values(task: TaskCreateRequest) -> tuple:
+    """Параметри INSERT_TASK_SQL для одного завдання."""
+    return (
+        task.user_id,
+        task.category_id,
+        task.title,
+        task.description,
+        task.priority,
+        task.due_date
+    )
+
+
 # ============================================================================
 # ЕНДПОІНТИ ДЛЯ ВЕБ-ІНТЕРФЕЙСУ (ПЗ №5)
 # ============================================================================
 
+def collection_etag(cursor, collection: str, *parts):
+    """
+    ETag колекції: версії з CollectionVersions (DBConfig.ETAG) + параметри
+    запиту. Якщо відбиток недоступний (наприклад, не застосовано
+    міграцію), повертає None - відповідь формується без ETag.
+    """
+    try:
+        cursor.execute(DBConfig.ETAG[collection])
+        fingerprint = cursor.fetchall()
+    except mysql.connector.Error:
+        return None
+    return make_etag(collection, fingerprint, *parts)
+
+
+def bump_version(conn, cursor, collection: str):
+    """
+    Збільшення версії колекції для ETag (DBConfig.BUMP_VERSION). Викликається
+    один раз на транзакцію запису, останнім перед COMMIT: рядок версії
+    блокується лише до кінця транзакції. Без таблиці CollectionVersions (не
+    застосовано міграцію) нічого не робить.
+    """
+    try:
+        cursor.execute(DBConfig.BUMP_VERSION, (collection, conn.connection_id % DBConfig.ETAG_SHARDS))
+    except mysql.connector.ProgrammingError as e:
+        if e.errno != errorcode.ER_NO_SUCH_TABLE:
+            raise
+
+
+def not_modified(etag: str) -> Response:
+    """Відповідь 304 Not Modified для умовного GET."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
+
 @app.get("/categories", tags=["Web UI"])
-def get_categories():
+@offload
+def get_categories(response: Response, if_none_match: Optional[str] = Header(None)):
     """
     Отримання списку категорій для випадаючого списку у веб-формі.
     Використовується для заповнення <select> елемента на фронтенді.
+    
+    Підтримує умовний GET: ETag / If-None-Match -> 304 Not Modified.
     """
     db_config = ServiceRegistryClient.get_db_config('svc_task_core')
     if not db_config:
         return []
     
-    conn = mysql.connector.connect(**db_config)
+    pool = get_pool(db_config)
+    conn = acquire_connection(pool)
     cursor = conn.cursor(dictionary=True)
     try:
+        etag = collection_etag(cursor, "categories")
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        
         cursor.execute("SELECT idCategory, CategoryName FROM Categories")
-        return cursor.fetchall()
+        rows = cursor.fetchall()
+        if etag:
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
+        return rows
     finally:
         cursor.close()
-        conn.close()
+        pool.release(conn)
 
 
 @app.get("/tasks", response_model=List[TaskViewModel], tags=["Web UI"])
-def get_tasks():
+@offload
+def get_tasks(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    cursor: Optional[str] = Query(None, description="Курсор наступної сторінки (заголовок X-Next-Cursor)"),
+    limit: int = Query(
+        DBConfig.PAGINATION['default_limit'], ge=1, le=DBConfig.PAGINATION['max_limit'],
+        description="Розмір сторінки"
+    )
+):
     """
-    Отримання списку завдань для дашборду.
-    Повертає останні 20 завдань з інформацією про категорію.
+    Отримання списку завдань для дашборду (від нових до старих).
+    
+    Курсорна пагінація: якщо є наступна сторінка, її курсор повертається
+    у заголовку X-Next-Cursor (та Link: rel="next"). Вартість сторінки не
+    залежить від її глибини (індекс CreatedAt, idTask).
+    
+    Підтримує умовний GET: ETag / If-None-Match -> 304 Not Modified.
     """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     db_config = ServiceRegistryClient.get_db_config('svc_task_core')
     if not db_config:
         return []
 
-    conn = mysql.connector.connect(**db_config)
-    cursor = conn.cursor(dictionary=True)
+    pool = get_pool(db_config)
+    conn = acquire_connection(pool)
+    db_cursor = conn.cursor(dictionary=True)
     try:
+        etag = collection_etag(db_cursor, "tasks", cursor, limit)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        
         query = """
-        SELECT t.idTask, t.Title, t.Priority, t.Status, t.DueDate, c.CategoryName
+        SELECT t.idTask, t.Title, t.Priority, t.Status, t.DueDate, c.CategoryName, t.CreatedAt
         FROM Tasks t
         LEFT JOIN Categories c ON t.Category_ID = c.idCategory
-        ORDER BY t.CreatedAt DESC LIMIT 20
         """
-        cursor.execute(query)
-        return cursor.fetchall()
+        params = []
+        if after:
+            # Рядковий порівняльний вираз розкривається явно, щоб MySQL
+            # використав діапазонне сканування індексу idx_tasks_created_id
+            query += """
+        WHERE t.CreatedAt < %s OR (t.CreatedAt = %s AND t.idTask < %s)
+        """
+            params.extend([after[0], after[0], after[1]])
+        query += """
+        ORDER BY t.CreatedAt DESC, t.idTask DESC LIMIT %s
+        """
+        # Один зайвий рядок показує, чи існує наступна сторінка
+        params.append(limit + 1)
+        db_cursor.execute(query, params)
+        rows = db_cursor.fetchall()
     finally:
-        cursor.close()
-        conn.close()
+        db_cursor.close()
+        pool.release(conn)
+
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last["CreatedAt"], last["idTask"])
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'</tasks?cursor={next_cursor}&limit={limit}>; rel="next"'
+    return rows
+
+
+@app.get(
+    "/tasks/export",
+    response_class=StreamingResponse,
+    tags=["Tasks"],
+    summary="Потокове вивантаження завдань (NDJSON)"
+)
+async def export_tasks(
+    status_filter: Optional[str] = Query(None, alias="status", description="Pending, In_Progress, Completed"),
+    priority: Optional[str] = Query(None, pattern='^(Low|Medium|High)$'),
+    created_from: Optional[datetime] = Query(None, description="CreatedAt >= created_from"),
+    created_to: Optional[datetime] = Query(None, description="CreatedAt < created_to")
+):
+    """
+    Вивантаження всіх завдань у форматі NDJSON (один JSON-об'єкт на рядок).
+    
+    Рядки читаються небуферизованим (server-side) курсором пачками по
+    DBConfig.EXPORT['fetch_size'] і одразу передаються клієнту, тож пам'ять
+    сервісу не залежить від розміру таблиці, а перші байти надходять
+    до завершення читання результату.
+    """
+    if status_filter and status_filter not in VALID_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid status. Must be one of: {VALID_STATUSES}"
+        )
+    
+    query = """
+    SELECT t.idTask, t.User_ID, t.Category_ID, c.CategoryName, t.Title, t.Description,
+           t.Priority, t.Status, t.DueDate, t.CreatedAt
+    FROM Tasks t
+    LEFT JOIN Categories c ON t.Category_ID = c.idCategory
+    WHERE 1=1
+    """
+    params = []
+    if status_filter:
+        query += " AND t.Status = %s"
+        params.append(status_filter)
+    if priority:
+        query += " AND t.Priority = %s"
+        params.append(priority)
+    if created_from:
+        query += " AND t.CreatedAt >= %s"
+        params.append(created_from)
+    if created_to:
+        query += " AND t.CreatedAt < %s"
+        params.append(created_to)
+    query += " ORDER BY t.CreatedAt DESC, t.idTask DESC"
+    
+    db_config = await run_db(require_db_config)
+    pool = get_pool(db_config)
+    conn = await run_db(acquire_connection, pool)
+    try:
+        # Курсор mysql.connector за замовчуванням небуферизований
+        cursor = conn.cursor(dictionary=True)
+        await run_db(cursor.execute, query, params)
+    except Exception as e:
+        pool.release(conn, discard=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    
+    return StreamingResponse(
+        stream_rows_ndjson(pool, conn, cursor),
+        media_type="application/x-ndjson"
+    )
+
+
+async def stream_rows_ndjson(pool, conn, cursor):
+    """
+    Генератор NDJSON: читає курсор пачками та повертає з'єднання в пул.
+    Якщо клієнт відключився до кінця, з'єднання з непрочитаним результатом
+    закривається, а не повертається в пул.
+    """
+    completed = False
+    try:
+        while True:
+            rows = await run_db(cursor.fetchmany, DBConfig.EXPORT['fetch_size'])
+            if not rows:
+                break
+            yield "".join(
+                json.dumps(row, default=json_default, ensure_ascii=False) + "\n" for row in rows
+            )
+        completed = True
+    finally:
+        if completed:
+            cursor.close()
+        pool.release(conn, discard=not completed)
+
+
+def json_default(value):
+    """Серіалізація типів MySQL, яких не знає json (дати, Decimal)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
 
 
 # ============================================================================
@@ -122,14 +399,53 @@ def root():
 def health_check():
     """
     Перевірка здоров'я сервісу та доступності залежностей.
+    Повертає результат останньої фонової перевірки (health.py) без звернень до БД.
     """
-    registry_available = ServiceRegistryClient.check_service_health('svc_task_core')
+    snapshot = prober.snapshot()
     return {
-        "status": "healthy" if registry_available else "degraded",
-        "registry_available": registry_available
+        "status": "healthy" if snapshot["ready"] else "degraded",
+        "registry_available": snapshot["registry_available"],
+        "database_available": snapshot["database_available"],
+        "checked_at": snapshot["checked_at"]
     }
 
 
+@app.get("/health/live", tags=["Health Check"])
+def liveness():
+    """
+    Liveness-проба: процес працює та обслуговує запити. Не звертається до залежностей.
+    """
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", tags=["Health Check"])
+def readiness(response: Response):
+    """
+    Readiness-проба: кешований результат фонової перевірки Реєстру та бізнес-БД.
+    Повертає 503, поки залежності недоступні.
+    """
+    snapshot = prober.snapshot()
+    if not snapshot["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return snapshot
+
+
+@app.get("/debug/pool", tags=["Health Check"])
+def debug_pool():
+    """
+    Стан пулів з'єднань з БД: видані, вільні з'єднання та очікування.
+    """
+    return {"pools": pools_stats(), "executor": executor_stats()}
+
+
+@app.get("/debug/registry-cache", tags=["Health Check"])
+def debug_registry_cache():
+    """
+    Лічильники кешу Service Discovery: влучання, промахи та фонові оновлення.
+    """
+    return ServiceRegistryClient.cache_stats()
+
+
 @app.post(
     "/tasks",
     status_code=status.HTTP_201_CREATED,
@@ -152,6 +468,7 @@ def health_check():
     автоматично створює запис у таблиці Reminders.
     """
 )
+@offload
 def create_task(task: TaskCreateRequest):
     """
     Створення нового завдання в системі.
@@ -170,46 +487,21 @@ def create_task(task: TaskCreateRequest):
     cursor = None
     
     # 1. Service Discovery: Отримуємо доступ до БД через Реєстр
-    try:
-        # Шукаємо конфіг для ключа svc_task_core (визначено в ПЗ-3)
-        db_config = ServiceRegistryClient.get_db_config('svc_task_core')
-        if not db_config:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Database config not found in Registry"
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Registry Error: {str(e)}"
-        )
+    db_config = require_db_config()
 
     # 2. Підключення до бізнес-БД
     try:
-        conn = mysql.connector.connect(**db_config)
+        pool = get_pool(db_config)
+        conn = acquire_connection(pool)
         cursor = conn.cursor()
         
         # Початок транзакції для забезпечення ACID
         conn.start_transaction()
         
         # 3. Вставка завдання
-        sql = """
-            INSERT INTO Tasks (User_ID, Category_ID, Title, Description, Priority, DueDate)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        vals = (
-            task.user_id,
-            task.category_id,
-            task.title,
-            task.description,
-            task.priority,
-            task.due_date
-        )
-        
-        cursor.execute(sql, vals)
+        cursor.execute(INSERT_TASK_SQL, task_values(task))
         new_task_id = cursor.lastrowid
+        bump_version(conn, cursor, "tasks")
         
         # 4. Commit транзакції
         # Тут автоматично спрацює тригер AfterTaskInsert (ПЗ-2),
@@ -243,7 +535,164 @@ def create_task(task: TaskCreateRequest):
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            pool.release(conn)
+
+
+@app.post(
+    "/tasks/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=BulkCreateResponse,
+    tags=["Tasks"],
+    summary="Пакетне створення завдань",
+    description="""
+    Створює до DBConfig.BULK['max_items'] завдань за один запит.
+    
+    **Алгоритм виконання:**
+    1. Валідація кожного елемента масиву моделлю TaskCreateRequest
+    2. Одна транзакція: INSERT пачками по DBConfig.BULK['chunk_size'] (executemany)
+       з міткою запиту; ID рядків пачок читаються назад одним SELECT за міткою
+    3. Якщо пачка відхилена БД, її елементи вставляються поодинці,
+       щоб визначити, які саме записи некоректні
+    4. COMMIT транзакції (тригер AfterTaskInsert спрацьовує для кожного рядка)
+    
+    Відповідь містить ID створених завдань та помилки з індексами елементів.
+    """
+)
+@offload
+def create_tasks_bulk(response: Response, tasks: List[Any] = Body(...)):
+    """
+    Пакетне створення завдань.
+    
+    Args:
+        tasks (List): Масив об'єктів у форматі TaskCreateRequest
+        
+    Returns:
+        BulkCreateResponse: ID створених завдань та помилки по елементах
+        
+    Raises:
+        HTTPException 413: Забагато елементів
+        HTTPException 503: Реєстр сервісів недоступний
+    """
+    if len(tasks) > DBConfig.BULK['max_items']:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many tasks: {len(tasks)} (max {DBConfig.BULK['max_items']})"
+        )
+    
+    # 1. Валідація всіх елементів до звернення до БД
+    valid = []
+    errors = []
+    for index, item in enumerate(tasks):
+        try:
+            valid.append((index, TaskCreateRequest.model_validate(item)))
+        except ValidationError as e:
+            errors.append(BulkItemError(index=index, error=format_validation_error(e)))
+    
+    created = []
+    if valid:
+        created, db_errors = insert_tasks_bulk(require_db_config(), valid)
+        errors.extend(db_errors)
+        errors.sort(key=lambda err: err.index)
+    
+    if not created:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+    return BulkCreateResponse(
+        success=not errors,
+        created=len(created),
+        task_ids=[task_id for _, task_id in sorted(created)],
+        errors=errors,
+        message=f"Created {len(created)} of {len(tasks)} tasks"
+    )
+
+
+def insert_tasks_bulk(db_config: dict, items: list) -> tuple:
+    """
+    Вставка провалідованих завдань в одній транзакції.
+    
+    Args:
+        items (list): Пари (індекс у запиті, TaskCreateRequest)
+        
+    Returns:
+        tuple: ([(індекс, task_id)], [BulkItemError])
+    """
+    chunk_size = DBConfig.BULK['chunk_size']
+    created = []
+    errors = []
+    # Рядки пачок позначаються міткою запиту: значення AUTO_INCREMENT паралельних
+    # вставок можуть перемежовуватися (innodb_autoinc_lock_mode = 2), тому ID
+    # читаються назад, а не обчислюються з lastrowid
+    token = uuid.uuid4().hex
+    batched = []
+    first_id = None
+    
+    pool = get_pool(db_config)
+    conn = acquire_connection(pool)
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            cursor.execute("SAVEPOINT bulk_chunk")
+            try:
+                # executemany переписує пачку в один багаторядковий INSERT
+                cursor.executemany(INSERT_TASK_BULK_SQL, [(*task_values(task), token) for _, task in chunk])
+                if first_id is None:
+                    first_id = cursor.lastrowid
+                batched.extend(index for index, _ in chunk)
+                continue
+            except mysql.connector.Error:
+                cursor.execute("ROLLBACK TO SAVEPOINT bulk_chunk")
+            
+            # Пачку відхилено: поодинокі вставки визначають некоректні елементи
+            for index, task in chunk:
+                cursor.execute("SAVEPOINT bulk_item")
+                try:
+                    cursor.execute(INSERT_TASK_SQL, task_values(task))
+                    created.append((index, cursor.lastrowid))
+                except mysql.connector.IntegrityError as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT bulk_item")
+                    errors.append(BulkItemError(index=index, error=f"Integrity Error: {e.msg}"))
+                except mysql.connector.Error as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT bulk_item")
+                    errors.append(BulkItemError(index=index, error=f"Database Error: {e.msg}"))
+        
+        if batched:
+            # ID кожного рядка пачки не менший за lastrowid першої пачки і зростає
+            # в порядку рядків і пачок: діапазон первинного ключа + мітка
+            cursor.execute(
+                "SELECT idTask FROM Tasks WHERE idTask >= %s AND BulkToken = %s ORDER BY idTask",
+                (first_id, token)
+            )
+            task_ids = [row[0] for row in cursor.fetchall()]
+            if len(task_ids) != len(batched):
+                raise mysql.connector.DatabaseError(
+                    msg=f"Bulk insert returned {len(task_ids)} of {len(batched)} rows"
+                )
+            created.extend(zip(batched, task_ids))
+        
+        if created:
+            bump_version(conn, cursor, "tasks")
+        # Тригер AfterTaskInsert (ПЗ-2) спрацьовує для кожного вставленого рядка
+        conn.commit()
+        return created, errors
+    
+    except mysql.connector.Error as e:
+        conn.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Database Error: {str(e)}"
+        )
+    finally:
+        cursor.close()
+        pool.release(conn)
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Стислий текст помилки валідації Pydantic для одного елемента."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'item'}: {err['msg']}"
+        for err in error.errors()
+    )
 
 
 @app.get(
@@ -251,6 +700,7 @@ def create_task(task: TaskCreateRequest):
     tags=["Tasks"],
     summary="Отримання завдання за ID"
 )
+@offload
 def get_task(task_id: int):
     """
     Отримання інформації про завдання за його ID.
@@ -272,7 +722,8 @@ def get_task(task_id: int):
                 detail="Database config not found in Registry"
             )
         
-        conn = mysql.connector.connect(**db_config)
+        pool = get_pool(db_config)
+        conn = acquire_connection(pool)
         cursor = conn.cursor(dictionary=True)
         
         sql = "SELECT * FROM Tasks WHERE idTask = %s"
@@ -298,7 +749,121 @@ def get_task(task_id: int):
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            pool.release(conn)
+
+
+@app.patch(
+    "/tasks/status/batch",
+    response_model=BatchStatusResponse,
+    tags=["Tasks"],
+    summary="Пакетне оновлення статусів завдань"
+)
+@offload
+def update_task_status_batch(changes: List[TaskStatusChange]):
+    """
+    Оновлення статусів кількох завдань в одній транзакції.
+    
+    Рядки блокуються одним SELECT ... FOR UPDATE, після чого для кожного
+    цільового статусу виконується один UPDATE ... WHERE idTask IN (...).
+    
+    Args:
+        changes (List[TaskStatusChange]): Пари (task_id, new_status)
+        
+    Returns:
+        BatchStatusResponse: Результат для кожного завдання
+    """
+    if len(changes) > DBConfig.BULK['max_items']:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many changes: {len(changes)} (max {DBConfig.BULK['max_items']})"
+        )
+    
+    # Завдання, що зустрічаються кілька разів, не оновлюються: порядок змін неоднозначний
+    counts = Counter(change.task_id for change in changes)
+    results = {}
+    requested = {}
+    for change in changes:
+        if change.task_id in results or change.task_id in requested:
+            continue
+        if counts[change.task_id] > 1:
+            results[change.task_id] = TaskStatusOutcome(
+                task_id=change.task_id, new_status=change.new_status, outcome="duplicate",
+                detail="Task ID appears more than once in the batch"
+            )
+        elif change.new_status not in VALID_STATUSES:
+            results[change.task_id] = TaskStatusOutcome(
+                task_id=change.task_id, new_status=change.new_status, outcome="invalid_status",
+                detail=f"Must be one of: {VALID_STATUSES}"
+            )
+        else:
+            requested[change.task_id] = change.new_status
+    
+    if requested:
+        found = apply_status_changes(require_db_config(), requested)
+        for task_id, new_status in requested.items():
+            results[task_id] = TaskStatusOutcome(
+                task_id=task_id, new_status=new_status,
+                outcome="updated" if task_id in found else "not_found"
+            )
+    
+    # Порядок результатів - порядок першої появи task_id у запиті
+    outcomes = [results[task_id] for task_id in counts]
+    updated = [o.task_id for o in outcomes if o.outcome == "updated"]
+    not_found = [o.task_id for o in outcomes if o.outcome == "not_found"]
+    return BatchStatusResponse(
+        success=len(updated) == len(outcomes),
+        updated=updated,
+        not_found=not_found,
+        results=outcomes,
+        message=f"Updated {len(updated)} of {len(outcomes)} tasks"
+    )
+
+
+def apply_status_changes(db_config: dict, requested: dict) -> set:
+    """
+    Застосовує зміни статусів множинними UPDATE в одній транзакції.
+    
+    Args:
+        requested (dict): task_id -> новий статус
+        
+    Returns:
+        set: ID завдань, що існують (і були оновлені)
+    """
+    pool = get_pool(db_config)
+    conn = acquire_connection(pool)
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        
+        ids = list(requested)
+        placeholders = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"SELECT idTask FROM Tasks WHERE idTask IN ({placeholders}) FOR UPDATE", ids)
+        found = {row[0] for row in cursor.fetchall()}
+        
+        by_status = {}
+        for task_id in found:
+            by_status.setdefault(requested[task_id], []).append(task_id)
+        for new_status, task_ids in by_status.items():
+            placeholders = ", ".join(["%s"] * len(task_ids))
+            cursor.execute(
+                f"UPDATE Tasks SET Status = %s WHERE idTask IN ({placeholders})",
+                [new_status, *task_ids]
+            )
+        if found:
+            bump_version(conn, cursor, "tasks")
+        
+        conn.commit()
+        return found
+    
+    except mysql.connector.Error as e:
+        conn.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    finally:
+        cursor.close()
+        pool.release(conn)
 
 
 @app.patch(
@@ -306,6 +871,7 @@ def get_task(task_id: int):
     tags=["Tasks"],
     summary="Оновлення статусу завдання"
 )
+@offload
 def update_task_status(task_id: int, new_status: str):
     """
     Оновлення статусу завдання (управління життєвим циклом).
@@ -316,11 +882,10 @@ def update_task_status(task_id: int, new_status: str):
         task_id (int): ID завдання
         new_status (str): Новий статус (Pending, In_Progress, Completed)
     """
-    valid_statuses = ['Pending', 'In_Progress', 'Completed']
-    if new_status not in valid_statuses:
+    if new_status not in VALID_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {valid_statuses}"
+            detail=f"Invalid status. Must be one of: {VALID_STATUSES}"
         )
     
     conn = None
@@ -334,7 +899,8 @@ def update_task_status(task_id: int, new_status: str):
                 detail="Database config not found in Registry"
             )
         
-        conn = mysql.connector.connect(**db_config)
+        pool = get_pool(db_config)
+        conn = acquire_connection(pool)
         cursor = conn.cursor()
         
         conn.start_transaction()
@@ -348,6 +914,7 @@ def update_task_status(task_id: int, new_status: str):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Task with ID {task_id} not found"
             )
+        bump_version(conn, cursor, "tasks")
         
         conn.commit()
         
@@ -370,7 +937,19 @@ def update_task_status(task_id: int, new_status: str):
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            pool.release(conn)
+
+
+@app.on_event("startup")
+def startup():
+    prober.start()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    prober.stop()
+    shutdown_executor()
+    close_all_pools()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+"""
+Бенчмарк режимів виконання (benchmark_async.py)
+Simple Task Manager - svc_task_core
+
+Порівнює пропускну здатність GET /tasks у режимах 'sync' (пул потоків
+Starlette) та 'async' (корутини + виділений пул потоків, db_executor.py)
+при 50, 200 та 1000 одночасних клієнтах.
+
+Щоб результат залежав від моделі виконання, а не від стану конкретної БД,
+MySQL замінено з'єднанням з фіксованою затримкою запиту (--latency), яка,
+як і справжній драйвер, блокує потік та звільняє GIL.
+
+Запуск:
+    python benchmark_async.py
+    python benchmark_async.py --latency 0.02 --requests 4000 --concurrency 50 200 1000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import httpx
+
+from app import app
+from config import DBConfig
+from db_executor import shutdown_executor
+from db_pool import close_all_pools
+
+
+DB_CONFIG = {'host': 'localhost', 'user': 'bench', 'password': '', 'database': 'bench'}
+
+
+class SimulatedCursor:
+    """Курсор, що імітує виконання запиту із заданою затримкою."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def execute(self, query, params=None):
+        time.sleep(self.latency)
+
+    def fetchall(self):
+        return [{
+            "idTask": i, "Title": f"Task {i}", "Priority": "Medium",
+            "Status": "Pending", "DueDate": None, "CategoryName": "Bench",
+            "CreatedAt": datetime(2025, 1, 1)
+        } for i in range(20, 0, -1)]
+
+    def close(self):
+        pass
+
+
+class SimulatedConnection:
+    """З'єднання з фіксованою затримкою запитів."""
+
+    in_transaction = False
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def cursor(self, **kwargs):
+        return SimulatedCursor(self.latency)
+
+    def ping(self, reconnect=False):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+async def run_level(concurrency: int, total: int) -> dict:
+    """Виконує total запитів GET /tasks силами concurrency клієнтів."""
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        remaining = total
+        errors = 0
+
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                response = await client.get("/tasks")
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async execution mode")
+    parser.add_argument("--latency", type=float, default=0.05, help="DB query latency, seconds")
+    parser.add_argument("--requests", type=int, default=3000, help="requests per level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--json", dest="json_path", help="write results to a JSON file")
+    args = parser.parse_args()
+
+    results = []
+    with patch('app.ServiceRegistryClient.get_db_config', return_value=DB_CONFIG), \
+         patch('db_pool.mysql.connector.connect',
+               side_effect=lambda **kw: SimulatedConnection(args.latency)):
+        for mode in ("sync", "async"):
+            DBConfig.EXECUTOR['mode'] = mode
+            for concurrency in args.concurrency:
+                close_all_pools()
+                result = asyncio.run(run_level(concurrency, args.requests))
+                result["mode"] = mode
+                results.append(result)
+                print(f"{mode:>5}  c={concurrency:<5} {result['rps']:>9.1f} req/s  "
+                      f"errors={result['errors']}")
+            shutdown_executor()
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"latency": args.latency, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
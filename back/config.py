@@ -16,6 +16,69 @@ class DBConfig:
         'database': 'taskmanager_service_registry'
     }
 
+    # Параметри пулу з'єднань з бізнес-БД (див. db_pool.py)
+    POOL = {
+        'pool_size': 16,       # постійні з'єднання
+        'max_overflow': 48,    # додаткові з'єднання під піковим навантаженням
+        'timeout': 5.0,        # очікування вільного з'єднання, сек
+        'ping_interval': 30.0  # перевіряти з'єднання, що простояло довше, сек
+    }
+
+    # Режим виконання обробників (див. db_executor.py):
+    # 'async' - корутини + виділений пул потоків для БД, 'sync' - пул потоків Starlette.
+    # Кожен потік тримає щонайбільше одне з'єднання, тому розмір збігається з пулом.
+    EXECUTOR = {
+        'mode': 'async',
+        'max_workers': POOL['pool_size'] + POOL['max_overflow']
+    }
+
+    # Пагінація GET /tasks (див. pagination.py)
+    PAGINATION = {
+        'default_limit': 20,
+        'max_limit': 100
+    }
+
+    # Пакетне створення завдань POST /tasks/bulk
+    BULK = {
+        'max_items': 1000,  # максимум елементів в одному запиті
+        'chunk_size': 200   # рядків в одному executemany
+    }
+
+    # Потокове вивантаження GET /tasks/export
+    EXPORT = {
+        'fetch_size': 1000  # рядків за один fetchmany
+    }
+
+    # Фонова перевірка залежностей для /health/ready (див. health.py)
+    HEALTH = {
+        'interval': 5.0  # секунд між перевірками
+    }
+
+    # Відбитки колекцій для ETag (див. etag.py): суми версій з таблиці
+    # CollectionVersions (migrations/002_collection_versions.sql), читання за
+    # первинним ключем. /tasks показує CategoryName, тому його ETag залежить і
+    # від версії категорій
+    ETAG = {
+        'categories': "SELECT Collection, SUM(Version) FROM CollectionVersions "
+                      "WHERE Collection = 'categories' GROUP BY Collection",
+        'tasks': "SELECT Collection, SUM(Version) FROM CollectionVersions "
+                 "WHERE Collection IN ('tasks', 'categories') "
+                 "GROUP BY Collection ORDER BY Collection"
+    }
+
+    # Збільшення версії колекції: один раз на транзакцію запису, останнім перед
+    # COMMIT. Рядок обирається за connection_id % ETAG_SHARDS, тож паралельні
+    # транзакції не чекають на блокування одного рядка
+    ETAG_SHARDS = 16
+    BUMP_VERSION = ("UPDATE CollectionVersions SET Version = Version + 1 "
+                    "WHERE Collection = %s AND Shard = %s")
+
+    # Кеш Service Discovery (див. registry.py)
+    DISCOVERY_CACHE = {
+        'ttl': 60.0,          # час життя знайденої конфігурації, сек
+        'negative_ttl': 10.0  # час життя запису "сервіс не знайдено", сек
+    }
+
 
 def get_registry_connection():
     """
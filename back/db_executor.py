@@ -0,0 +1,83 @@
+"""
+Виконавець блокуючих операцій з БД (db_executor.py)
+Simple Task Manager - svc_task_core
+
+mysql.connector - блокуючий драйвер. Синхронні обробники FastAPI виконуються
+у спільному пулі потоків Starlette (за замовчуванням ~40 потоків), тому
+кількість одночасних запитів обмежена ним незалежно від навантаження на CPU.
+
+В асинхронному режимі (DBConfig.EXECUTOR['mode'] == 'async') обробники стають
+корутинами, а блокуюча робота з БД виконується у виділеному пулі потоків,
+розмір якого узгоджений з пулом з'єднань (db_pool.py).
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.concurrency import run_in_threadpool
+
+from config import DBConfig
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Повертає (створює при першому виклику) виділений пул потоків для БД."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DBConfig.EXECUTOR['max_workers'],
+                    thread_name_prefix="db-worker"
+                )
+    return _executor
+
+
+async def run_db(func, *args, **kwargs):
+    """
+    Виконує блокуючу функцію поза event loop.
+
+    'async' - у виділеному пулі потоків; 'sync' - у пулі потоків Starlette
+    (поведінка звичайних `def` обробників).
+    """
+    if DBConfig.EXECUTOR['mode'] == 'async':
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_executor(), functools.partial(func, *args, **kwargs)
+        )
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
+def offload(func):
+    """
+    Декоратор для синхронного обробника FastAPI: перетворює його на корутину,
+    яка виконує тіло обробника через run_db(). Сигнатура зберігається
+    (functools.wraps), тому FastAPI бачить ті самі параметри та моделі.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_db(func, *args, **kwargs)
+    return wrapper
+
+
+def executor_stats() -> dict:
+    """Параметри виконавця для моніторингу."""
+    return {
+        "mode": DBConfig.EXECUTOR['mode'],
+        "max_workers": DBConfig.EXECUTOR['max_workers'],
+        "started": _executor is not None,
+    }
+
+
+def shutdown_executor():
+    """Зупинка виділеного пулу потоків (завершення роботи сервісу)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
@@ -0,0 +1,260 @@
+"""
+Пул з'єднань з бізнес-БД (db_pool.py)
+Simple Task Manager - svc_task_core
+
+Замість відкриття нового з'єднання MySQL на кожен HTTP-запит
+(TCP + автентифікація) сервіс використовує спільний для процесу пул:
+фіксована кількість постійних з'єднань, обмежений overflow понад неї,
+таймаут очікування вільного з'єднання та перевірка "простоялих" з'єднань.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import mysql.connector
+
+from config import DBConfig
+
+
+class PoolTimeoutError(Exception):
+    """
+    Виняток: за відведений час не вдалося отримати з'єднання з пулу.
+    """
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        super().__init__(f"Timed out after {timeout:.1f}s waiting for a database connection")
+
+
+class ConnectionPool:
+    """
+    Потокобезпечний пул з'єднань mysql.connector.
+
+    - pool_size: кількість з'єднань, які пул тримає відкритими постійно;
+    - max_overflow: скільки додаткових з'єднань можна відкрити під піковим
+      навантаженням (закриваються одразу після повернення);
+    - timeout: максимальний час очікування вільного з'єднання (секунди);
+    - ping_interval: з'єднання, що простояло довше, перевіряється перед видачею.
+    """
+
+    def __init__(self, db_config: dict, pool_size: int = 5, max_overflow: int = 10,
+                 timeout: float = 5.0, ping_interval: float = 30.0):
+        self.db_config = dict(db_config)
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+
+        self._idle = deque()  # (conn, час повернення в пул)
+        self._cond = threading.Condition()
+        self._total = 0       # відкриті з'єднання (idle + видані)
+        self._in_use = 0
+        self._waiting = 0
+
+        # Лічильники для /debug/pool
+        self._created = 0
+        self._discarded = 0
+        self._wait_count = 0
+        self._timeouts = 0
+
+    # ------------------------------------------------------------------
+    # Отримання / повернення з'єднань
+    # ------------------------------------------------------------------
+
+    def acquire(self):
+        """
+        Видає з'єднання з пулу.
+
+        Raises:
+            PoolTimeoutError: Якщо вільне з'єднання не з'явилося за timeout
+            mysql.connector.Error: Якщо не вдалося відкрити нове з'єднання
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn, idle_since, create = self._reserve(deadline)
+            if create:
+                try:
+                    conn = mysql.connector.connect(**self.db_config)
+                except Exception:
+                    self._forget()
+                    raise
+                with self._cond:
+                    self._created += 1
+                return conn
+
+            if self._is_healthy(conn, idle_since):
+                return conn
+            # З'єднання "вмерло" під час простою - відкидаємо та пробуємо ще раз
+            self._close_quietly(conn)
+            self._forget()
+
+    def release(self, conn, discard: bool = False):
+        """
+        Повертає з'єднання в пул.
+
+        Незавершена транзакція відкочується. Overflow-з'єднання та
+        з'єднання, позначені discard=True, закриваються.
+        """
+        if conn is None:
+            return
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            keep = not discard and self._total <= self.pool_size
+            self._in_use -= 1
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._total -= 1
+                self._discarded += 1
+            self._cond.notify()
+
+        if not keep:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self):
+        """Контекстний менеджер: acquire() ... release()."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Закриває всі вільні з'єднання (видані закриються при поверненні)."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self._discarded += len(idle)
+            self.pool_size = 0
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> dict:
+        """Знімок стану пулу для моніторингу."""
+        with self._cond:
+            return {
+                "database": self.db_config.get("database"),
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "timeout": self.timeout,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "total": self._total,
+                "waiting": self._waiting,
+                "wait_count": self._wait_count,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+            }
+
+    # ------------------------------------------------------------------
+    # Внутрішні методи
+    # ------------------------------------------------------------------
+
+    def _reserve(self, deadline: float):
+        """
+        Резервує слот у пулі під блокуванням.
+
+        Returns:
+            tuple: (conn, idle_since, create) - вільне з'єднання або
+            ознака, що потрібно відкрити нове
+        """
+        with self._cond:
+            waited = False
+            while True:
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                    self._in_use += 1
+                    return conn, idle_since, False
+                if self._total < self.pool_size + self.max_overflow:
+                    self._total += 1
+                    self._in_use += 1
+                    return None, None, True
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(self.timeout)
+                if not waited:
+                    self._wait_count += 1
+                    waited = True
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+    def _forget(self):
+        """Звільняє слот з'єднання, яке не вдалося відкрити або перевірити."""
+        with self._cond:
+            self._total -= 1
+            self._in_use -= 1
+            self._discarded += 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn, idle_since: float) -> bool:
+        if time.monotonic() - idle_since < self.ping_interval:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+# ============================================================================
+# ПУЛИ НА РІВНІ ПРОЦЕСУ
+# ============================================================================
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_config: dict) -> ConnectionPool:
+    """
+    Повертає спільний пул для заданої конфігурації БД (створює при першому виклику).
+    Конфігурація приходить з Реєстру сервісів, тому пули ключуються її вмістом.
+    """
+    key = tuple(sorted(db_config.items()))
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_config, **DBConfig.POOL)
+            _pools[key] = pool
+        return pool
+
+
+def pools_stats() -> list:
+    """Статистика всіх пулів процесу."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools]
+
+
+def close_all_pools():
+    """Закриває та забуває всі пули (зупинка сервісу, тести)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,30 @@
+"""
+Умовні GET-запити (etag.py)
+Simple Task Manager - svc_task_core
+
+ETag колекції обчислюється з версій у таблиці CollectionVersions
+(DBConfig.ETAG). Версію завдань збільшує кожна транзакція запису
+(app.bump_version), версію категорій - тригери БД. Тому ETag однаковий для
+всіх процесів і переживає перезапуск. Якщо клієнт надсилає If-None-Match з
+поточним ETag, сервіс відповідає 304 без читання рядків та серіалізації JSON.
+"""
+
+import hashlib
+
+
+def make_etag(*parts) -> str:
+    """Сильний ETag (в лапках) з довільних частин версії."""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Перевірка заголовка If-None-Match (слабке порівняння, RFC 9110).
+    """
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
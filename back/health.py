@@ -0,0 +1,154 @@
+"""
+Фонова перевірка залежностей (health.py)
+Simple Task Manager - svc_task_core
+
+Оркестратор опитує /health кілька разів на секунду з різних місць, тому
+перевірка залежностей на кожен запит створювала реальне навантаження на БД.
+HealthProber перевіряє Реєстр сервісів та бізнес-БД у фоновому потоці раз
+на DBConfig.HEALTH['interval'] секунд, а ендпоінти віддають кешований результат.
+БД перевіряється через власне з'єднання перевірки, а не через пул запитів:
+під піковим навантаженням пул може бути вичерпаний, і тоді зайнятий, але
+справний екземпляр виводився б з ротації.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import mysql.connector
+
+from config import DBConfig
+from registry import ServiceRegistryClient
+
+
+class HealthProber:
+    """
+    Періодична перевірка готовності сервісу.
+
+    Результат (snapshot) містить доступність Реєстру та бізнес-БД,
+    час останньої перевірки та її тривалість.
+    """
+
+    def __init__(self, service_key: str, interval: float):
+        self.service_key = service_key
+        self.interval = interval
+        self._snapshot = {
+            "status": "starting",
+            "ready": False,
+            "registry_available": False,
+            "database_available": False,
+            "checked_at": None,
+            "latency_ms": None,
+            "error": None,
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        # Власне з'єднання перевірки (лише потік перевірок) та його конфігурація
+        self._conn = None
+        self._conn_config = None
+
+    def start(self):
+        """Запуск фонового потоку перевірок."""
+        if self._thread is not None:
+            return
+        # Власна подія для кожного потоку: потік, що не встиг завершитися
+        # за timeout у stop(), не продовжить цикл після повторного start()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop,), name="health-prober", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Зупинка фонового потоку; чекає завершення поточної перевірки."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._close_connection()
+
+    def snapshot(self) -> dict:
+        """Результат останньої перевірки (без звернень до залежностей)."""
+        with self._lock:
+            return dict(self._snapshot)
+
+    def probe(self) -> dict:
+        """Одна перевірка Реєстру та бізнес-БД; оновлює snapshot."""
+        started = time.perf_counter()
+        registry_available = False
+        database_available = False
+        registry_ms = None
+        database_ms = None
+        error = None
+
+        try:
+            # Напряму, повз кеш: перевіряється саме доступність Реєстру
+            db_config = ServiceRegistryClient.fetch_db_config(self.service_key, quiet=True)
+            registry_available = True
+            registry_ms = round((time.perf_counter() - started) * 1000, 2)
+
+            if db_config:
+                db_started = time.perf_counter()
+                self._ping_database(db_config)
+                database_available = True
+                database_ms = round((time.perf_counter() - db_started) * 1000, 2)
+            else:
+                error = f"Service '{self.service_key}' not found in registry"
+        except Exception as e:
+            error = str(e)
+
+        ready = registry_available and database_available
+        snapshot = {
+            "status": "ready" if ready else "not_ready",
+            "ready": ready,
+            "registry_available": registry_available,
+            "database_available": database_available,
+            "checked_at": datetime.now().isoformat(),
+            "latency_ms": {
+                "registry": registry_ms,
+                "database": database_ms,
+                "total": round((time.perf_counter() - started) * 1000, 2),
+            },
+            "error": error,
+        }
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def _ping_database(self, db_config: dict):
+        """SELECT 1 через власне з'єднання; після помилки з'єднання відкривається знову."""
+        if self._conn is not None and self._conn_config != db_config:
+            self._close_connection()
+        if self._conn is None:
+            self._conn = mysql.connector.connect(**db_config)
+            self._conn_config = dict(db_config)
+        try:
+            cursor = self._conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception:
+            self._close_connection()
+            raise
+
+    def _close_connection(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+        self._conn_config = None
+
+    def _run(self, stop: threading.Event):
+        while not stop.is_set():
+            self.probe()
+            stop.wait(self.interval)
+
+
+prober = HealthProber('svc_task_core', DBConfig.HEALTH['interval'])
@@ -0,0 +1,331 @@
+"""
+Навантажувальне тестування (loadtest.py)
+Simple Task Manager - svc_task_core
+
+Запускає app.py (uvicorn у фоновому потоці цього процесу) поверх SQLite-замінника
+MySQL (sqlite_standin.py) або справжньої MySQL, наповнює БД заданою кількістю
+завдань і навантажує ендпоінти GET /tasks, GET /categories, POST /tasks та
+PATCH /tasks/{id}/status із заданою конкурентністю. Результат - JSON-звіт
+з p50/p95/p99 затримки та req/s по кожному ендпоінту; звіт можна порівняти
+з попереднім (--baseline), щоб виявляти регресії в CI.
+
+Запуск:
+    python loadtest.py --tasks 10000 --requests 2000 --concurrency 50 --report report.json
+    python loadtest.py --baseline main.json --max-regression 20
+    python loadtest.py --backend mysql  # Реєстр сервісів та MySQL з config.py
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import httpx
+import mysql.connector
+import uvicorn
+
+import sqlite_standin
+from app import app
+from registry import ServiceRegistryClient
+
+
+CATEGORIES = ["Робота", "Навчання", "Дім", "Спорт", "Покупки"]
+PRIORITIES = ["Low", "Medium", "High"]
+STATUSES = ["Pending", "In_Progress", "Completed"]
+ENDPOINTS = ["get_tasks", "get_categories", "create_task", "update_status"]
+
+
+# ============================================================================
+# ПІДГОТОВКА ДАНИХ
+# ============================================================================
+
+def seed(connect, db_config: dict, tasks: int) -> int:
+    """
+    Наповнює БД категоріями та tasks завданнями (одна транзакція).
+
+    Returns:
+        int: Кількість завдань у таблиці після наповнення
+    """
+    conn = connect(**db_config)
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        cursor.execute("SELECT COUNT(*) FROM Categories")
+        if cursor.fetchall()[0][0] == 0:
+            cursor.executemany(
+                "INSERT INTO Categories (CategoryName) VALUES (%s)",
+                [(name,) for name in CATEGORIES]
+            )
+
+        now = datetime.now()
+        batch = []
+        for i in range(tasks):
+            batch.append((
+                1,
+                i % len(CATEGORIES) + 1,
+                f"Seed task {i}",
+                "Load test seed",
+                PRIORITIES[i % len(PRIORITIES)],
+                STATUSES[i % len(STATUSES)],
+                now + timedelta(days=i % 30 + 1),
+                now - timedelta(seconds=tasks - i)
+            ))
+            if len(batch) == 1000:
+                insert_seed_batch(cursor, batch)
+                batch = []
+        if batch:
+            insert_seed_batch(cursor, batch)
+        conn.commit()
+
+        cursor.execute("SELECT COUNT(*) FROM Tasks")
+        return cursor.fetchall()[0][0]
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def insert_seed_batch(cursor, batch: list):
+    cursor.executemany(
+        """
+        INSERT INTO Tasks (User_ID, Category_ID, Title, Description, Priority, Status, DueDate, CreatedAt)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """,
+        batch
+    )
+
+
+# ============================================================================
+# ЗАПУСК СЕРВІСУ
+# ============================================================================
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> tuple:
+    """Запускає app.py у фоновому потоці та чекає на готовність."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 15
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError("Server failed to start")
+        time.sleep(0.05)
+    return server, thread
+
+
+# ============================================================================
+# НАВАНТАЖЕННЯ
+# ============================================================================
+
+def make_request(name: str, max_task_id: int, i: int) -> tuple:
+    """Параметри i-го запиту сценарію: (method, url, json)."""
+    if name == "get_tasks":
+        return "GET", "/tasks", None
+    if name == "get_categories":
+        return "GET", "/categories", None
+    if name == "create_task":
+        return "POST", "/tasks", {
+            "user_id": 1,
+            "category_id": i % len(CATEGORIES) + 1,
+            "title": f"Load test task {i}",
+            "priority": PRIORITIES[i % len(PRIORITIES)]
+        }
+    task_id = random.randint(1, max(max_task_id, 1))
+    return "PATCH", f"/tasks/{task_id}/status?new_status={STATUSES[i % len(STATUSES)]}", None
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Перцентиль методом nearest-rank."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_endpoint(client: httpx.AsyncClient, name: str, total: int,
+                       concurrency: int, max_task_id: int) -> dict:
+    """Виконує total запитів сценарію name силами concurrency клієнтів."""
+    latencies = []
+    status_codes = {}
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            method, url, body = make_request(name, max_task_id, i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                code = str(response.status_code)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                code = "transport_error"
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+            status_codes[code] = status_codes.get(code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "status_codes": dict(sorted(status_codes.items())),
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+    }
+
+
+async def run_load(base_url: str, endpoints: list, total: int, concurrency: int,
+                   warmup: int, max_task_id: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        results = {}
+        for name in endpoints:
+            if warmup:
+                await run_endpoint(client, name, warmup, min(concurrency, warmup), max_task_id)
+            results[name] = await run_endpoint(client, name, total, concurrency, max_task_id)
+            latency = results[name]["latency_ms"]
+            print(f"{name:<15} {results[name]['rps']:>9.1f} req/s  p50={latency['p50']:.1f}ms  "
+                  f"p95={latency['p95']:.1f}ms  p99={latency['p99']:.1f}ms  errors={results[name]['errors']}")
+        return results
+
+
+# ============================================================================
+# ПОРІВНЯННЯ ЗВІТІВ
+# ============================================================================
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list:
+    """
+    Порівнює звіт з базовим.
+
+    Returns:
+        list: Описи регресій понад max_regression відсотків (p99 або req/s)
+    """
+    regressions = []
+    for name, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        p99_change = change_percent(previous["latency_ms"]["p99"], current["latency_ms"]["p99"])
+        rps_change = change_percent(previous["rps"], current["rps"])
+        print(f"{name:<15} p99 {p99_change:+7.1f}%   req/s {rps_change:+7.1f}%")
+        if p99_change > max_regression:
+            regressions.append(f"{name}: p99 +{p99_change:.1f}%")
+        if -rps_change > max_regression:
+            regressions.append(f"{name}: req/s {rps_change:.1f}%")
+    return regressions
+
+
+def change_percent(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+# ============================================================================
+# ТОЧКА ВХОДУ
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test and latency benchmark for app.py")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--database", help="SQLite file (default: temporary file)")
+    parser.add_argument("--tasks", type=int, default=10000, help="tasks to seed")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=50, help="warm-up requests per endpoint")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--report", default="loadtest_report.json", help="JSON report path")
+    parser.add_argument("--baseline", help="previous JSON report to compare with")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="fail if p99 grows or req/s drops by more than this percent")
+    args = parser.parse_args()
+
+    patches = []
+    if args.backend == "sqlite":
+        database = args.database or os.path.join(tempfile.mkdtemp(prefix="stm-loadtest-"), "tasks.db")
+        sqlite_standin.create_schema(database)
+        db_config = {'host': 'sqlite', 'database': database}
+        connect = sqlite_standin.connect
+        patches = [
+            patch('db_pool.mysql.connector.connect', side_effect=sqlite_standin.connect),
+            patch.object(ServiceRegistryClient, 'fetch_db_config', return_value=db_config),
+        ]
+    else:
+        db_config = ServiceRegistryClient.fetch_db_config('svc_task_core')
+        if not db_config:
+            sys.exit("svc_task_core is not registered in the service registry")
+        connect = mysql.connector.connect
+
+    for active in patches:
+        active.start()
+    try:
+        seeded_started = time.perf_counter()
+        max_task_id = seed(connect, db_config, args.tasks)
+        print(f"Seeded {args.tasks} tasks in {time.perf_counter() - seeded_started:.1f}s "
+              f"({max_task_id} in table)")
+
+        port = free_port()
+        server, thread = start_server(port)
+        try:
+            endpoints = asyncio.run(run_load(
+                f"http://127.0.0.1:{port}", args.endpoints, args.requests,
+                args.concurrency, args.warmup, max_task_id
+            ))
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+    finally:
+        for active in patches:
+            active.stop()
+
+    report = {
+        "meta": {
+            "backend": args.backend,
+            "tasks": args.tasks,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "endpoints": endpoints,
+    }
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Report written to {args.report}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.max_regression)
+        if regressions:
+            print("Regressions: " + "; ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+-- Композитний індекс для курсорної пагінації GET /tasks (pagination.py).
+-- Порядок колонок збігається з ORDER BY t.CreatedAt DESC, t.idTask DESC,
+-- тому будь-яка сторінка читається діапазонним скануванням без сортування.
+
+USE simpletaskmanager;
+
+CREATE INDEX idx_tasks_created_id ON Tasks (CreatedAt DESC, idTask DESC);
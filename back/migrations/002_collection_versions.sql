@@ -0,0 +1,34 @@
+-- Версії колекцій для ETag /categories та /tasks (etag.py).
+-- Версія зберігається в БД, тому однакова для всіх процесів і не скидається
+-- при перезапуску. ETag колекції - сума версій її рядків (DBConfig.ETAG).
+--
+-- tasks: версію збільшує застосунок - один UPDATE на транзакцію запису,
+-- останнім перед COMMIT (DBConfig.BUMP_VERSION). Рядків 16 (Shard =
+-- connection_id % 16), тож паралельні транзакції з різних з'єднань не
+-- чекають на блокування одного рядка, а пакетна вставка 1000 рядків
+-- збільшує версію один раз.
+-- categories: змінюються рідко, тому версію збільшують тригери (зокрема при
+-- перейменуванні в обхід сервісів); один рядок.
+
+USE simpletaskmanager;
+
+CREATE TABLE CollectionVersions (
+    Collection VARCHAR(32)      NOT NULL,
+    Shard      TINYINT UNSIGNED NOT NULL,
+    Version    BIGINT UNSIGNED  NOT NULL DEFAULT 0,
+    PRIMARY KEY (Collection, Shard)
+);
+
+INSERT INTO CollectionVersions (Collection, Shard) VALUES
+    ('tasks', 0), ('tasks', 1), ('tasks', 2), ('tasks', 3),
+    ('tasks', 4), ('tasks', 5), ('tasks', 6), ('tasks', 7),
+    ('tasks', 8), ('tasks', 9), ('tasks', 10), ('tasks', 11),
+    ('tasks', 12), ('tasks', 13), ('tasks', 14), ('tasks', 15),
+    ('categories', 0);
+
+CREATE TRIGGER CategoriesVersionInsert AFTER INSERT ON Categories FOR EACH ROW
+    UPDATE CollectionVersions SET Version = Version + 1 WHERE Collection = 'categories';
+CREATE TRIGGER CategoriesVersionUpdate AFTER UPDATE ON Categories FOR EACH ROW
+    UPDATE CollectionVersions SET Version = Version + 1 WHERE Collection = 'categories';
+CREATE TRIGGER CategoriesVersionDelete AFTER DELETE ON Categories FOR EACH ROW
+    UPDATE CollectionVersions SET Version = Version + 1 WHERE Collection = 'categories';
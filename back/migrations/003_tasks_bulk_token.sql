@@ -0,0 +1,12 @@
+-- Мітка пакетної вставки POST /tasks/bulk (app.insert_tasks_bulk).
+-- Пачки вставляються багаторядковим INSERT (executemany) з однією міткою на
+-- запит; ID створених рядків читаються назад одним
+-- SELECT ... WHERE idTask >= <lastrowid першої пачки> AND BulkToken = <мітка>.
+-- Це працює за будь-якого innodb_autoinc_lock_mode (зокрема 2 - типово з
+-- MySQL 8, коли ID паралельних вставок перемежовуються). Вибірка йде
+-- діапазоном первинного ключа, тож окремий індекс не потрібен; рядки,
+-- створені іншими ендпоінтами, мають NULL. Колонка додається миттєво.
+
+USE simpletaskmanager;
+
+ALTER TABLE Tasks ADD COLUMN BulkToken CHAR(32) NULL, ALGORITHM = INSTANT;
@@ -8,7 +8,7 @@
 """
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -82,6 +82,55 @@ class APIResponse(BaseModel):
     message: str = Field(..., description="Повідомлення про результат операції")
 
 
+class BulkItemError(BaseModel):
+    """
+    Помилка окремого елемента пакетного запиту.
+    """
+    index: int = Field(..., description="Індекс елемента у масиві запиту")
+    error: str = Field(..., description="Опис помилки")
+
+
+class BulkCreateResponse(BaseModel):
+    """
+    Відповідь на пакетне створення завдань (POST /tasks/bulk).
+    """
+    success: bool = Field(..., description="True, якщо створено всі елементи")
+    created: int = Field(..., description="Кількість створених завдань")
+    task_ids: List[int] = Field(default_factory=list, description="ID створених завдань у порядку запиту")
+    errors: List[BulkItemError] = Field(default_factory=list, description="Помилки по елементах")
+    message: str = Field(..., description="Повідомлення про результат операції")
+
+
+class TaskStatusChange(BaseModel):
+    """
+    Елемент пакетного оновлення статусів (PATCH /tasks/status/batch).
+    Статус перевіряється в обробнику, щоб повернути результат по кожному завданню.
+    """
+    task_id: int = Field(..., gt=0, description="ID завдання")
+    new_status: str = Field(..., description="Новий статус: Pending, In_Progress, Completed")
+
+
+class TaskStatusOutcome(BaseModel):
+    """
+    Результат оновлення статусу одного завдання.
+    """
+    task_id: int
+    new_status: str
+    outcome: str = Field(..., description="updated, not_found, invalid_status або duplicate")
+    detail: Optional[str] = None
+
+
+class BatchStatusResponse(BaseModel):
+    """
+    Відповідь на пакетне оновлення статусів.
+    """
+    success: bool = Field(..., description="True, якщо оновлено всі завдання")
+    updated: List[int] = Field(default_factory=list, description="ID оновлених завдань")
+    not_found: List[int] = Field(default_factory=list, description="ID неіснуючих завдань")
+    results: List[TaskStatusOutcome] = Field(default_factory=list, description="Результат по кожному завданню")
+    message: str
+
+
 class TaskResponse(BaseModel):
     """
     Модель відповіді з даними завдання.
@@ -0,0 +1,47 @@
+"""
+Курсорна (keyset) пагінація (pagination.py)
+Simple Task Manager - svc_task_core
+
+Замість OFFSET наступна сторінка починається одразу після останнього
+рядка попередньої за ключем (CreatedAt, idTask). З композитним індексом
+idx_tasks_created_id (migrations/001_tasks_keyset_index.sql) вартість будь-якої
+сторінки однакова - MySQL не перебирає пропущені рядки.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+class InvalidCursorError(ValueError):
+    """Виняток: курсор пошкоджений або сформований не цим сервісом."""
+
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    """
+    Формує непрозорий курсор з ключа останнього рядка сторінки.
+
+    Returns:
+        str: base64url-рядок без доповнення '='
+    """
+    payload = json.dumps({"c": created_at.isoformat(), "id": task_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Розбирає курсор.
+
+    Returns:
+        tuple: (created_at, task_id)
+
+    Raises:
+        InvalidCursorError: Якщо курсор некоректний
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), int(data["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
@@ -7,7 +7,21 @@
 конфігурації сервісів через Реєстр (розроблений в ПЗ-3).
 """
 
-from config import get_registry_connection
+import threading
+import time
+
+from config import DBConfig, get_registry_connection
+
+
+class _CacheEntry:
+    """Запис кешу Service Discovery (None - негативний запис)."""
+    __slots__ = ("value", "expires_at", "refreshing", "failures")
+
+    def __init__(self, value, ttl: float):
+        self.value = value
+        self.expires_at = time.monotonic() + ttl
+        self.refreshing = False
+        self.failures = 0
 
 
 class ServiceRegistryClient:
@@ -17,16 +31,116 @@ class ServiceRegistryClient:
     Забезпечує динамічний пошук адреси сервісу/БД через звернення
     до збереженої процедури GetServiceAddress (з ПЗ-3).
     Це дозволяє уникнути жорсткого кодування параметрів підключення.
+    
+    Результати кешуються за service_key на DBConfig.DISCOVERY_CACHE['ttl'] секунд.
+    Після закінчення TTL запит обслуговується застарілим записом, а оновлення
+    виконується у фоновому потоці, тож Реєстр опитується лише раз на TTL.
+    Якщо оновлення не вдалося, застарілий запис обслуговує запити далі, а
+    наступна спроба відкладається (negative_ttl, подвоюючись до ttl).
     """
     
+    _cache = {}
+    _cache_lock = threading.Lock()
+    _fetch_locks = {}
+    _stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+    
+    @classmethod
+    def get_db_config(cls, service_key: str) -> dict:
+        """
+        Повертає конфігурацію підключення до БД для сервісу (з кешу).
+        
+        Args:
+            service_key (str): Ключ сервісу в реєстрі (наприклад, 'svc_task_core')
+            
+        Returns:
+            dict: Конфігурація підключення до БД або None
+            
+        Raises:
+            Exception: Якщо запису немає в кеші, а Реєстр сервісів недоступний
+        """
+        with cls._cache_lock:
+            entry = cls._cache.get(service_key)
+            if entry is not None:
+                if entry.expires_at > time.monotonic():
+                    cls._stats["hits"] += 1
+                else:
+                    cls._stats["stale_hits"] += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        threading.Thread(
+                            target=cls._refresh, args=(service_key,), daemon=True
+                        ).start()
+                return dict(entry.value) if entry.value else None
+            fetch_lock = cls._fetch_locks.setdefault(service_key, threading.Lock())
+        
+        # Одночасні промахи по одному ключу виконують лише один запит до Реєстру
+        with fetch_lock:
+            with cls._cache_lock:
+                entry = cls._cache.get(service_key)
+                if entry is None:
+                    cls._stats["misses"] += 1
+                else:
+                    cls._stats["hits"] += 1
+            if entry is None:
+                value = cls.fetch_db_config(service_key)
+                cls._store(service_key, value)
+            else:
+                value = entry.value
+        return dict(value) if value else None
+    
+    @classmethod
+    def _refresh(cls, service_key: str):
+        """Фонове оновлення застарілого запису кешу."""
+        try:
+            value = cls.fetch_db_config(service_key)
+        except Exception as e:
+            settings = DBConfig.DISCOVERY_CACHE
+            with cls._cache_lock:
+                cls._stats["refresh_errors"] += 1
+                entry = cls._cache.get(service_key)
+                if entry is not None:
+                    # Експоненційна затримка: під час недоступності Реєстру запити
+                    # не запускають нову спробу кожен
+                    backoff = min(settings['negative_ttl'] * 2 ** entry.failures, settings['ttl'])
+                    entry.failures += 1
+                    entry.expires_at = time.monotonic() + backoff
+                    entry.refreshing = False
+            print(f"[Service Discovery] Refresh of '{service_key}' failed: {e}")
+            return
+        cls._store(service_key, value)
+        with cls._cache_lock:
+            cls._stats["refreshes"] += 1
+    
+    @classmethod
+    def _store(cls, service_key: str, value):
+        settings = DBConfig.DISCOVERY_CACHE
+        ttl = settings['ttl'] if value else settings['negative_ttl']
+        with cls._cache_lock:
+            cls._cache[service_key] = _CacheEntry(value, ttl)
+    
+    @classmethod
+    def cache_stats(cls) -> dict:
+        """Лічильники кешу Service Discovery."""
+        with cls._cache_lock:
+            return dict(cls._stats, entries=len(cls._cache))
+    
+    @classmethod
+    def clear_cache(cls):
+        """Очищення кешу та лічильників."""
+        with cls._cache_lock:
+            cls._cache.clear()
+            for key in cls._stats:
+                cls._stats[key] = 0
+    
     @staticmethod
-    def get_db_config(service_key: str) -> dict:
+    def fetch_db_config(service_key: str, quiet: bool = False) -> dict:
         """
         Звертається до збереженої процедури GetServiceAddress (з ПЗ-3)
-        для отримання адреси сервісу/БД.
+        для отримання адреси сервісу/БД (без кешу).
         
         Args:
             service_key (str): Ключ сервісу в реєстрі (наприклад, 'svc_task_core')
+            quiet (bool): Без логування результату (періодичні перевірки health.py)
             
         Returns:
             dict: Конфігурація підключення до БД або None
@@ -53,7 +167,8 @@ class ServiceRegistryClient:
                     url_address = row[0] if row else None
                     
                     # Логування отриманої адреси
-                    print(f"[Service Discovery] Found service '{service_key}': {url_address}")
+                    if not quiet:
+                        print(f"[Service Discovery] Found service '{service_key}': {url_address}")
                     
                     return {
                         'host': 'localhost',
@@ -62,7 +177,8 @@ class ServiceRegistryClient:
                         'database': 'simpletaskmanager'
                     }
             
-            print(f"[Service Discovery] Service '{service_key}' not found in registry")
+            if not quiet:
+                print(f"[Service Discovery] Service '{service_key}' not found in registry")
             return None
             
         finally:
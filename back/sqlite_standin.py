@@ -0,0 +1,225 @@
+"""
+SQLite-замінник MySQL для навантажувального тестування (sqlite_standin.py)
+Simple Task Manager - svc_task_core
+
+Реалізує ту частину інтерфейсу mysql.connector, яку використовують app.py та
+db_pool.py (курсори з dictionary=True, start_transaction, savepoint-и,
+executemany з lastrowid першого рядка, винятки mysql.connector.Error), поверх
+файлової бази SQLite зі схемою Tasks / Categories / Reminders та аналогом
+тригера AfterTaskInsert. Дозволяє запускати сервіс без MySQL та Реєстру.
+"""
+
+import itertools
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+import mysql.connector
+from mysql.connector import errorcode
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS Categories (
+    idCategory   INTEGER PRIMARY KEY AUTOINCREMENT,
+    CategoryName TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS Tasks (
+    idTask      INTEGER PRIMARY KEY AUTOINCREMENT,
+    User_ID     INTEGER NOT NULL,
+    Category_ID INTEGER REFERENCES Categories(idCategory),
+    Title       TEXT NOT NULL,
+    Description TEXT,
+    Priority    TEXT NOT NULL DEFAULT 'Medium',
+    Status      TEXT NOT NULL DEFAULT 'Pending',
+    DueDate     TIMESTAMP,
+    CreatedAt   TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'),
+    BulkToken   TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_created_id ON Tasks (CreatedAt DESC, idTask DESC);
+
+CREATE TABLE IF NOT EXISTS Reminders (
+    idReminder INTEGER PRIMARY KEY AUTOINCREMENT,
+    Task_ID    INTEGER NOT NULL REFERENCES Tasks(idTask) ON DELETE CASCADE,
+    RemindAt   TIMESTAMP
+);
+
+-- Аналог тригера AfterTaskInsert (ПЗ-2): нагадування для High пріоритету
+CREATE TRIGGER IF NOT EXISTS AfterTaskInsert AFTER INSERT ON Tasks
+WHEN NEW.Priority = 'High'
+BEGIN
+    INSERT INTO Reminders (Task_ID, RemindAt) VALUES (NEW.idTask, NEW.DueDate);
+END;
+
+-- Версії колекцій для ETag (migrations/002_collection_versions.sql)
+CREATE TABLE IF NOT EXISTS CollectionVersions (
+    Collection TEXT    NOT NULL,
+    Shard      INTEGER NOT NULL,
+    Version    INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (Collection, Shard)
+);
+
+INSERT OR IGNORE INTO CollectionVersions (Collection, Shard) VALUES
+    ('tasks', 0), ('tasks', 1), ('tasks', 2), ('tasks', 3),
+    ('tasks', 4), ('tasks', 5), ('tasks', 6), ('tasks', 7),
+    ('tasks', 8), ('tasks', 9), ('tasks', 10), ('tasks', 11),
+    ('tasks', 12), ('tasks', 13), ('tasks', 14), ('tasks', 15),
+    ('categories', 0);
+
+CREATE TRIGGER IF NOT EXISTS CategoriesVersionInsert AFTER INSERT ON Categories
+BEGIN
+    UPDATE CollectionVersions SET Version = Version + 1 WHERE Collection = 'categories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS CategoriesVersionUpdate AFTER UPDATE ON Categories
+BEGIN
+    UPDATE CollectionVersions SET Version = Version + 1 WHERE Collection = 'categories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS CategoriesVersionDelete AFTER DELETE ON Categories
+BEGIN
+    UPDATE CollectionVersions SET Version = Version + 1 WHERE Collection = 'categories';
+END;
+"""
+
+# Дати зберігаються текстом з мікросекундами, щоб порівняння рядків
+# збігалося з порівнянням дат (курсорна пагінація)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" ", timespec="microseconds"))
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+
+# Номери з'єднань (аналог CONNECTION_ID() у MySQL)
+_connection_ids = itertools.count(1)
+
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE)
+
+
+def translate(sql: str) -> str:
+    """MySQL-діалект запитів app.py -> SQLite."""
+    return _FOR_UPDATE.sub("", sql).replace("%s", "?")
+
+
+@contextmanager
+def mysql_errors():
+    """Перетворює винятки sqlite3 на відповідні винятки mysql.connector."""
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        raise mysql.connector.IntegrityError(msg=str(e)) from e
+    except sqlite3.OperationalError as e:
+        if str(e).startswith("no such table"):
+            # ER_NO_SUCH_TABLE, як у MySQL (наприклад, не застосовано міграцію)
+            raise mysql.connector.ProgrammingError(msg=str(e), errno=errorcode.ER_NO_SUCH_TABLE) from e
+        raise mysql.connector.DatabaseError(msg=str(e)) from e
+    except sqlite3.Error as e:
+        raise mysql.connector.DatabaseError(msg=str(e)) from e
+
+
+class StandInCursor:
+    """Курсор з інтерфейсом mysql.connector поверх sqlite3."""
+
+    def __init__(self, connection: sqlite3.Connection, dictionary: bool = False):
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+        self.lastrowid = None
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    def execute(self, sql, params=None):
+        with mysql_errors():
+            self._cursor.execute(translate(sql), tuple(params or ()))
+        self.lastrowid = self._cursor.lastrowid
+
+    def executemany(self, sql, seq_params):
+        seq_params = [tuple(params) for params in seq_params]
+        with mysql_errors():
+            self._cursor.executemany(translate(sql), seq_params)
+            if seq_params and sql.lstrip().upper().startswith("INSERT"):
+                # Як у MySQL для багаторядкового INSERT: ID першого вставленого рядка
+                last_id = self._cursor.connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+                self.lastrowid = last_id - len(seq_params) + 1
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._convert(row) if row is not None else None
+
+    def fetchmany(self, size: int = 1):
+        return [self._convert(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._convert(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+    def _convert(self, row):
+        if not self._dictionary:
+            return row
+        return dict(zip((column[0] for column in self._cursor.description), row))
+
+
+class StandInConnection:
+    """З'єднання з інтерфейсом mysql.connector поверх файлу SQLite."""
+
+    def __init__(self, database: str):
+        self._conn = sqlite3.connect(
+            database,
+            timeout=30,
+            isolation_level=None,  # транзакції керуються явно, як у mysql.connector
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        self.connection_id = next(_connection_ids)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._conn.in_transaction
+
+    def cursor(self, dictionary: bool = False, **kwargs):
+        return StandInCursor(self._conn, dictionary=dictionary)
+
+    def start_transaction(self):
+        with mysql_errors():
+            self._conn.execute("BEGIN")
+
+    def commit(self):
+        if self._conn.in_transaction:
+            with mysql_errors():
+                self._conn.execute("COMMIT")
+
+    def rollback(self):
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+    def ping(self, reconnect: bool = False):
+        with mysql_errors():
+            self._conn.execute("SELECT 1")
+
+    def is_connected(self) -> bool:
+        try:
+            self.ping()
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def close(self):
+        self._conn.close()
+
+
+def connect(**db_config) -> StandInConnection:
+    """Замінник mysql.connector.connect: використовує лише db_config['database']."""
+    return StandInConnection(db_config['database'])
+
+
+def create_schema(database: str):
+    """Створює схему SQLite-замінника."""
+    conn = sqlite3.connect(database)
+    try:
+        conn.executescript(SCHEMA)
+    finally:
+        conn.close()
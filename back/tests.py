@@ -6,18 +6,44 @@
 Тести для перевірки працездатності сервісу Task Registry Service.
 """
 
+import time
 import pytest
 from datetime import datetime, timedelta
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 
+import app as app_module
 from app import app
+from config import DBConfig
 from models import TaskCreateRequest, APIResponse
+from db_pool import ConnectionPool, PoolTimeoutError, close_all_pools, get_pool
+from registry import ServiceRegistryClient
+from pagination import encode_cursor, decode_cursor, InvalidCursorError
+from health import HealthProber, prober
+from etag import etag_matches
 
 
 # Тестовий клієнт FastAPI
 client = TestClient(app)
 
+# Конфігурація БД, яку повертає замоканий Реєстр
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '',
+    'database': 'SimpleTaskManager'
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    """Кожен тест отримує свіжі пули з'єднань та порожній кеш Service Discovery"""
+    close_all_pools()
+    ServiceRegistryClient.clear_cache()
+    yield
+    close_all_pools()
+    ServiceRegistryClient.clear_cache()
+
 
 # ============================================
 # Тести ендпоінтів Health Check
@@ -42,6 +68,103 @@ class TestHealthCheck:
         data = response.json()
         assert "status" in data
         assert "registry_available" in data
+    
+    def test_liveness_endpoint(self):
+        """Тест liveness-проби"""
+        response = client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json()["status"] == "alive"
+    
+    @patch('registry.ServiceRegistryClient.fetch_db_config')
+    def test_readiness_served_from_cache(self, mock_fetch):
+        """Тест: readiness-проба не звертається до Реєстру"""
+        prober._snapshot = dict(prober._snapshot, ready=False, status="starting")
+        response = client.get("/health/ready")
+        
+        assert response.status_code == 503
+        mock_fetch.assert_not_called()
+    
+    @patch('health.ServiceRegistryClient.fetch_db_config')
+    @patch('db_pool.mysql.connector.connect')
+    def test_prober_ready(self, mock_connect, mock_fetch):
+        """Тест: успішна перевірка Реєстру та БД"""
+        mock_fetch.return_value = DB_CONFIG
+        mock_connect.return_value = MagicMock()
+        health_prober = HealthProber('svc_task_core', interval=60)
+        
+        snapshot = health_prober.probe()
+        
+        assert snapshot["ready"] is True
+        assert snapshot["database_available"] is True
+        assert snapshot["latency_ms"]["total"] is not None
+        assert health_prober.snapshot() == snapshot
+    
+    @patch('health.ServiceRegistryClient.fetch_db_config')
+    @patch('db_pool.mysql.connector.connect')
+    def test_prober_ready_with_saturated_pool(self, mock_connect, mock_fetch):
+        """Тест: вичерпаний пул запитів не робить сервіс неготовим"""
+        mock_fetch.return_value = DB_CONFIG
+        mock_connect.return_value = MagicMock()
+        pool = get_pool(DB_CONFIG)
+        held = [pool.acquire() for _ in range(pool.pool_size + pool.max_overflow)]
+        health_prober = HealthProber('svc_task_core', interval=60)
+        
+        try:
+            started = time.perf_counter()
+            snapshot = health_prober.probe()
+        finally:
+            for conn in held:
+                pool.release(conn)
+        
+        assert snapshot["ready"] is True
+        assert time.perf_counter() - started < 1.0
+    
+    @patch('health.ServiceRegistryClient.fetch_db_config')
+    @patch('db_pool.mysql.connector.connect')
+    def test_prober_reuses_own_connection(self, mock_connect, mock_fetch):
+        """Тест: перевірки використовують одне власне з'єднання, після помилки - нове"""
+        mock_fetch.return_value = DB_CONFIG
+        first, second = MagicMock(), MagicMock()
+        mock_connect.side_effect = [first, second]
+        health_prober = HealthProber('svc_task_core', interval=60)
+        
+        assert health_prober.probe()["ready"] is True
+        assert health_prober.probe()["ready"] is True
+        assert mock_connect.call_count == 1
+        
+        first.cursor.return_value.execute.side_effect = Exception("Lost connection")
+        assert health_prober.probe()["database_available"] is False
+        first.close.assert_called_once()
+        assert health_prober.probe()["ready"] is True
+        assert mock_connect.call_count == 2
+    
+    @patch('health.ServiceRegistryClient.fetch_db_config')
+    def test_prober_registry_down(self, mock_fetch):
+        """Тест: недоступний Реєстр - сервіс не готовий"""
+        mock_fetch.side_effect = Exception("Registry Unavailable")
+        health_prober = HealthProber('svc_task_core', interval=60)
+        
+        snapshot = health_prober.probe()
+        
+        assert snapshot["ready"] is False
+        assert snapshot["registry_available"] is False
+        assert "Registry Unavailable" in snapshot["error"]
+    
+    @patch('health.ServiceRegistryClient.fetch_db_config')
+    def test_prober_restart_single_thread(self, mock_fetch):
+        """Тест: stop() чекає на потік, тож stop + start не лишає двох потоків"""
+        mock_fetch.return_value = None
+        health_prober = HealthProber('svc_task_core', interval=60)
+        
+        health_prober.start()
+        first = health_prober._thread
+        health_prober.stop()
+        health_prober.start()
+        
+        assert not first.is_alive()
+        assert health_prober._thread.is_alive()
+        health_prober.stop()
+        mock_fetch.assert_called_with('svc_task_core', quiet=True)
 
 
 # ============================================
@@ -317,6 +440,212 @@ class TestTasksAPI:
         assert response.status_code == 200
         assert response.json()["success"] is True
     
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_bulk_create_success(self, mock_connect, mock_get_config):
+        """Тест пакетного створення: одна транзакція, ID читаються за міткою запиту"""
+        mock_get_config.return_value = DB_CONFIG
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 50
+        mock_cursor.fetchall.return_value = [(50,), (51,)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        response = client.post("/tasks/bulk", json=[
+            {"user_id": 1, "title": "Перше завдання"},
+            {"user_id": 1, "title": "Друге завдання", "priority": "High"}
+        ])
+        
+        assert response.status_code == 201
+        data = response.json()
+        assert data["success"] is True
+        assert data["task_ids"] == [50, 51]
+        mock_cursor.executemany.assert_called_once()
+        mock_conn.commit.assert_called_once()
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_bulk_create_reports_invalid_items(self, mock_connect, mock_get_config):
+        """Тест: некоректні елементи не блокують вставку решти"""
+        mock_get_config.return_value = DB_CONFIG
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 10
+        mock_cursor.fetchall.return_value = [(10,)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        response = client.post("/tasks/bulk", json=[
+            {"user_id": 1, "title": "AB"},
+            {"user_id": 1, "title": "Коректне завдання"},
+            {"user_id": 1, "title": "Тест", "priority": "Urgent"}
+        ])
+        
+        assert response.status_code == 201
+        data = response.json()
+        assert data["success"] is False
+        assert data["task_ids"] == [10]
+        assert [err["index"] for err in data["errors"]] == [0, 2]
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_bulk_create_chunk_fallback(self, mock_connect, mock_get_config):
+        """Тест: відхилена пачка вставляється поодинці, помилка - по елементу"""
+        import mysql.connector
+        mock_get_config.return_value = DB_CONFIG
+        mock_cursor = MagicMock()
+        mock_cursor.executemany.side_effect = mysql.connector.IntegrityError(msg="FK failed")
+        ids = iter([7])
+        
+        def execute(sql, params=None):
+            if params and params[1] == 999:
+                raise mysql.connector.IntegrityError(msg="FK failed")
+            if sql.lstrip().startswith("INSERT"):
+                mock_cursor.lastrowid = next(ids)
+        mock_cursor.execute.side_effect = execute
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        response = client.post("/tasks/bulk", json=[
+            {"user_id": 1, "category_id": 999, "title": "Неіснуюча категорія"},
+            {"user_id": 1, "title": "Коректне завдання"}
+        ])
+        
+        data = response.json()
+        assert data["task_ids"] == [7]
+        assert data["errors"][0]["index"] == 0
+        assert "Integrity" in data["errors"][0]["error"]
+        mock_conn.commit.assert_called_once()
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_bulk_create_interleaved_ids(self, mock_connect, mock_get_config):
+        """Тест: ID пачки, перемежовані з паралельними вставками, читаються назад за міткою"""
+        mock_get_config.return_value = DB_CONFIG
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 40
+        mock_cursor.fetchall.return_value = [(40,), (44,), (45,)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        response = client.post("/tasks/bulk", json=[
+            {"user_id": 1, "title": f"Завдання {i}"} for i in range(3)
+        ])
+        
+        assert response.json()["task_ids"] == [40, 44, 45]
+        mock_cursor.executemany.assert_called_once()
+        rows = mock_cursor.executemany.call_args[0][1]
+        token = rows[0][-1]
+        assert all(row[-1] == token for row in rows)
+        select = [c for c in mock_cursor.execute.call_args_list if c[0][0].startswith("SELECT idTask")]
+        assert select[0][0][1] == (40, token)
+        assert not [c for c in mock_cursor.execute.call_args_list if c[0][0] == app_module.INSERT_TASK_SQL]
+        mock_conn.commit.assert_called_once()
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_bulk_create_missing_rows_rolls_back(self, mock_connect, mock_get_config):
+        """Тест: якщо за міткою знайдено не всі рядки пачок - транзакція відкочується"""
+        mock_get_config.return_value = DB_CONFIG
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 40
+        mock_cursor.fetchall.return_value = [(40,)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        response = client.post("/tasks/bulk", json=[
+            {"user_id": 1, "title": f"Завдання {i}"} for i in range(2)
+        ])
+        
+        assert response.status_code == 400
+        assert mock_conn.rollback.called
+        mock_conn.commit.assert_not_called()
+    
+    def test_bulk_create_all_invalid(self):
+        """Тест: жодного коректного елемента - 400 без звернення до БД"""
+        response = client.post("/tasks/bulk", json=[{"title": "AB"}])
+        
+        assert response.status_code == 400
+        assert response.json()["created"] == 0
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_batch_status_update(self, mock_connect, mock_get_config):
+        """Тест пакетного оновлення статусів: результат по кожному завданню"""
+        mock_get_config.return_value = DB_CONFIG
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(1,), (2,), (3,)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        response = client.patch("/tasks/status/batch", json=[
+            {"task_id": 1, "new_status": "In_Progress"},
+            {"task_id": 2, "new_status": "In_Progress"},
+            {"task_id": 3, "new_status": "Completed"},
+            {"task_id": 404, "new_status": "Completed"},
+            {"task_id": 5, "new_status": "Invalid"}
+        ])
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["updated"] == [1, 2, 3]
+        assert data["not_found"] == [404]
+        assert [r["outcome"] for r in data["results"]] == [
+            "updated", "updated", "updated", "not_found", "invalid_status"
+        ]
+        # SELECT ... FOR UPDATE + один UPDATE на кожен цільовий статус + одна версія ETag
+        updates = [c for c in mock_cursor.execute.call_args_list if c[0][0].startswith("UPDATE Tasks")]
+        assert len(updates) == 2
+        bumps = [c for c in mock_cursor.execute.call_args_list if c[0][0] == DBConfig.BUMP_VERSION]
+        assert len(bumps) == 1
+        mock_conn.commit.assert_called_once()
+    
+    def test_batch_status_duplicates_and_invalid_only(self):
+        """Тест: дублікати та некоректні статуси не потребують БД"""
+        response = client.patch("/tasks/status/batch", json=[
+            {"task_id": 1, "new_status": "Completed"},
+            {"task_id": 1, "new_status": "Pending"},
+            {"task_id": 2, "new_status": "Done"}
+        ])
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is False
+        assert [r["outcome"] for r in data["results"]] == ["duplicate", "invalid_status"]
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_export_streams_ndjson(self, mock_connect, mock_get_config):
+        """Тест: вивантаження NDJSON пачками з фільтрами"""
+        import json
+        mock_get_config.return_value = DB_CONFIG
+        rows = make_task_rows(3)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.side_effect = [rows[:2], rows[2:], []]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        response = client.get("/tasks/export?status=Pending&priority=High")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["idTask"] for line in lines] == [row["idTask"] for row in rows]
+        assert lines[0]["CreatedAt"] == rows[0]["CreatedAt"].isoformat()
+        assert mock_cursor.execute.call_args[0][1] == ["Pending", "High"]
+        mock_conn.cursor.assert_called_once_with(dictionary=True)
+    
+    def test_export_invalid_status(self):
+        """Тест: некоректний фільтр статусу у вивантаженні"""
+        response = client.get("/tasks/export?status=Unknown")
+        assert response.status_code == 400
+    
     def test_update_task_status_invalid(self):
         """Тест: некоректний статус"""
         response = client.patch("/tasks/1/status?new_status=Invalid")
@@ -325,6 +654,427 @@ class TestTasksAPI:
         assert "Invalid status" in response.json()["detail"]
 
 
+# ============================================
+# Тести курсорної пагінації
+# ============================================
+
+def make_task_rows(count, start_id=100):
+    """Рядки Tasks у порядку CreatedAt DESC, idTask DESC"""
+    return [{
+        'idTask': start_id - i,
+        'Title': f'Завдання {start_id - i}',
+        'Priority': 'Medium',
+        'Status': 'Pending',
+        'DueDate': None,
+        'CategoryName': None,
+        'CreatedAt': datetime(2025, 1, 1, 12, 0) - timedelta(minutes=i)
+    } for i in range(count)]
+
+
+class TestPagination:
+    """Тести курсорної пагінації GET /tasks"""
+    
+    def test_cursor_roundtrip(self):
+        """Тест: курсор кодується та розкодовується без втрат"""
+        created_at = datetime(2025, 3, 1, 8, 30, 15)
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    
+    def test_decode_invalid_cursor(self):
+        """Тест: пошкоджений курсор"""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not-a-cursor")
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_next_cursor_header(self, mock_connect, mock_get_config):
+        """Тест: повна сторінка повертає курсор наступної сторінки"""
+        mock_get_config.return_value = DB_CONFIG
+        rows = make_task_rows(4)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = rows
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        response = client.get("/tasks?limit=3")
+        
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+        assert decode_cursor(response.headers["X-Next-Cursor"]) == (rows[2]['CreatedAt'], rows[2]['idTask'])
+        # limit + 1 рядок для визначення наступної сторінки
+        assert mock_cursor.execute.call_args[0][1][-1] == 4
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_last_page_without_cursor(self, mock_connect, mock_get_config):
+        """Тест: остання сторінка не містить X-Next-Cursor, курсор потрапляє в запит"""
+        mock_get_config.return_value = DB_CONFIG
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = make_task_rows(2)
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        created_at = datetime(2025, 1, 2)
+        
+        response = client.get(f"/tasks?cursor={encode_cursor(created_at, 7)}&limit=3")
+        
+        assert response.status_code == 200
+        assert "X-Next-Cursor" not in response.headers
+        assert mock_cursor.execute.call_args[0][1] == [created_at, created_at, 7, 4]
+    
+    def test_invalid_cursor_rejected(self):
+        """Тест: некоректний курсор - 400"""
+        response = client.get("/tasks?cursor=broken")
+        assert response.status_code == 400
+    
+    def test_limit_out_of_range(self):
+        """Тест: розмір сторінки понад максимум - 422"""
+        response = client.get("/tasks?limit=100000")
+        assert response.status_code == 422
+
+
+# ============================================
+# Тести умовних GET (ETag)
+# ============================================
+
+def mock_db(mock_connect, fingerprint, rows):
+    """Курсор: перший fetchall - відбиток таблиці, другий - рядки"""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.side_effect = [fingerprint, rows]
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    mock_connect.return_value = mock_conn
+    return mock_cursor
+
+
+class TestETag:
+    """Тести ETag / If-None-Match для /categories та /tasks"""
+    
+    def test_etag_matches(self):
+        """Тест порівняння If-None-Match"""
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc", "def"', '"abc"')
+        assert etag_matches('*', '"abc"')
+        assert not etag_matches('"def"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_categories_not_modified(self, mock_connect, mock_get_config):
+        """Тест: збіг If-None-Match - 304 без читання рядків"""
+        mock_get_config.return_value = DB_CONFIG
+        fingerprint = [{'Collection': 'categories', 'Version': 2}]
+        categories = [{'idCategory': 1, 'CategoryName': 'Робота'}]
+        mock_db(mock_connect, fingerprint, categories)
+        
+        first = client.get("/categories")
+        etag = first.headers["ETag"]
+        assert first.json() == categories
+        
+        close_all_pools()
+        mock_cursor = mock_db(mock_connect, fingerprint, categories)
+        second = client.get("/categories", headers={"If-None-Match": etag})
+        
+        assert second.status_code == 304
+        assert second.headers["ETag"] == etag
+        assert mock_cursor.execute.call_count == 1
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_tasks_etag_changes_with_category_version(self, mock_connect, mock_get_config):
+        """Тест: /tasks показує CategoryName, тому версія категорій змінює його ETag"""
+        mock_get_config.return_value = DB_CONFIG
+        fingerprint = [{'Collection': 'categories', 'Version': 3}, {'Collection': 'tasks', 'Version': 7}]
+        mock_db(mock_connect, fingerprint, make_task_rows(1))
+        etag = client.get("/tasks").headers["ETag"]
+        
+        close_all_pools()
+        fingerprint = [{'Collection': 'categories', 'Version': 4}, {'Collection': 'tasks', 'Version': 7}]
+        mock_db(mock_connect, fingerprint, make_task_rows(1))
+        response = client.get("/tasks", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+    
+    @patch('app.ServiceRegistryClient.get_db_config')
+    @patch('app.mysql.connector.connect')
+    def test_tasks_etag_depends_on_page(self, mock_connect, mock_get_config):
+        """Тест: різні сторінки мають різні ETag"""
+        mock_get_config.return_value = DB_CONFIG
+        fingerprint = [{'Collection': 'categories', 'Version': 3}, {'Collection': 'tasks', 'Version': 7}]
+        mock_db(mock_connect, fingerprint, make_task_rows(1))
+        first = client.get("/tasks?limit=5").headers["ETag"]
+        
+        close_all_pools()
+        mock_db(mock_connect, fingerprint, make_task_rows(1))
+        second = client.get("/tasks?limit=10").headers["ETag"]
+        
+        assert first != second
+
+
+# ============================================
+# Тести з SQLite-замінником MySQL (loadtest.py)
+# ============================================
+
+class TestSQLiteStandIn:
+    """Наскрізні тести ендпоінтів поверх sqlite_standin"""
+    
+    @pytest.fixture
+    def standin_db(self, tmp_path):
+        import sqlite_standin
+        from loadtest import seed
+        database = str(tmp_path / "tasks.db")
+        sqlite_standin.create_schema(database)
+        config = {'host': 'sqlite', 'database': database}
+        seed(sqlite_standin.connect, config, 25)
+        with patch('app.ServiceRegistryClient.get_db_config', return_value=config), \
+             patch('db_pool.mysql.connector.connect', side_effect=sqlite_standin.connect):
+            yield config
+    
+    def test_keyset_pages_cover_table(self, standin_db):
+        """Тест: обхід сторінок за курсором повертає кожне завдання рівно раз"""
+        seen = []
+        url = "/tasks?limit=10"
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            seen.extend(task["idTask"] for task in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            url = f"/tasks?limit=10&cursor={cursor}" if cursor else None
+        
+        assert sorted(seen) == list(range(1, 26))
+        assert seen == sorted(seen, reverse=True)
+    
+    def test_bulk_create_ids(self, standin_db):
+        """Тест: ID пакетної вставки відповідають створеним рядкам"""
+        response = client.post("/tasks/bulk", json=[
+            {"user_id": 1, "title": f"Пакетне завдання {i}", "priority": "High"} for i in range(3)
+        ])
+        
+        assert response.status_code == 201
+        task_ids = response.json()["task_ids"]
+        assert task_ids == [26, 27, 28]
+        assert client.get(f"/tasks/{task_ids[-1]}").json()["Title"] == "Пакетне завдання 2"
+    
+    def test_bulk_create_ids_across_chunks(self, standin_db):
+        """Тест: ID кількох пачок (одна відхилена БД) відповідають своїм елементам"""
+        items = [{"user_id": 1, "title": f"Пакетне завдання {i}"} for i in range(5)]
+        items[2]["category_id"] = 999
+        with patch.dict(DBConfig.BULK, {'chunk_size': 2}):
+            response = client.post("/tasks/bulk", json=items)
+        
+        data = response.json()
+        assert response.status_code == 201
+        assert [err["index"] for err in data["errors"]] == [2]
+        assert len(data["task_ids"]) == 4
+        titles = [client.get(f"/tasks/{task_id}").json()["Title"] for task_id in data["task_ids"]]
+        assert titles == [f"Пакетне завдання {i}" for i in (0, 1, 3, 4)]
+    
+    def test_category_rename_changes_etag(self, standin_db):
+        """Тест: перейменування категорії (в обхід сервісу) змінює ETag /categories та /tasks"""
+        import sqlite_standin
+        categories_etag = client.get("/categories").headers["ETag"]
+        tasks_etag = client.get("/tasks").headers["ETag"]
+        assert client.get("/categories", headers={"If-None-Match": categories_etag}).status_code == 304
+        
+        conn = sqlite_standin.connect(**standin_db)
+        conn.cursor().execute("UPDATE Categories SET CategoryName = %s WHERE idCategory = 1", ("Офіс",))
+        conn.close()
+        
+        categories = client.get("/categories", headers={"If-None-Match": categories_etag})
+        tasks = client.get("/tasks", headers={"If-None-Match": tasks_etag})
+        assert categories.status_code == 200
+        assert categories.json()[0]["CategoryName"] == "Офіс"
+        assert tasks.status_code == 200
+    
+    def test_task_writes_change_etag(self, standin_db):
+        """Тест: зміна статусу та пакетна вставка змінюють ETag /tasks"""
+        etag = client.get("/tasks").headers["ETag"]
+        
+        assert client.patch("/tasks/1/status?new_status=Completed").status_code == 200
+        response = client.get("/tasks", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        
+        etag = response.headers["ETag"]
+        client.post("/tasks/bulk", json=[{"user_id": 1, "title": "Нове завдання"}])
+        assert client.get("/tasks", headers={"If-None-Match": etag}).status_code == 200
+    
+    def test_bulk_bumps_version_once(self, standin_db):
+        """Тест: пакетна вставка збільшує версію один раз, а не на кожен рядок"""
+        import sqlite_standin
+        conn = sqlite_standin.connect(**standin_db)
+        cursor = conn.cursor()
+        version_sql = "SELECT SUM(Version) FROM CollectionVersions WHERE Collection = 'tasks'"
+        cursor.execute(version_sql)
+        before = cursor.fetchone()[0]
+        
+        response = client.post("/tasks/bulk", json=[
+            {"user_id": 1, "title": f"Пакетне завдання {i}"} for i in range(50)
+        ])
+        
+        assert response.status_code == 201
+        cursor.execute(version_sql)
+        assert cursor.fetchone()[0] == before + 1
+        conn.close()
+    
+    def test_writes_without_versions_table(self, standin_db):
+        """Тест: без міграції CollectionVersions запис працює, відповіді - без ETag"""
+        import sqlite_standin
+        conn = sqlite_standin.connect(**standin_db)
+        conn.cursor().execute("DROP TABLE CollectionVersions")
+        conn.close()
+        
+        assert client.patch("/tasks/1/status?new_status=Completed").status_code == 200
+        response = client.get("/tasks")
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
+
+# ============================================
+# Тести пулу з'єднань
+# ============================================
+
+class TestConnectionPool:
+    """Тести пулу з'єднань з БД"""
+    
+    @patch('db_pool.mysql.connector.connect')
+    def test_connection_reused(self, mock_connect):
+        """Тест: повернуте з'єднання видається повторно без нового connect"""
+        mock_connect.return_value = MagicMock()
+        pool = ConnectionPool({'database': 'test'}, pool_size=2, max_overflow=0)
+        
+        conn = pool.acquire()
+        pool.release(conn)
+        assert pool.acquire() is conn
+        assert mock_connect.call_count == 1
+    
+    @patch('db_pool.mysql.connector.connect')
+    def test_overflow_connection_closed_on_release(self, mock_connect):
+        """Тест: overflow-з'єднання закривається після повернення"""
+        mock_connect.side_effect = lambda **kw: MagicMock()
+        pool = ConnectionPool({'database': 'test'}, pool_size=1, max_overflow=1)
+        
+        first = pool.acquire()
+        second = pool.acquire()
+        pool.release(second)
+        pool.release(first)
+        
+        second.close.assert_called_once()
+        stats = pool.stats()
+        assert stats["idle"] == 1
+        assert stats["in_use"] == 0
+    
+    @patch('db_pool.mysql.connector.connect')
+    def test_acquire_timeout(self, mock_connect):
+        """Тест: вичерпаний пул повертає PoolTimeoutError після таймауту"""
+        mock_connect.return_value = MagicMock()
+        pool = ConnectionPool({'database': 'test'}, pool_size=1, max_overflow=0, timeout=0.05)
+        
+        pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+        stats = pool.stats()
+        assert stats["wait_count"] == 1
+        assert stats["timeouts"] == 1
+    
+    @patch('db_pool.mysql.connector.connect')
+    def test_stale_connection_replaced(self, mock_connect):
+        """Тест: з'єднання, що не пройшло ping після простою, замінюється новим"""
+        dead = MagicMock()
+        dead.ping.side_effect = Exception("gone away")
+        fresh = MagicMock()
+        mock_connect.side_effect = [dead, fresh]
+        pool = ConnectionPool({'database': 'test'}, pool_size=1, max_overflow=0, ping_interval=0)
+        
+        pool.release(pool.acquire())
+        assert pool.acquire() is fresh
+        dead.close.assert_called_once()
+    
+    def test_debug_pool_endpoint(self):
+        """Тест ендпоінта /debug/pool"""
+        response = client.get("/debug/pool")
+        assert response.status_code == 200
+        assert "pools" in response.json()
+
+
+# ============================================
+# Тести кешу Service Discovery
+# ============================================
+
+class TestRegistryCache:
+    """Тести кешування ServiceRegistryClient.get_db_config"""
+    
+    @patch('registry.ServiceRegistryClient.fetch_db_config')
+    def test_registry_hit_once_within_ttl(self, mock_fetch):
+        """Тест: у межах TTL Реєстр опитується лише один раз"""
+        mock_fetch.return_value = DB_CONFIG
+        
+        for _ in range(5):
+            assert ServiceRegistryClient.get_db_config('svc_task_core') == DB_CONFIG
+        
+        assert mock_fetch.call_count == 1
+        stats = ServiceRegistryClient.cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 4
+    
+    @patch('registry.ServiceRegistryClient.fetch_db_config')
+    def test_negative_entry_cached(self, mock_fetch):
+        """Тест: відсутній сервіс теж кешується (негативний запис)"""
+        mock_fetch.return_value = None
+        
+        assert ServiceRegistryClient.get_db_config('svc_missing') is None
+        assert ServiceRegistryClient.get_db_config('svc_missing') is None
+        assert mock_fetch.call_count == 1
+    
+    @patch('registry.ServiceRegistryClient.fetch_db_config')
+    def test_stale_entry_served_while_refreshing(self, mock_fetch):
+        """Тест: застарілий запис віддається одразу, оновлення - у фоні"""
+        mock_fetch.return_value = DB_CONFIG
+        ServiceRegistryClient.get_db_config('svc_task_core')
+        ServiceRegistryClient._cache['svc_task_core'].expires_at = 0
+        
+        new_config = dict(DB_CONFIG, database='replica')
+        mock_fetch.return_value = new_config
+        assert ServiceRegistryClient.get_db_config('svc_task_core') == DB_CONFIG
+        
+        for _ in range(100):
+            if ServiceRegistryClient.cache_stats()["refreshes"]:
+                break
+            time.sleep(0.01)
+        assert ServiceRegistryClient.get_db_config('svc_task_core') == new_config
+        assert ServiceRegistryClient.cache_stats()["stale_hits"] == 1
+    
+    @patch('registry.ServiceRegistryClient.fetch_db_config')
+    def test_failed_refresh_backs_off(self, mock_fetch):
+        """Тест: після невдалого оновлення застарілий запис віддається без нових спроб"""
+        mock_fetch.return_value = DB_CONFIG
+        ServiceRegistryClient.get_db_config('svc_task_core')
+        ServiceRegistryClient._cache['svc_task_core'].expires_at = 0
+        mock_fetch.side_effect = Exception("Registry Unavailable")
+        
+        assert ServiceRegistryClient.get_db_config('svc_task_core') == DB_CONFIG
+        for _ in range(100):
+            if ServiceRegistryClient.cache_stats()["refresh_errors"]:
+                break
+            time.sleep(0.01)
+        for _ in range(20):
+            assert ServiceRegistryClient.get_db_config('svc_task_core') == DB_CONFIG
+        
+        assert mock_fetch.call_count == 2
+        entry = ServiceRegistryClient._cache['svc_task_core']
+        assert entry.failures == 1
+        assert entry.expires_at > time.monotonic()
+    
+    @patch('registry.ServiceRegistryClient.fetch_db_config')
+    def test_registry_error_not_cached(self, mock_fetch):
+        """Тест: помилка Реєстру не потрапляє в кеш"""
+        mock_fetch.side_effect = Exception("Registry Unavailable")
+        
+        with pytest.raises(Exception):
+            ServiceRegistryClient.get_db_config('svc_task_core')
+        assert ServiceRegistryClient.cache_stats()["entries"] == 0
+
+
 # ============================================
 # Запуск тестів
 # ============================================
@@ -7,20 +7,130 @@ API Gateway (Єдина точка входу)
 Порт: 8000
 """
 
+import asyncio
+import os
+import sys
 import uvicorn
 import httpx
 import requests
-import threading
 import time
+from typing import Optional, Sequence
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from discovery import RoutingTable
+from balancer import LoadBalancer
+from singleflight import SingleFlight
+from circuit_breaker import BreakerRegistry
+from hedging import HedgeDelay, Hedger, RetryBudget
+from limiter import ConcurrencyLimits
+from bulkhead import Bulkhead, BulkheadFull, Bulkheads
+from stats import LatencyStats, TimingMiddleware, route_label
+import metrics
+
+# Спільні модулі мікросервісів (каталог shared/ поруч із каталогом gateway)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "shared"))
+from registry_client import AsyncHeartbeat
 
 SERVICE_NAME = "api-gateway"
 SERVICE_HOST = "127.0.0.1"
 SERVICE_PORT = 8000
 REGISTRY_URL = "http://127.0.0.1:8500"
 
+# Політика балансування між екземплярами сервісу (див. balancer.py):
+# round_robin, least_outstanding або p2c; LB_POLICY_OVERRIDES - для окремих сервісів
+LB_POLICY = "p2c"
+LB_POLICY_OVERRIDES = {}
+
+# Заголовки з'єднання, які проксі не передає далі (RFC 9110, 7.6.1)
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade", "host",
+}
+
+# Заголовки відповіді, які uvicorn додає сам: від upstream не передаються, інакше
+# клієнт отримає два Date та два Server
+SERVER_HEADERS = {"date", "server"}
+
+# Об'єднання однакових одночасних GET маршрутів з coalesce=True (single-flight, див.
+# singleflight.py). Відповідь тоді буферизується, щоб роздати її всім учасникам, тому
+# за замовчуванням вимкнено і такі маршрути передаються потоком
+COALESCING = {
+    "enabled": False,
+}
+
+# Заголовки, від яких залежить відповідь: запити з різними значеннями не об'єднуються
+COALESCE_HEADERS = ("accept", "accept-encoding", "accept-language", "authorization", "cookie")
+
+# Circuit breaker кожного екземпляра upstream (див. circuit_breaker.py)
+CIRCUIT_BREAKER = {
+    "window": 20,
+    "min_calls": 10,
+    "failure_rate": 0.5,
+    "slow_call_ms": 2000.0,
+    "slow_call_rate": 0.8,
+    "open_seconds": 5.0,
+    "max_open_seconds": 60.0,
+    "half_open_probes": 1,
+}
+
+# Хеджування idempotent GET: дублікат на інший екземпляр, якщо перший не відповів
+# за percentile затримки сервісу; хеджі та повтори обмежені бюджетом budget_ratio
+# від основних запитів
+HEDGING = {
+    "enabled": True,
+    "percentile": 95,
+    "min_samples": 20,
+    "default_delay_ms": 100.0,
+    "min_delay_ms": 5.0,
+    "max_retries": 1,
+    "budget_ratio": 0.1,
+    "budget_max_tokens": 10.0,
+}
+
+# Адаптивний (AIMD) ліміт одночасних запитів до кожного upstream-сервісу (див. limiter.py)
+CONCURRENCY_LIMIT = {
+    "initial_limit": 20,
+    "min_limit": 2,
+    "max_limit": 500,
+    "backoff": 0.75,
+    "tolerance": 2.0,
+    "latency_floor_ms": 50.0,
+}
+
+# Класи маршрутів (bulkhead.py): interactive - CRUD для UI, analytics - звіти з повним
+# скануванням таблиць. Кожен клас має власний пул з'єднань, ліміт одночасних запитів і
+# чергу; менше значення priority - вищий пріоритет при розподілі місць
+ROUTE_CLASSES = {
+    "interactive": {
+        "priority": 0,
+        "max_concurrent": 100,
+        "max_queue": 200,
+        "queue_timeout": 1.0,
+        "max_connections": 100,
+        "timeout": 30.0,
+    },
+    "analytics": {
+        "priority": 1,
+        "max_concurrent": 4,
+        "max_queue": 16,
+        "queue_timeout": 5.0,
+        "max_connections": 4,
+        "timeout": 60.0,
+    },
+}
+
+# Секції /api/dashboard: назва -> (сервіс, шлях, значення за замовчуванням, клас маршруту)
+DASHBOARD_SECTIONS = {
+    "tasks": ("task-service", "/tasks?limit=10", [], "interactive"),
+    "categories": ("category-service", "/categories", [], "interactive"),
+    "statistics": ("notification-service", "/statistics", {}, "analytics"),
+    "deadlines": ("notification-service", "/deadlines/check?minutes=60", [], "interactive"),
+}
+# Дедлайн кожної секції dashboard (секунди)
+DASHBOARD_DEADLINE = 2.0
+
 app = FastAPI(
     title="API Gateway",
     description="Єдина точка входу для Simple Task Manager",
@@ -35,77 +145,385 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-http_client = httpx.AsyncClient(timeout=30.0)
+app.add_middleware(TimingMiddleware)
 
+# Класи маршрутів з окремими пулами з'єднань, лімітами та чергами
+bulkheads = Bulkheads(ROUTE_CLASSES)
 
-# ============== РЕЄСТРАЦІЯ ==============
-service_id = None
-heartbeat_started = False
+# Локальна таблиця маршрутизації (див. discovery.py): зміни екземплярів відомих
+# сервісів надходять через /watch Registry, періодичне оновлення знаходить нові сервіси
+routing = RoutingTable(REGISTRY_URL, refresh_interval=30.0, watch=True)
 
-def register_service():
-    global service_id, heartbeat_started
-    try:
-        r = requests.post(f"{REGISTRY_URL}/register", json={
-            "service_name": SERVICE_NAME,
-            "host": SERVICE_HOST,
-            "port": SERVICE_PORT
-        }, timeout=5)
-        if r.status_code == 200:
-            service_id = r.json().get("service_id")
-            print(f"[{SERVICE_NAME}] Registered: {service_id}")
-            # Запускаємо heartbeat тільки після успішної реєстрації
-            if not heartbeat_started:
-                threading.Thread(target=heartbeat_loop, daemon=True).start()
-                heartbeat_started = True
-    except Exception as e:
-        print(f"[{SERVICE_NAME}] Registration failed: {e}")
-
-def heartbeat_loop():
-    while True:
-        time.sleep(10)
-        if service_id:
-            try:
-                requests.post(f"{REGISTRY_URL}/heartbeat/{service_id}", timeout=5)
-            except:
-                pass
+# Балансування між усіма UP-екземплярами сервісу
+balancer = LoadBalancer(LB_POLICY, LB_POLICY_OVERRIDES)
+
+# Circuit breaker-и та виключення проблемних екземплярів з балансування
+breakers = BreakerRegistry(**CIRCUIT_BREAKER)
+
+# Ліміти конкурентності та відкидання надлишкових запитів
+limits = ConcurrencyLimits(**CONCURRENCY_LIMIT)
+
+# Хеджування та повтори з бюджетом
+hedger = Hedger(
+    RetryBudget(HEDGING["budget_ratio"], HEDGING["budget_max_tokens"]),
+    HedgeDelay(HEDGING["percentile"], HEDGING["min_samples"], HEDGING["default_delay_ms"], HEDGING["min_delay_ms"]),
+    HEDGING["max_retries"]
+)
+
+# Об'єднання однакових одночасних GET-запитів (single-flight)
+single_flight = SingleFlight()
+
+# Час пошуку екземпляра в локальній таблиці маршрутизації
+discovery_latency = LatencyStats()
+
+
+# ============== РЕЄСТРАЦІЯ ==============
+# Реєстрація та heartbeat у циклі подій (POST /heartbeat/batch раз на 10 с);
+# екземпляр, який Реєстр видалив, реєструється знову
+heartbeat = AsyncHeartbeat(interval=10.0, timeout=5.0, registry_url=REGISTRY_URL)
 
 
 # ============== SERVICE DISCOVERY ==============
-def discover(service_name: str) -> str:
-    """Знайти URL сервісу через Registry"""
+async def admit(bulkhead: Bulkhead):
+    """Місце в класі маршрутів або 503, якщо його ліміт і черга вичерпані"""
+    try:
+        await bulkhead.acquire()
+    except BulkheadFull:
+        raise HTTPException(status_code=503, detail=f"Route class '{bulkhead.name}' saturated",
+                            headers={"Retry-After": "1"})
+
+
+async def pick_instance(service_name: str, bulkhead: Bulkhead, route: str, exclude: Sequence[str] = ()):
+    """
+    Знайти екземпляр сервісу: локальна таблиця маршрутизації + балансувальник.
+    Екземпляри з відкритим для класу маршрутів circuit breaker не беруть участі в балансуванні;
+    якщо таких не лишилось, одразу повертається 503.
+    exclude - URL екземплярів, які не можна обирати (хедж і повтор).
+    Запит займає місце в класі маршрутів bulkhead, а обраний екземпляр рахується
+    як "запит у процесі" (balancer.begin); усе це звільняє end_call.
+    
+    Returns:
+        tuple: (екземпляр, покоління його circuit breaker для end_call)
+    """
+    started = time.perf_counter()
+    instances = await routing.resolve(service_name)
+    discovery_seconds = time.perf_counter() - started
+    discovery_latency.record(discovery_seconds * 1000)
+    metrics.discovery_duration.observe(discovery_seconds, service_name)
+    
+    await admit(bulkhead)
     try:
-        r = requests.get(f"{REGISTRY_URL}/discover/{service_name}", timeout=5)
-        if r.status_code == 200:
-            return r.json().get("url")
-    except Exception as e:
-        print(f"[Discovery] Failed to discover {service_name}: {e}")
-    return None
-
-
-async def proxy(service_name: str, path: str, request: Request, method: str = None):
-    """Проксі запиту до мікросервісу"""
-    url = discover(service_name)
-    if not url:
+        return choose_instance(service_name, bulkhead, route, instances, exclude)
+    except BaseException:
+        bulkhead.release()
+        raise
+
+
+def choose_instance(service_name: str, bulkhead: Bulkhead, route: str, instances: list, exclude: Sequence[str]):
+    if not instances:
         raise HTTPException(status_code=503, detail=f"Service '{service_name}' unavailable")
     
-    target = f"{url}{path}"
-    if request.url.query:
-        target += f"?{request.url.query}"
+    candidates = breakers.available(instances, bulkhead.name)
+    if not candidates:
+        for instance in instances:
+            breakers.get(instance, bulkhead.name).rejected += 1
+        raise HTTPException(status_code=503, detail=f"Service '{service_name}' unavailable: circuit open",
+                            headers={"Retry-After": "1"})
+    
+    if exclude:
+        candidates = [instance for instance in candidates if instance.url not in exclude]
+        if not candidates:
+            raise HTTPException(status_code=503, detail=f"Service '{service_name}': no other instance available")
+    
+    if not limits.get(f"{service_name}:{bulkhead.name}").try_acquire():
+        # Ліміт конкурентності вичерпано: швидка відмова замість черги
+        raise HTTPException(status_code=503, detail=f"Service '{service_name}' overloaded",
+                            headers={"Retry-After": "1"})
     
-    body = None
-    if method in ["POST", "PUT", "PATCH"]:
-        body = await request.body()
+    instance = balancer.choose(service_name, candidates)
+    generation = breakers.get(instance, bulkhead.name).on_start()
+    balancer.begin(instance)
+    metrics.upstream_in_flight.inc(service_name, instance.url, bulkhead.name, route)
+    return instance, generation
+
+
+def end_call(instance, generation: int, bulkhead: Bulkhead, route: str, started: float, status: Optional[int],
+             latency_ms: float = None, cancelled: bool = False):
+    """
+    Завершення запиту до екземпляра, обраного pick_instance: клас маршрутів,
+    балансувальник, circuit breaker та адаптивний ліміт сервісу.
     
+    Args:
+        generation: Покоління circuit breaker на момент вибору екземпляра
+        route: Шаблон маршруту gateway (route_label), для якого зроблено запит
+        status: HTTP-статус upstream (None - мережева помилка або тайм-аут)
+        latency_ms: Час до відповіді (за замовчуванням - від started до зараз)
+        cancelled: Запит скасовано gateway або клієнтом - не враховується як помилка
+    """
+    bulkhead.release()
+    metrics.upstream_in_flight.dec(instance.service_name, instance.url, bulkhead.name, route)
+    limiter = limits.get(f"{instance.service_name}:{bulkhead.name}")
+    if cancelled:
+        balancer.end(instance, False)
+        breakers.get(instance, bulkhead.name).cancel(generation)
+        limiter.release(started, None, None)
+        return
+    if latency_ms is None:
+        latency_ms = (time.perf_counter() - started) * 1000
+    failed = status is None or status >= 500
+    balancer.end(instance, failed)
+    breakers.get(instance, bulkhead.name).record(generation, failed, latency_ms)
+    limiter.release(started, latency_ms, status, route)
+    
+    labels = (instance.service_name, instance.url, bulkhead.name, route)
+    metrics.upstream_requests_total.inc(*labels, str(status) if status is not None else "error")
+    if failed:
+        metrics.upstream_errors_total.inc(*labels)
+    metrics.upstream_duration.observe(latency_ms / 1000, *labels)
+
+
+async def upstream_call(request: Optional[Request], service_name: str, method: str, path: str,
+                        route_class: str = "interactive", **kwargs) -> httpx.Response:
+    """
+    Запит до екземпляра мікросервісу, обраного балансувальником.
+    Веде облік запитів у процесі (in-flight) та часу upstream для метрик gateway.
+    request=None - службовий запит (/health), час якого не додається до upstream_ms;
+    мітка route у метриках тоді - шлях upstream.
+    """
+    bulkhead = bulkheads.get(route_class)
+    route = route_label(request.scope) if request is not None else path
+    instance, generation = await pick_instance(service_name, bulkhead, route)
+    status = None
+    cancelled = False
+    started = time.perf_counter()
+    try:
+        resp = await bulkhead.client.request(method, f"{instance.url}{path}", **kwargs)
+        status = resp.status_code
+        return resp
+    except asyncio.CancelledError:
+        cancelled = True
+        raise
+    finally:
+        end_call(instance, generation, bulkhead, route, started, status, cancelled=cancelled)
+        if request is not None:
+            request.state.upstream_ms += (time.perf_counter() - started) * 1000
+
+
+def forward_headers(headers) -> list:
+    """Заголовки для передачі через проксі (без hop-by-hop)"""
+    return [
+        (name, value) for name, value in headers.raw
+        if name.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS
+    ]
+
+
+def response_headers(headers) -> list:
+    """Заголовки відповіді upstream для клієнта (без hop-by-hop та SERVER_HEADERS)"""
+    return [
+        (name, value) for name, value in forward_headers(headers)
+        if name.decode("latin-1").lower() not in SERVER_HEADERS
+    ]
+
+
+def upstream_headers(request: Request) -> list:
+    """Заголовки запиту до upstream"""
+    headers = forward_headers(request.headers)
+    if "accept-encoding" not in request.headers:
+        # Інакше httpx додасть власний Accept-Encoding і клієнт отримає стиснене тіло
+        headers.append((b"accept-encoding", b"identity"))
+    return headers
+
+
+async def fetch_buffered(service_name: str, method: str, path: str, headers: list,
+                         bulkhead: Bulkhead, route: str, tried: list = None) -> tuple:
+    """
+    Запит до upstream з буферизацією сирого тіла відповіді (без розпакування).
+    tried - URL уже використаних екземплярів: обирається інший, а URL обраного
+    додається до списку.
+
+    Returns:
+        tuple: (статус, заголовки відповіді, тіло)
+    """
+    instance, generation = await pick_instance(service_name, bulkhead, route, tried or ())
+    if tried is not None:
+        tried.append(instance.url)
+    status = None
+    cancelled = False
+    started = time.perf_counter()
     try:
-        resp = await http_client.request(
-            method=method or request.method,
-            url=target,
-            content=body,
-            headers={"Content-Type": "application/json"}
+        resp = await bulkhead.client.send(
+            bulkhead.client.build_request(method, f"{instance.url}{path}", headers=headers), stream=True
         )
-        return JSONResponse(status_code=resp.status_code, content=resp.json() if resp.content else None)
+        try:
+            body = b"".join([chunk async for chunk in resp.aiter_raw()])
+        finally:
+            await resp.aclose()
+        status = resp.status_code
+        return resp.status_code, response_headers(resp.headers), body
     except httpx.ConnectError:
         raise HTTPException(status_code=503, detail=f"Cannot connect to {service_name}")
+    except asyncio.CancelledError:
+        cancelled = True
+        raise
+    finally:
+        # Скасований запит (програв хедж) не є помилкою екземпляра
+        end_call(instance, generation, bulkhead, route, started, status, cancelled=cancelled)
+
+
+async def fetch_hedged(service_name: str, path: str, headers: list, bulkhead: Bulkhead, route: str) -> tuple:
+    """Буферизований GET з хеджуванням та повторами на інших екземплярах (див. hedging.py)"""
+    return await hedger.run(
+        service_name,
+        lambda tried: fetch_buffered(service_name, "GET", path, headers, bulkhead, route, tried),
+        lambda tried: has_alternative(service_name, bulkhead.name, tried)
+    )
+
+
+def has_alternative(service_name: str, route_class: str, tried: list) -> bool:
+    """Чи є доступний для класу маршруту екземпляр, якого ще немає в tried (для хеджу та повтору)"""
+    return any(instance.url not in tried
+               for instance in breakers.available(routing.instances(service_name), route_class))
+
+
+async def coalesced_get(service_name: str, path: str, request: Request, bulkhead: Bulkhead,
+                        hedge: bool) -> Response:
+    """
+    Буферизований GET з single-flight: однакові одночасні запити (метод, шлях,
+    query та заголовки з COALESCE_HEADERS) отримують відповідь одного
+    upstream-виклику; hedge - хеджування та обмежені повтори (якщо увімкнено в HEDGING).
+    """
+    headers = upstream_headers(request)
+    route = route_label(request.scope)
+    if hedge and HEDGING["enabled"]:
+        fetch = lambda: fetch_hedged(service_name, path, headers, bulkhead, route)
+    else:
+        fetch = lambda: fetch_buffered(service_name, "GET", path, headers, bulkhead, route)
+    
+    started = time.perf_counter()
+    key = ("GET", service_name, path, bulkhead.name, *(request.headers.get(name, "") for name in COALESCE_HEADERS))
+    try:
+        status, forwarded, body = await single_flight.do(key, fetch)
+    finally:
+        request.state.upstream_ms += (time.perf_counter() - started) * 1000
+    
+    response = Response(content=body, status_code=status)
+    response.raw_headers.extend(
+        (name, value) for name, value in forwarded if name.lower() != b"content-length"
+    )
+    return response
+
+
+async def open_upstream(service_name: str, method: str, path: str, headers: list, bulkhead: Bulkhead,
+                        request: Request, content=None, tried: list = None) -> tuple:
+    """
+    Запит до upstream до отримання заголовків відповіді; тіло не читається.
+    tried - як у fetch_buffered.
+    
+    Returns:
+        tuple: (статус, відповідь httpx, finish); finish(status, cancelled) закриває
+        відповідь і завершує облік запиту (end_call), повторні виклики ігноруються
+    """
+    route = route_label(request.scope)
+    instance, generation = await pick_instance(service_name, bulkhead, route, tried or ())
+    if tried is not None:
+        tried.append(instance.url)
+    upstream_request = bulkhead.client.build_request(method, f"{instance.url}{path}", headers=headers, content=content)
+    
+    started = time.perf_counter()
+    resp = None
+    # Для circuit breaker та ліміту важливий час до заголовків відповіді, а не передача тіла
+    headers_ms = None
+    finished = False
+    
+    async def finish(status: Optional[int], cancelled: bool = False):
+        # Викликається з генератора, з фонової задачі або для хеджу, що програв
+        nonlocal finished
+        if finished:
+            return
+        finished = True
+        if resp is not None:
+            await resp.aclose()
+        end_call(instance, generation, bulkhead, route, started, status, headers_ms, cancelled)
+        if not cancelled:
+            request.state.upstream_ms += (time.perf_counter() - started) * 1000
+    
+    try:
+        resp = await bulkhead.client.send(upstream_request, stream=True)
+    except httpx.ConnectError:
+        await finish(None)
+        raise HTTPException(status_code=503, detail=f"Cannot connect to {service_name}")
+    except asyncio.CancelledError:
+        await finish(None, cancelled=True)
+        raise
+    except BaseException:
+        await finish(None)
+        raise
+    headers_ms = (time.perf_counter() - started) * 1000
+    return resp.status_code, resp, finish
+
+
+def stream_response(resp: httpx.Response, finish) -> StreamingResponse:
+    """Відповідь клієнту, що передає тіло upstream частинами (finish - з open_upstream)"""
+    async def relay():
+        status = resp.status_code
+        completed = False
+        try:
+            async for chunk in resp.aiter_raw():
+                yield chunk
+            completed = True
+        except httpx.HTTPError:
+            # Upstream обірвав передачу тіла
+            status = None
+            raise
+        finally:
+            # Передачу не завершено без помилки upstream - клієнт відключився
+            await finish(status, cancelled=not completed and status is not None)
+    
+    response = StreamingResponse(
+        relay(),
+        status_code=resp.status_code,
+        # Якщо клієнт відключився до початку передачі тіла
+        background=BackgroundTask(finish, None, True)
+    )
+    response.raw_headers.extend(response_headers(resp.headers))
+    return response
+
+
+async def proxy(service_name: str, path: str, request: Request, method: str = None,
+                coalesce: bool = False, hedge: bool = False, route_class: str = "interactive"):
+    """
+    Потокове проксі запиту до мікросервісу.
+    Тіло запиту та відповіді передаються частинами без розбору: статус, заголовки
+    та стиснення (Content-Encoding) upstream зберігаються, а пам'ять gateway
+    не залежить від розміру відповіді.
+    
+    coalesce=True - GET-запити маршруту об'єднуються (single-flight), якщо
+    увімкнено в COALESCING; відповідь тоді буферизується, щоб роздати її всім учасникам.
+    hedge=True - GET-запити маршруту хеджуються за часом до заголовків відповіді
+    (лише idempotent-маршрути); тіло переможця передається потоком.
+    route_class - клас маршруту з ROUTE_CLASSES (пул з'єднань, ліміт, черга).
+    """
+    if request.url.query:
+        path += f"?{request.url.query}"
+    method = method or request.method
+    bulkhead = bulkheads.get(route_class)
+    
+    if method == "GET" and coalesce and COALESCING["enabled"]:
+        return await coalesced_get(service_name, path, request, bulkhead, hedge)
+    
+    headers = upstream_headers(request)
+    if method == "GET" and hedge and HEDGING["enabled"]:
+        _, resp, finish = await hedger.run(
+            service_name,
+            lambda tried: open_upstream(service_name, "GET", path, headers, bulkhead, request, tried=tried),
+            lambda tried: has_alternative(service_name, bulkhead.name, tried),
+            # Відповідь, що не пішла клієнту (невдала перед повтором або програла хедж), закривається
+            discard=lambda result: result[2](result[0], cancelled=result[0] < 500)
+        )
+    else:
+        content = request.stream() if method in ["POST", "PUT", "PATCH"] else None
+        _, resp, finish = await open_upstream(service_name, method, path, headers, bulkhead, request, content)
+    return stream_response(resp, finish)
 
 
 # ============== СИСТЕМНІ ЕНДПОІНТИ ==============
@@ -127,33 +545,61 @@ async def health():
     """Перевірка стану всіх сервісів"""
     services = {}
     for svc in ["task-service", "category-service", "notification-service"]:
-        url = discover(svc)
-        if url:
-            try:
-                r = await http_client.get(f"{url}/health", timeout=3)
-                services[svc] = "UP" if r.status_code == 200 else "DOWN"
-            except:
-                services[svc] = "DOWN"
-        else:
-            services[svc] = "NOT_REGISTERED"
+        try:
+            # Без request: службові перевірки не входять у час upstream запиту
+            r = await upstream_call(None, svc, "GET", "/health", timeout=3)
+            services[svc] = "UP" if r.status_code == 200 else "DOWN"
+        except HTTPException:
+            # Немає в таблиці маршрутизації або всі екземпляри виключені circuit breaker-ом
+            services[svc] = "DOWN" if routing.instances(svc) else "NOT_REGISTERED"
+        except Exception:
+            services[svc] = "DOWN"
     
     return {"status": "healthy", "gateway": "UP", "services": services}
 
 
+@app.get("/gateway/stats")
+def gateway_stats():
+    """Статистика gateway: таблиця маршрутизації, балансування та додана затримка"""
+    return {
+        "discovery": routing.stats(),
+        "balancer": balancer.stats(),
+        "single_flight": single_flight.stats(),
+        "circuit_breakers": breakers.stats(),
+        "hedging": hedger.stats(),
+        "concurrency_limits": limits.stats(),
+        "route_classes": bulkheads.stats(),
+        "heartbeat": heartbeat.stats(),
+        "discovery_latency_ms": discovery_latency.snapshot(),
+        "gateway_overhead_ms": TimingMiddleware.overhead.snapshot(),
+        "upstream_latency_ms": TimingMiddleware.upstream.snapshot(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Метрики у текстовому форматі Prometheus"""
+    metrics.coalescing_ratio.set(single_flight.stats()["coalescing_ratio"])
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/services")
 def list_services():
-    """Список зареєстрованих сервісів"""
+    """Список зареєстрованих сервісів (зі станом circuit breaker-ів gateway за класами маршрутів)"""
     try:
         r = requests.get(f"{REGISTRY_URL}/services", timeout=5)
-        return r.json()
+        data = r.json()
     except:
         return {"error": "Registry unavailable"}
+    for info in data.get("services", []):
+        info["circuit"] = breakers.state(f"http://{info.get('host')}:{info.get('port')}")
+    return data
 
 
 # ============== TASK SERVICE (8001) ==============
 @app.api_route("/api/tasks", methods=["GET", "POST"])
 async def tasks_proxy(request: Request):
-    return await proxy("task-service", "/tasks", request, request.method)
+    return await proxy("task-service", "/tasks", request, request.method, coalesce=True, hedge=True)
 
 
 @app.api_route("/api/tasks/{task_id}", methods=["GET", "DELETE"])
@@ -162,18 +608,14 @@ async def task_by_id_proxy(task_id: int, request: Request):
 
 
 @app.patch("/api/tasks/{task_id}/status")
-async def task_status_proxy(task_id: int, new_status: str):
-    url = discover("task-service")
-    if not url:
-        raise HTTPException(status_code=503, detail="task-service unavailable")
-    r = await http_client.patch(f"{url}/tasks/{task_id}/status?new_status={new_status}")
-    return JSONResponse(status_code=r.status_code, content=r.json())
+async def task_status_proxy(task_id: int, new_status: str, request: Request):
+    return await proxy("task-service", f"/tasks/{task_id}/status", request)
 
 
 # ============== CATEGORY SERVICE (8002) ==============
 @app.api_route("/api/categories", methods=["GET", "POST"])
 async def categories_proxy(request: Request):
-    return await proxy("category-service", "/categories", request, request.method)
+    return await proxy("category-service", "/categories", request, request.method, coalesce=True, hedge=True)
 
 
 @app.api_route("/api/categories/{category_id}", methods=["GET", "DELETE"])
@@ -183,76 +625,87 @@ async def category_by_id_proxy(category_id: int, request: Request):
 
 # ============== NOTIFICATION SERVICE (8003) ==============
 @app.get("/api/notifications/deadlines")
-async def deadlines_proxy(minutes: int = 30):
-    url = discover("notification-service")
-    if not url:
-        raise HTTPException(status_code=503, detail="notification-service unavailable")
-    r = await http_client.get(f"{url}/deadlines/check?minutes={minutes}")
-    return JSONResponse(status_code=r.status_code, content=r.json())
+async def deadlines_proxy(request: Request, minutes: int = 30):
+    return await proxy("notification-service", "/deadlines/check", request)
 
 
 @app.post("/api/notifications/deadlines/analyze")
-async def analyze_proxy():
-    url = discover("notification-service")
-    if not url:
-        raise HTTPException(status_code=503, detail="notification-service unavailable")
-    r = await http_client.post(f"{url}/deadlines/analyze")
-    return JSONResponse(status_code=r.status_code, content=r.json())
+async def analyze_proxy(request: Request):
+    return await proxy("notification-service", "/deadlines/analyze", request, route_class="analytics")
 
 
 @app.get("/api/notifications/statistics")
-async def statistics_proxy():
-    url = discover("notification-service")
-    if not url:
-        raise HTTPException(status_code=503, detail="notification-service unavailable")
-    r = await http_client.get(f"{url}/statistics")
-    return JSONResponse(status_code=r.status_code, content=r.json())
+async def statistics_proxy(request: Request):
+    return await proxy("notification-service", "/statistics", request, route_class="analytics")
 
 
 # ============== АГРЕГАЦІЯ ==============
-@app.get("/api/dashboard")
-async def dashboard():
-    """Агрегація даних з усіх сервісів"""
-    result = {"tasks": [], "categories": [], "statistics": {}, "deadlines": []}
-    
+async def fetch_section(request: Request, service_name: str, path: str, route_class: str, deadline: float):
+    """
+    Одна секція dashboard з власним дедлайном.
+
+    Returns:
+        tuple: (статус секції, дані або None); статус - ok, timeout,
+        unavailable (сервіс не зареєстровано) або error
+    """
     try:
-        url = discover("task-service")
-        if url:
-            r = await http_client.get(f"{url}/tasks?limit=10")
-            if r.status_code == 200:
-                result["tasks"] = r.json()
-    except: pass
-    
+        r = await asyncio.wait_for(upstream_call(request, service_name, "GET", path, route_class), deadline)
+    except asyncio.TimeoutError:
+        return "timeout", None
+    except HTTPException:
+        return "unavailable", None
+    except Exception:
+        return "error", None
+    if r.status_code != 200:
+        return "error", None
     try:
-        url = discover("category-service")
-        if url:
-            r = await http_client.get(f"{url}/categories")
-            if r.status_code == 200:
-                result["categories"] = r.json()
-    except: pass
+        return "ok", r.json()
+    except ValueError:
+        return "error", None
+
+
+@app.get("/api/dashboard")
+async def dashboard(request: Request):
+    """
+    Агрегація даних з усіх сервісів.
+    Усі підзапити виконуються паралельно, кожен зі своїм дедлайном; секції,
+    що не вклалися, повертаються зі значенням за замовчуванням, а їх стан -
+    у полі sections.
+    """
+    result = {name: default for name, (_, _, default, _) in DASHBOARD_SECTIONS.items()}
+    names = list(DASHBOARD_SECTIONS)
     
-    try:
-        url = discover("notification-service")
-        if url:
-            r = await http_client.get(f"{url}/statistics")
-            if r.status_code == 200:
-                result["statistics"] = r.json()
-            r = await http_client.get(f"{url}/deadlines/check?minutes=60")
-            if r.status_code == 200:
-                result["deadlines"] = r.json()
-    except: pass
+    # Підзапити перекриваються в часі, тому для метрик upstream рахується
+    # тривалість усієї паралельної фази, а не сума часу підзапитів
+    upstream_before = request.state.upstream_ms
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(
+        fetch_section(request, service_name, path, route_class, DASHBOARD_DEADLINE)
+        for service_name, path, _, route_class in DASHBOARD_SECTIONS.values()
+    ))
+    request.state.upstream_ms = upstream_before + (time.perf_counter() - started) * 1000
     
+    sections = {}
+    for name, (status, data) in zip(names, outcomes):
+        sections[name] = status
+        if status == "ok":
+            result[name] = data
+    result["sections"] = sections
     return result
 
 
 @app.on_event("startup")
-def startup():
-    register_service()
+async def startup():
+    await heartbeat.register(SERVICE_NAME, SERVICE_HOST, SERVICE_PORT)
+    heartbeat.start()
+    await routing.start()
 
 
 @app.on_event("shutdown")
 async def shutdown():
-    await http_client.aclose()
+    await heartbeat.stop()
+    await routing.stop()
+    await bulkheads.aclose()
 
 
 if __name__ == "__main__":
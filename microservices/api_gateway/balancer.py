@@ -0,0 +1,97 @@
+"""
+Балансування навантаження API Gateway (balancer.py)
+
+Розподіляє запити між усіма UP-екземплярами сервісу з таблиці маршрутизації.
+Політики:
+- round_robin - по черзі;
+- least_outstanding - екземпляр з найменшою кількістю незавершених запитів;
+- p2c - "power of two choices": з двох випадкових екземплярів обирається
+  менш завантажений (майже як least_outstanding, але без "стадного" ефекту).
+"""
+
+import itertools
+import random
+from typing import Dict, List, Optional
+
+
+POLICIES = ("round_robin", "least_outstanding", "p2c")
+
+
+class InstanceState:
+    """Лічильники екземпляра: запити в процесі, всього, помилки."""
+
+    __slots__ = ("in_flight", "requests", "errors")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+
+
+class LoadBalancer:
+    """
+    Вибір екземпляра та облік запитів у процесі (in-flight).
+
+    Args:
+        policy: Політика за замовчуванням
+        overrides: Політики для окремих сервісів {service_name: policy}
+    """
+
+    def __init__(self, policy: str = "p2c", overrides: Optional[Dict[str, str]] = None):
+        for name in [policy, *(overrides or {}).values()]:
+            if name not in POLICIES:
+                raise ValueError(f"Unknown balancing policy '{name}', expected one of {POLICIES}")
+        self.policy = policy
+        self.overrides = dict(overrides or {})
+        self._state: Dict[str, InstanceState] = {}
+        self._counters: Dict[str, itertools.count] = {}
+
+    def policy_for(self, service_name: str) -> str:
+        return self.overrides.get(service_name, self.policy)
+
+    def state(self, instance) -> InstanceState:
+        state = self._state.get(instance.url)
+        if state is None:
+            state = self._state[instance.url] = InstanceState()
+        return state
+
+    def choose(self, service_name: str, instances: List) -> Optional[object]:
+        """Обирає екземпляр згідно з політикою сервісу."""
+        if not instances:
+            return None
+        if len(instances) == 1:
+            return instances[0]
+
+        policy = self.policy_for(service_name)
+        if policy == "round_robin":
+            counter = self._counters.setdefault(service_name, itertools.count())
+            return instances[next(counter) % len(instances)]
+        if policy == "least_outstanding":
+            # Випадковий порядок серед рівних, щоб не перевантажувати перший екземпляр
+            return min(random.sample(instances, len(instances)),
+                       key=lambda i: self.state(i).in_flight)
+        first, second = random.sample(instances, 2)
+        return first if self.state(first).in_flight <= self.state(second).in_flight else second
+
+    def begin(self, instance):
+        """Початок запиту до екземпляра."""
+        state = self.state(instance)
+        state.in_flight += 1
+        state.requests += 1
+
+    def end(self, instance, failed: bool = False):
+        """Завершення запиту (разом з передачею тіла відповіді)."""
+        state = self.state(instance)
+        state.in_flight -= 1
+        if failed:
+            state.errors += 1
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "overrides": self.overrides,
+            "instances": {
+                url: {"in_flight": s.in_flight, "requests": s.requests, "errors": s.errors}
+                for url, s in sorted(self._state.items())
+            },
+        }
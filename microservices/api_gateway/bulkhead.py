@@ -0,0 +1,158 @@
+"""
+Ізоляція класів маршрутів API Gateway (bulkhead.py)
+
+Кожен клас маршрутів (наприклад, interactive - CRUD для UI, analytics -
+важкі звіти) має власний пул з'єднань httpx, ліміт одночасних запитів та
+обмежену чергу очікування. Переповнення одного класу не забирає з'єднань
+і місць у іншого. Класи мають пріоритет: поки в черзі класу з вищим
+пріоритетом є запити, нижчі класи не отримують нових місць.
+"""
+
+import asyncio
+from collections import deque
+from typing import Dict, List
+
+import httpx
+
+
+class BulkheadFull(Exception):
+    """Ліміт класу та його черга вичерпані (або минув час очікування в черзі)."""
+
+
+class Bulkhead:
+    """
+    Args:
+        name: Назва класу маршрутів
+        priority: Пріоритет (менше число - вищий пріоритет)
+        max_concurrent: Максимум одночасних запитів до upstream
+        max_queue: Максимум запитів, що чекають на місце
+        queue_timeout: Максимальний час очікування в черзі (секунди)
+        max_connections: Розмір власного пулу з'єднань httpx
+        timeout: Тайм-аут запитів до upstream (секунди)
+    """
+
+    def __init__(self, name: str, priority: int = 0, max_concurrent: int = 50, max_queue: int = 100,
+                 queue_timeout: float = 1.0, max_connections: int = 50, timeout: float = 30.0):
+        self.name = name
+        self.priority = priority
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self.group = None
+        self._waiters = deque()
+        self.in_flight = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _has_room(self) -> bool:
+        if self.in_flight >= self.max_concurrent:
+            return False
+        return self.group is None or not self.group.higher_waiting(self)
+
+    async def acquire(self):
+        """Місце для запиту: одразу, після очікування в черзі або BulkheadFull."""
+        if not self._waiters and self._has_room():
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise BulkheadFull(self.name)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # Місце вже передано цьому запиту - повертаємо його
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+                self.release_waiting()
+            if isinstance(e, asyncio.TimeoutError):
+                self.rejected += 1
+                raise BulkheadFull(self.name) from None
+            raise
+        self.admitted += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self.release_waiting()
+
+    def release_waiting(self):
+        """Передача вільних місць запитам з черг (з урахуванням пріоритету класів)."""
+        if self.group is not None:
+            self.group.dispatch()
+        else:
+            self._dispatch()
+
+    def _dispatch(self) -> bool:
+        """Передає вільні місця запитам з черги. Повертає True, якщо черга не порожня."""
+        while self._waiters and self._has_room():
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+        return bool(self._waiters)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+    def stats(self) -> dict:
+        return {
+            "priority": self.priority,
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+        }
+
+
+class Bulkheads:
+    """Класи маршрутів {назва: налаштування Bulkhead}."""
+
+    def __init__(self, classes: Dict[str, dict]):
+        self._bulkheads = {name: Bulkhead(name, **settings) for name, settings in classes.items()}
+        self._ordered: List[Bulkhead] = sorted(self._bulkheads.values(), key=lambda b: b.priority)
+        for bulkhead in self._ordered:
+            bulkhead.group = self
+
+    def get(self, name: str) -> Bulkhead:
+        return self._bulkheads[name]
+
+    def higher_waiting(self, bulkhead: Bulkhead) -> bool:
+        """Чи є запити в черзі класів з вищим пріоритетом."""
+        return any(other.waiting for other in self._ordered if other.priority < bulkhead.priority)
+
+    def dispatch(self):
+        # Вільні місця роздаються в порядку пріоритету класів
+        for bulkhead in self._ordered:
+            bulkhead._dispatch()
+
+    async def aclose(self):
+        for bulkhead in self._ordered:
+            await bulkhead.client.aclose()
+
+    def stats(self) -> dict:
+        return {name: bulkhead.stats() for name, bulkhead in self._bulkheads.items()}
@@ -0,0 +1,168 @@
+"""
+Circuit breaker для екземплярів upstream (circuit_breaker.py)
+
+Кожна пара (екземпляр сервісу, клас маршруту) має власний автомат станів:
+повільні звіти класу analytics не виключають екземпляр з балансування для
+interactive-запитів, які він обслуговує нормально.
+- CLOSED - запити проходять, результати останніх window викликів рахуються;
+- OPEN - частка помилок або повільних викликів перевищила поріг: екземпляр
+  виключається з балансування (outlier ejection) на open_seconds, кожне
+  наступне поспільне спрацювання подвоює час (до max_open_seconds);
+- HALF_OPEN - після паузи пропускається half_open_probes пробних запитів:
+  успіх закриває breaker, помилка знову відкриває.
+
+Кожен перехід між станами збільшує generation. on_start() повертає поточне
+покоління, і результат запиту враховується лише в тому самому поколінні:
+запит, розпочатий до спрацювання breaker, не стане результатом пробного
+запиту в HALF_OPEN.
+"""
+
+import time
+from collections import deque
+from typing import Dict, List, Tuple
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitBreaker:
+    """
+    Args:
+        window: Кількість останніх викликів для розрахунку часток
+        min_calls: Мінімум викликів у вікні, щоб breaker міг спрацювати
+        failure_rate: Поріг частки помилок (мережеві помилки та 5xx)
+        slow_call_ms: Виклик, довший за цей час, вважається повільним
+        slow_call_rate: Поріг частки повільних викликів
+        open_seconds: Початковий час у стані OPEN
+        max_open_seconds: Максимальний час у стані OPEN
+        half_open_probes: Кількість одночасних пробних запитів у HALF_OPEN
+    """
+
+    def __init__(self, window: int = 20, min_calls: int = 10, failure_rate: float = 0.5,
+                 slow_call_ms: float = 2000.0, slow_call_rate: float = 0.8,
+                 open_seconds: float = 5.0, max_open_seconds: float = 60.0,
+                 half_open_probes: int = 1):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_ms = slow_call_ms
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self.generation = 0
+        self._outcomes = deque(maxlen=window)  # (failed, slow)
+        self._open_until = 0.0
+        self._consecutive_trips = 0
+        self._probes = 0
+        self.trips = 0
+        self.rejected = 0
+        self.stale = 0
+
+    def available(self) -> bool:
+        """Чи можна зараз надіслати запит (без зміни стану)."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return time.monotonic() >= self._open_until
+        return self._probes < self.half_open_probes
+
+    def on_start(self) -> int:
+        """Екземпляр обрано для запиту. Повертає покоління для record() / cancel()."""
+        if self.state == OPEN:
+            self._transition(HALF_OPEN)
+            self._probes = 0
+        if self.state == HALF_OPEN:
+            self._probes += 1
+        return self.generation
+
+    def record(self, generation: int, failed: bool, elapsed_ms: float):
+        """Результат запиту, розпочатого в поколінні generation."""
+        if generation != self.generation:
+            # Запит розпочато в іншому стані (наприклад, до спрацювання breaker)
+            self.stale += 1
+            return
+        slow = elapsed_ms >= self.slow_call_ms
+        if self.state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+            if failed or slow:
+                self._trip()
+            else:
+                self._close()
+            return
+
+        self._outcomes.append((failed, slow))
+        calls = len(self._outcomes)
+        if calls < self.min_calls:
+            return
+        failures = sum(1 for f, _ in self._outcomes if f)
+        slow_calls = sum(1 for _, s in self._outcomes if s)
+        if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+            self._trip()
+
+    def cancel(self, generation: int):
+        """Запит скасовано (наприклад, програв хедж) - без впливу на статистику."""
+        if generation == self.generation and self.state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+
+    def _transition(self, state: str):
+        self.state = state
+        self.generation += 1
+
+    def _trip(self):
+        self._consecutive_trips += 1
+        self.trips += 1
+        duration = min(self.open_seconds * 2 ** (self._consecutive_trips - 1), self.max_open_seconds)
+        self._transition(OPEN)
+        self._open_until = time.monotonic() + duration
+        self._outcomes.clear()
+
+    def _close(self):
+        self._transition(CLOSED)
+        self._consecutive_trips = 0
+        self._outcomes.clear()
+
+    def snapshot(self) -> dict:
+        calls = len(self._outcomes)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "failure_rate": round(sum(1 for f, _ in self._outcomes if f) / calls, 3) if calls else 0.0,
+            "slow_call_rate": round(sum(1 for _, s in self._outcomes if s) / calls, 3) if calls else 0.0,
+            "open_remaining_s": round(max(self._open_until - time.monotonic(), 0.0), 2) if self.state == OPEN else 0.0,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "stale": self.stale,
+        }
+
+
+class BreakerRegistry:
+    """Circuit breaker-и екземплярів, ключ - (URL екземпляра, клас маршруту)."""
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, instance, route_class: str) -> CircuitBreaker:
+        key = (instance.url, route_class)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(**self.settings)
+        return breaker
+
+    def available(self, instances: List, route_class: str) -> List:
+        """Екземпляри, не виключені з балансування для класу маршруту."""
+        return [instance for instance in instances if self.get(instance, route_class).available()]
+
+    def state(self, url: str) -> Dict[str, str]:
+        """Стан breaker-ів екземпляра за класами маршрутів."""
+        return {route_class: breaker.state
+                for (breaker_url, route_class), breaker in sorted(self._breakers.items()) if breaker_url == url}
+
+    def stats(self) -> dict:
+        result: Dict[str, dict] = {}
+        for (url, route_class), breaker in sorted(self._breakers.items()):
+            result.setdefault(url, {})[route_class] = breaker.snapshot()
+        return result
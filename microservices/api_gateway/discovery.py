@@ -0,0 +1,195 @@
+"""
+Локальна таблиця маршрутизації API Gateway (discovery.py)
+
+Замість синхронного запиту до Registry на кожен проксійований запит gateway
+тримає локальну копію списку UP-екземплярів, яку фонова задача asyncio
+оновлює раз на refresh_interval секунд одним запитом GET /services.
+У сталому режимі пошук сервісу - це читання словника без мережевих викликів.
+
+З watch=True для кожного відомого сервісу працює блокуючий запит
+GET /watch/{service_name}?index=...: Registry відповідає одразу після зміни
+набору UP-екземплярів, тому таблиця оновлюється за мілісекунди, а періодичне
+оновлення лише знаходить нові сервіси.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+
+class Instance:
+    """Екземпляр сервісу з таблиці маршрутизації."""
+
+    __slots__ = ("service_name", "host", "port", "url")
+
+    def __init__(self, service_name: str, host: str, port: int):
+        self.service_name = service_name
+        self.host = host
+        self.port = port
+        self.url = f"http://{host}:{port}"
+
+    def __repr__(self):
+        return f"Instance({self.service_name}, {self.url})"
+
+
+class RoutingTable:
+    """
+    Кеш Service Discovery з фоновим оновленням.
+
+    - refresh_interval: період фонового оновлення (секунди);
+    - miss_refresh_interval: не частіше ніж раз на цей час таблиця
+      оновлюється позапланово, якщо сервіс не знайдено.
+    """
+
+    def __init__(self, registry_url: str, refresh_interval: float = 5.0,
+                 miss_refresh_interval: float = 1.0, timeout: float = 3.0,
+                 watch: bool = False, watch_timeout: float = 30.0):
+        self.registry_url = registry_url
+        self.refresh_interval = refresh_interval
+        self.miss_refresh_interval = miss_refresh_interval
+        self.timeout = timeout
+        self.watch = watch
+        self.watch_timeout = watch_timeout
+        self._client = httpx.AsyncClient(timeout=timeout)
+        self._watches: Dict[str, asyncio.Task] = {}
+        self._watch_updates = 0
+        self._watch_errors = 0
+        self._routes: Dict[str, List[Instance]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
+        self._last_refresh = 0.0
+        self._last_error: Optional[str] = None
+        self._refreshes = 0
+        self._refresh_errors = 0
+        self._miss_refreshes = 0
+        self._last_refresh_ms: Optional[float] = None
+
+    async def start(self):
+        """Перше заповнення таблиці та запуск фонового оновлення."""
+        await self.refresh()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        for task in self._watches.values():
+            task.cancel()
+        await asyncio.gather(*self._watches.values(), return_exceptions=True)
+        self._watches.clear()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._client.aclose()
+
+    def instances(self, service_name: str) -> List[Instance]:
+        """UP-екземпляри сервісу з локальної таблиці (без мережевих викликів)."""
+        return self._routes.get(service_name, [])
+
+    async def resolve(self, service_name: str) -> List[Instance]:
+        """
+        UP-екземпляри сервісу. Якщо сервісу немає в таблиці, виконується
+        позапланове оновлення (не частіше ніж раз на miss_refresh_interval).
+        """
+        instances = self._routes.get(service_name)
+        if instances:
+            return instances
+        if time.monotonic() - self._last_refresh >= self.miss_refresh_interval:
+            async with self._refresh_lock:
+                # Поки чекали на блокування, таблицю міг оновити інший запит
+                if time.monotonic() - self._last_refresh >= self.miss_refresh_interval:
+                    self._miss_refreshes += 1
+                    await self._refresh_unlocked()
+        return self._routes.get(service_name, [])
+
+    async def refresh(self):
+        async with self._refresh_lock:
+            await self._refresh_unlocked()
+
+    async def _refresh_unlocked(self):
+        started = time.perf_counter()
+        self._last_refresh = time.monotonic()
+        try:
+            r = await self._client.get(f"{self.registry_url}/services")
+            r.raise_for_status()
+            routes: Dict[str, List[Instance]] = {}
+            names = set()
+            for info in r.json().get("services", []):
+                names.add(info["service_name"])
+                if info.get("status") == "UP":
+                    routes.setdefault(info["service_name"], []).append(
+                        Instance(info["service_name"], info["host"], info["port"])
+                    )
+            if self.watch:
+                # Сервіси з активним watch оновлює лише він (його дані свіжіші)
+                for name in self._watches:
+                    if name in self._routes:
+                        routes[name] = self._routes[name]
+                    else:
+                        routes.pop(name, None)
+                for name in names - set(self._watches):
+                    self._watches[name] = asyncio.create_task(self._watch(name))
+            # Заміна посилання атомарна для корутин - читачі бачать стару або нову таблицю
+            self._routes = routes
+            self._refreshes += 1
+            self._last_error = None
+        except Exception as e:
+            # Реєстр недоступний: продовжуємо працювати з останньою відомою таблицею
+            self._refresh_errors += 1
+            self._last_error = str(e)
+            print(f"[Discovery] Routing table refresh failed: {e}")
+        finally:
+            self._last_refresh_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    async def _watch(self, service_name: str):
+        """Блокуючі запити /watch сервісу: оновлення таблиці одразу після змін у Registry."""
+        index = 0
+        while True:
+            try:
+                r = await self._client.get(
+                    f"{self.registry_url}/watch/{service_name}",
+                    params={"index": index, "timeout": self.watch_timeout},
+                    timeout=self.watch_timeout + self.timeout
+                )
+                r.raise_for_status()
+                data = r.json()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._watch_errors += 1
+                self._last_error = str(e)
+                await asyncio.sleep(self.miss_refresh_interval)
+                continue
+            
+            if data["index"] != index:
+                instances = [Instance(service_name, i["host"], i["port"]) for i in data["instances"]]
+                routes = dict(self._routes)
+                if instances:
+                    routes[service_name] = instances
+                else:
+                    routes.pop(service_name, None)
+                self._routes = routes
+                self._watch_updates += 1
+                index = data["index"]
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    def stats(self) -> dict:
+        return {
+            "services": {name: [i.url for i in instances] for name, instances in self._routes.items()},
+            "refreshes": self._refreshes,
+            "refresh_errors": self._refresh_errors,
+            "miss_refreshes": self._miss_refreshes,
+            "watched_services": sorted(self._watches),
+            "watch_updates": self._watch_updates,
+            "watch_errors": self._watch_errors,
+            "last_refresh_ms": self._last_refresh_ms,
+            "last_refresh_age_s": round(time.monotonic() - self._last_refresh, 2) if self._last_refresh else None,
+            "last_error": self._last_error,
+        }
@@ -0,0 +1,195 @@
+"""
+Хеджування та повтори idempotent-запитів API Gateway (hedging.py)
+
+Якщо перший екземпляр не відповів за час, близький до p95 затримки сервісу,
+той самий GET надсилається іншому екземпляру; перша успішна відповідь
+перемагає, інший запит скасовується. Невдалий запит (мережева помилка, 5xx)
+повторюється на іншому екземплярі не більше max_retries разів.
+
+Хеджі та повтори витрачають токени бюджету (RetryBudget), який поповнюється
+лише основними запитами, тому під час збою додаткове навантаження обмежене
+часткою ratio від звичайного трафіку.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from stats import LatencyStats
+
+
+class RetryBudget:
+    """
+    Бюджет повторів: кожен основний запит додає ratio токена (не більше
+    max_tokens), кожен хедж або повтор забирає один токен.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self):
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class HedgeDelay:
+    """
+    Затримка перед хеджем для кожного сервісу: percentile успішних запитів,
+    але не менше min_ms; поки вимірювань менше min_samples - default_ms.
+
+    Перцентиль (сортування вікна) перераховується раз на refresh_every
+    вимірювань, а delay_ms на шляху запиту лише читає збережене значення.
+    """
+
+    def __init__(self, percentile: float = 95, min_samples: int = 20,
+                 default_ms: float = 100.0, min_ms: float = 5.0, refresh_every: int = 32):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_ms = default_ms
+        self.min_ms = min_ms
+        self.refresh_every = refresh_every
+        self._latency: Dict[str, LatencyStats] = {}
+        self._delay: Dict[str, float] = {}
+
+    def record(self, service_name: str, ms: float):
+        stats = self._latency.get(service_name)
+        if stats is None:
+            stats = self._latency[service_name] = LatencyStats(window=512)
+        stats.record(ms)
+        if stats.count >= self.min_samples and (
+                stats.count == self.min_samples or stats.count % self.refresh_every == 0):
+            self._delay[service_name] = max(stats.percentile(self.percentile), self.min_ms)
+
+    def delay_ms(self, service_name: str) -> float:
+        return self._delay.get(service_name, self.default_ms)
+
+    def snapshot(self) -> dict:
+        return {name: round(self.delay_ms(name), 3) for name in sorted(self._latency)}
+
+
+def retrieve_exception(task: asyncio.Future):
+    """Позначає виняток задачі отриманим (без "Task exception was never retrieved")."""
+    if not task.cancelled():
+        task.exception()
+
+
+class Hedger:
+    """
+    Виконання запиту з хеджуванням та обмеженими повторами.
+
+    attempt(tried) - корутина одного запиту до upstream; список tried містить
+    URL уже використаних екземплярів (attempt додає до нього свій), щоб хедж
+    і повтор ішли на інший екземпляр. Результат - кортеж, перший елемент якого
+    HTTP-статус; статус >= 500 або виняток вважаються невдачею.
+
+    discard(result) - корутина, що звільняє результат, який не повертається
+    (невдалий перед повтором або одночасний з переможцем), наприклад закриває
+    потокову відповідь. Скасовані запити, що програли, звільняє сам attempt.
+    """
+
+    def __init__(self, budget: RetryBudget, delays: HedgeDelay, max_retries: int = 1):
+        self.budget = budget
+        self.delays = delays
+        self.max_retries = max_retries
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+
+    async def run(self, service_name: str, attempt: Callable[[List[str]], Awaitable[tuple]],
+                  has_alternative: Callable[[List[str]], bool] = lambda tried: True,
+                  discard: Optional[Callable[[tuple], Awaitable]] = None):
+        self.requests += 1
+        self.budget.deposit()
+        tried: List[str] = []
+        first = asyncio.ensure_future(self._timed(service_name, attempt, tried))
+        pending = {first}
+        hedge = None
+        # Хедж надсилається не більше одного разу і не після повтору
+        may_hedge = True
+        retries = 0
+        outcome = None
+        try:
+            while pending:
+                timeout = self.delays.delay_ms(service_name) / 1000 if may_hedge else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    may_hedge = False
+                    if not has_alternative(tried):
+                        continue
+                    if self.budget.withdraw():
+                        self.hedges += 1
+                        hedge = asyncio.ensure_future(self._timed(service_name, attempt, tried))
+                        pending.add(hedge)
+                    else:
+                        self.budget_exhausted += 1
+                    continue
+
+                winner = None
+                for task in done:
+                    if winner is None and task.exception() is None and task.result()[0] < 500:
+                        winner = task
+                        continue
+                    # Повертається лише останній невдалий результат
+                    await self._discard(outcome, discard)
+                    outcome = task
+                if winner is not None:
+                    await self._discard(outcome, discard)
+                    outcome = None
+                    if winner is hedge:
+                        self.hedge_wins += 1
+                    return winner.result()
+
+                if pending or retries >= self.max_retries or not has_alternative(tried):
+                    continue
+                if self.budget.withdraw():
+                    retries += 1
+                    self.retries += 1
+                    may_hedge = False
+                    pending.add(asyncio.ensure_future(self._timed(service_name, attempt, tried)))
+                else:
+                    self.budget_exhausted += 1
+        except BaseException:
+            await self._discard(outcome, discard)
+            raise
+        finally:
+            # Запит, що програв, скасовується; його виняток (якщо скасування
+            # завершилось помилкою) вважається отриманим
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(retrieve_exception)
+
+        if outcome.exception() is not None:
+            raise outcome.exception()
+        return outcome.result()
+
+    @staticmethod
+    async def _discard(task: Optional[asyncio.Future], discard):
+        if task is not None and discard is not None and task.exception() is None:
+            await discard(task.result())
+
+    async def _timed(self, service_name: str, attempt, tried: List[str]) -> tuple:
+        started = time.perf_counter()
+        result = await attempt(tried)
+        if result[0] < 500:
+            self.delays.record(service_name, (time.perf_counter() - started) * 1000)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "retries": self.retries,
+            "budget_exhausted": self.budget_exhausted,
+            "budget_tokens": round(self.budget.tokens, 2),
+            "hedge_delay_ms": self.delays.snapshot(),
+        }
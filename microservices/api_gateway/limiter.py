@@ -0,0 +1,122 @@
+"""
+Адаптивне обмеження конкурентності API Gateway (limiter.py)
+
+Для кожного upstream-сервісу gateway тримає ліміт одночасних запитів, який
+підлаштовується за AIMD (additive increase / multiplicative decrease):
+- запит завершився швидко (затримка не більше tolerance * мінімальної
+  затримки за вікно) і ліміт використовується - ліміт зростає на 1/limit,
+  тобто приблизно на 1 за "покоління" запитів;
+  мінімальна затримка ведеться окремо для кожного шаблону маршруту: у
+  сервісу бувають швидкі (GET /tasks/{id}) і повільні (пошук, звіт) ендпоінти,
+  і спільна мінімальна затримка вважала б повільні ознакою перевантаження;
+- затримка зросла понад поріг, upstream недоступний або відповів 502/503/504 -
+  ліміт множиться на backoff (не частіше ніж раз на покоління: сигнали від
+  запитів, розпочатих до попереднього зменшення, ігноруються).
+
+Запити понад ліміт не чекають у черзі, а одразу отримують 503 з Retry-After.
+"""
+
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# Статуси upstream, що свідчать про перевантаження
+OVERLOAD_STATUSES = (502, 503, 504)
+
+
+class AdaptiveLimiter:
+    """
+    Args:
+        initial_limit: Початковий ліміт
+        min_limit, max_limit: Межі ліміту
+        backoff: Множник зменшення
+        tolerance: Допустиме зростання затримки відносно мінімальної
+        latency_floor_ms: Затримки, менші за цю, не вважаються ознакою перевантаження
+        window: Кількість останніх вимірювань маршруту для мінімальної затримки
+    """
+
+    def __init__(self, initial_limit: int = 20, min_limit: int = 2, max_limit: int = 500,
+                 backoff: float = 0.75, tolerance: float = 2.0,
+                 latency_floor_ms: float = 50.0, window: int = 200):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.latency_floor_ms = latency_floor_ms
+        self.window = window
+        # Шаблон маршруту -> останні затримки (без відповідей з перевантаженням)
+        self._rtt: Dict[str, deque] = {}
+        self._last_decrease = 0.0
+        self.in_flight = 0
+        self.accepted = 0
+        self.shed = 0
+        self.decreases = 0
+
+    def try_acquire(self) -> bool:
+        """Місце для запиту або False, якщо ліміт вичерпано."""
+        if self.in_flight >= int(self.limit):
+            self.shed += 1
+            return False
+        self.in_flight += 1
+        self.accepted += 1
+        return True
+
+    def release(self, started: float, latency_ms: Optional[float], status: Optional[int],
+                route: str = ""):
+        """
+        Завершення запиту.
+
+        Args:
+            started: time.perf_counter() на початку запиту
+            latency_ms: Затримка до відповіді (None - запит скасовано, без вимірювання)
+            status: HTTP-статус upstream (None - мережева помилка або тайм-аут)
+            route: Шаблон маршруту, з мінімальною затримкою якого порівнюється latency_ms
+        """
+        self.in_flight -= 1
+        if latency_ms is None:
+            return
+
+        overloaded = status is None or status in OVERLOAD_STATUSES
+        rtt = self._rtt.get(route)
+        if rtt is None:
+            rtt = self._rtt[route] = deque(maxlen=self.window)
+        if not overloaded:
+            rtt.append(latency_ms)
+        min_rtt = min(rtt) if rtt else latency_ms
+
+        if overloaded or latency_ms > max(min_rtt * self.tolerance, self.latency_floor_ms):
+            if started > self._last_decrease:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = time.perf_counter()
+                self.decreases += 1
+        elif self.in_flight + 1 >= self.limit / 2:
+            # Збільшуємо лише ліміт, який справді використовується
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "accepted": self.accepted,
+            "shed": self.shed,
+            "decreases": self.decreases,
+            "min_latency_ms": {route: round(min(rtt), 3) for route, rtt in sorted(self._rtt.items()) if rtt},
+        }
+
+
+class ConcurrencyLimits:
+    """Адаптивні ліміти upstream-сервісів."""
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def get(self, service_name: str) -> AdaptiveLimiter:
+        limiter = self._limiters.get(service_name)
+        if limiter is None:
+            limiter = self._limiters[service_name] = AdaptiveLimiter(**self.settings)
+        return limiter
+
+    def stats(self) -> dict:
+        return {name: limiter.snapshot() for name, limiter in sorted(self._limiters.items())}
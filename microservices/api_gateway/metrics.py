@@ -0,0 +1,160 @@
+"""
+Метрики API Gateway у форматі Prometheus (metrics.py)
+
+Мінімальна реалізація лічильників, gauge та гістограм з мітками і текстового
+формату експозиції Prometheus 0.0.4 без зовнішніх залежностей. На гарячому
+шляху - лише пошук у словнику за кортежем міток та інкремент (для гістограм -
+ще bisect по межах кошиків); кумулятивні суми кошиків рахуються при рендері.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Межі кошиків гістограм затримки (секунди)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, *labels):
+        self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # мітки -> [лічильники кошиків (останній - +Inf), сума, кількість]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    """Набір метрик, що віддаються ендпоінтом /metrics."""
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ============== МЕТРИКИ GATEWAY ==============
+registry = Registry()
+
+requests_total = registry.register(Counter(
+    "gateway_requests_total", "Requests handled by the gateway", ("route", "method", "status")))
+request_errors_total = registry.register(Counter(
+    "gateway_request_errors_total", "Gateway responses with status >= 500", ("route",)))
+# Маршрут відомий лише після маршрутизації, тому gauge без мітки route
+requests_in_flight = registry.register(Gauge(
+    "gateway_requests_in_flight", "Requests being handled by the gateway"))
+request_duration = registry.register(Histogram(
+    "gateway_request_duration_seconds", "Full gateway request time, until the last response byte", ("route",)))
+overhead_duration = registry.register(Histogram(
+    "gateway_overhead_duration_seconds", "Gateway request time minus time spent waiting on upstreams", ("route",)))
+
+discovery_duration = registry.register(Histogram(
+    "gateway_discovery_duration_seconds", "Instance lookup time in the local routing table", ("service",)))
+
+upstream_requests_total = registry.register(Counter(
+    "gateway_upstream_requests_total", "Requests sent to upstream instances",
+    ("service", "instance", "route_class", "route", "status")))
+upstream_errors_total = registry.register(Counter(
+    "gateway_upstream_errors_total", "Upstream requests that failed (transport error or status >= 500)",
+    ("service", "instance", "route_class", "route")))
+upstream_in_flight = registry.register(Gauge(
+    "gateway_upstream_in_flight", "Requests in flight to upstream instances",
+    ("service", "instance", "route_class", "route")))
+upstream_duration = registry.register(Histogram(
+    "gateway_upstream_duration_seconds", "Upstream time until response headers",
+    ("service", "instance", "route_class", "route")))
+
+# Оновлюється з single_flight.stats() при кожному запиті /metrics
+coalescing_ratio = registry.register(Gauge(
+    "gateway_single_flight_coalescing_ratio", "Share of coalesced GET requests answered by another request's upstream call"))
@@ -0,0 +1,53 @@
+"""
+Об'єднання однакових запитів API Gateway (singleflight.py)
+
+Поки виконується запит з певним ключем, інші такі самі запити не йдуть
+до upstream, а чекають на результат першого ("лідера") і отримують
+ту саму відповідь.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Спільне виконання однакових одночасних викликів.
+
+    Виклик лідера виконується в окремій задачі, а кожен учасник чекає на неї
+    через asyncio.shield: скасування одного клієнта (відключення) не
+    скасовує запит для решти.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]):
+        """Виконує func() або приєднується до вже запущеного виклику з тим самим ключем."""
+        task = self._calls.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.followers += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Виняток уже отримали учасники; позначаємо його як прочитаний
+            task.exception()
+
+    def stats(self) -> dict:
+        total = self.leaders + self.followers
+        return {
+            "in_flight": len(self._calls),
+            "upstream_calls": self.leaders,
+            "coalesced": self.followers,
+            "coalescing_ratio": round(self.followers / total, 4) if total else 0.0,
+        }
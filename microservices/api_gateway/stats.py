@@ -0,0 +1,109 @@
+"""
+Статистика затримок API Gateway (stats.py)
+"""
+
+import math
+import time
+from collections import deque
+
+import metrics
+
+
+def nearest_rank(ordered: list, p: float) -> float:
+    """Перцентиль відсортованого списку методом nearest-rank."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyStats:
+    """
+    Кількість, середнє та перцентилі затримки за останні window вимірювань.
+    """
+
+    def __init__(self, window: int = 2048):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def record(self, ms: float):
+        self._samples.append(ms)
+        self.count += 1
+        self.total_ms += ms
+
+    def percentile(self, p: float) -> float:
+        return nearest_rank(sorted(self._samples), p)
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self._samples)
+        return {
+            "count": self.count,
+            "mean": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50": round(nearest_rank(ordered, 50), 3),
+            "p95": round(nearest_rank(ordered, 95), 3),
+            "p99": round(nearest_rank(ordered, 99), 3),
+        }
+
+
+def route_label(scope) -> str:
+    """Шаблон маршруту (/api/tasks/{task_id}), а не конкретний шлях - обмежена кардинальність міток."""
+    route = scope.get("route")
+    if route is not None and hasattr(route, "path"):
+        return route.path
+    endpoint = scope.get("endpoint")
+    return getattr(endpoint, "__name__", "unmatched")
+
+
+class TimingMiddleware:
+    """
+    ASGI-middleware: вимірює повний час обробки запиту (до останнього байта
+    відповіді) та віднімає час очікування upstream, накопичений обробником
+    у request.state.upstream_ms. Різниця - затримка, яку додає сам gateway
+    (маршрутизація, discovery, серіалізація).
+
+    Для всіх запитів оновлює метрики Prometheus (metrics.py) з міткою
+    маршруту; LatencyStats для /gateway/stats рахуються лише для /api/*.
+    """
+
+    overhead = LatencyStats()
+    upstream = LatencyStats()
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state["upstream_ms"] = 0.0
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            total_ms = (time.perf_counter() - started) * 1000
+            upstream_ms = state.get("upstream_ms", 0.0)
+            overhead_ms = max(total_ms - upstream_ms, 0.0)
+
+            route = route_label(scope)
+            metrics.requests_in_flight.dec()
+            metrics.requests_total.inc(route, scope["method"], str(status))
+            if status >= 500:
+                metrics.request_errors_total.inc(route)
+            metrics.request_duration.observe(total_ms / 1000, route)
+            metrics.overhead_duration.observe(overhead_ms / 1000, route)
+
+            if scope["path"].startswith("/api/"):
+                TimingMiddleware.upstream.record(upstream_ms)
+                TimingMiddleware.overhead.record(overhead_ms)
@@ -0,0 +1,901 @@
+"""
+Модуль тестування API Gateway (tests.py)
+Практична робота №4 - Simple Task Manager
+
+Тести запускаються з каталогу сервісу: cd api_gateway && python -m pytest tests.py
+Upstream-сервіси замінені на httpx.MockTransport, Реєстр не потрібен.
+"""
+
+import asyncio
+import gc
+import gzip
+import time
+import pytest
+import httpx
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+import app as gateway
+import circuit_breaker
+from circuit_breaker import BreakerRegistry, CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from discovery import Instance, RoutingTable
+from hedging import HedgeDelay, Hedger, RetryBudget
+from limiter import AdaptiveLimiter
+from bulkhead import Bulkhead, BulkheadFull, Bulkheads
+
+
+SERVICES = ["task-service", "category-service", "notification-service"]
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """
+    Підміняє таблицю маршрутизації (по одному екземпляру кожного сервісу) та
+    пули з'єднань класів маршрутів: відповіді формує handler(request).
+    """
+    def install(handler):
+        monkeypatch.setattr(gateway.routing, "_routes", {
+            name: [Instance(name, "10.0.0.1", 9000 + i)] for i, name in enumerate(SERVICES)
+        })
+        for name in gateway.ROUTE_CLASSES:
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            monkeypatch.setattr(gateway.bulkheads.get(name), "client", client)
+    return install
+
+
+def gateway_get(path: str) -> httpx.Response:
+    """GET до gateway через ASGI (без запуску startup: реєстрації та discovery)."""
+    async def run():
+        transport = httpx.ASGITransport(app=gateway.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            return await client.get(path)
+    return asyncio.run(run())
+
+
+# ============================================
+# Тести /health
+# ============================================
+
+class TestHealth:
+    """Тести перевірки стану сервісів через gateway"""
+
+    def test_health_reports_up(self, upstream):
+        """Тест: усі сервіси відповідають 200 - UP"""
+        upstream(lambda request: httpx.Response(200, json={"status": "ok"}))
+
+        response = gateway_get("/health")
+
+        assert response.status_code == 200
+        assert response.json()["services"] == {name: "UP" for name in SERVICES}
+
+    def test_health_without_timing_state(self, upstream):
+        """Тест: /health не залежить від request.state.upstream_ms (TimingMiddleware)"""
+        upstream(lambda request: httpx.Response(200, json={"status": "ok"}))
+
+        result = asyncio.run(gateway.health())
+
+        assert result["services"] == {name: "UP" for name in SERVICES}
+
+    def test_health_not_registered(self, upstream, monkeypatch):
+        """Тест: сервісу немає в таблиці маршрутизації - NOT_REGISTERED"""
+        upstream(lambda request: httpx.Response(200))
+        monkeypatch.setattr(gateway.routing, "_routes", {})
+        monkeypatch.setattr(gateway.routing, "_last_refresh", float("inf"))
+
+        response = gateway_get("/health")
+
+        assert response.json()["services"] == {name: "NOT_REGISTERED" for name in SERVICES}
+
+
+# ============================================
+# Тести /api/dashboard
+# ============================================
+
+class TestDashboard:
+    """Тести агрегації dashboard з дедлайнами секцій"""
+
+    def test_slow_section_does_not_delay_others(self, upstream, monkeypatch):
+        """Тест: секція не вклалась у дедлайн - решта повертається, загальний час близький до дедлайну"""
+        monkeypatch.setattr(gateway, "DASHBOARD_DEADLINE", 0.3)
+        bodies = {"/tasks": [{"idTask": 1}], "/categories": [{"idCategory": 1}],
+                  "/deadlines/check": [{"idTask": 2}]}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/statistics":
+                await asyncio.sleep(5)
+            else:
+                await asyncio.sleep(0.2)
+            return httpx.Response(200, json=bodies.get(request.url.path, {}))
+
+        upstream(handler)
+
+        started = time.perf_counter()
+        response = gateway_get("/api/dashboard")
+        elapsed = time.perf_counter() - started
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data["sections"] == {"tasks": "ok", "categories": "ok",
+                                    "statistics": "timeout", "deadlines": "ok"}
+        assert data["statistics"] == {}
+        assert data["tasks"] == bodies["/tasks"]
+        assert data["deadlines"] == bodies["/deadlines/check"]
+        # Секції виконуються паралельно: час - це дедлайн найповільнішої, а не сума (0.2 * 3 + 0.3)
+        assert 0.3 <= elapsed < 0.6
+
+# ============================================
+# Тести потокового проксі
+# ============================================
+
+def make_request(path: str, method: str = "GET") -> Request:
+    """Запит до gateway для прямого виклику proxy (без ASGI, який буферизує відповідь)."""
+    request = Request({"type": "http", "method": method, "path": path, "query_string": b"",
+                       "headers": [], "app": gateway.app})
+    request.state.upstream_ms = 0.0
+    return request
+
+
+async def chunked(data: bytes):
+    """Тіло відповіді upstream як потік (bytes httpx.Response читає одразу, aiter_raw їх не віддасть)."""
+    yield data
+
+
+class TestStreamingProxy:
+    """Тести потокової передачі відповіді upstream"""
+
+    def test_passes_response_through(self, upstream):
+        """Тест: статус, Content-Type та Content-Encoding upstream передаються без змін"""
+        csv = b"idTask;title\n" + b"1;report\n" * 100
+        upstream(lambda request: httpx.Response(
+            207, content=chunked(gzip.compress(csv)),
+            headers={"content-type": "text/csv; charset=utf-8", "content-encoding": "gzip",
+                     "x-upstream": "task-service"}
+        ))
+
+        response = gateway_get("/api/tasks/1")
+
+        assert response.status_code == 207
+        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["x-upstream"] == "task-service"
+        # Gateway не розпаковує тіло: клієнт отримує стиснені байти upstream
+        assert response.content == csv
+
+    def test_server_headers_not_forwarded(self, upstream):
+        """Тест: Date та Server upstream не передаються (їх додає сервер gateway)"""
+        upstream(lambda request: httpx.Response(
+            200, content=chunked(b'{"idTask": 1}'),
+            headers={"content-type": "application/json", "date": "Mon, 01 Jan 2024 00:00:00 GMT", "server": "uvicorn"}
+        ))
+
+        response = gateway_get("/api/tasks/1")
+
+        assert response.status_code == 200
+        assert "date" not in response.headers
+        assert "server" not in response.headers
+
+    def test_body_is_streamed(self, upstream):
+        """Тест: перша частина тіла передається клієнту до того, як upstream завершив відповідь"""
+        async def run():
+            release = asyncio.Event()
+            finished = []
+
+            async def body():
+                yield b"first"
+                await release.wait()
+                yield b"second"
+                finished.append(True)
+
+            upstream(lambda request: httpx.Response(200, content=body(),
+                                                    headers={"content-type": "application/x-ndjson"}))
+            response = await gateway.proxy("task-service", "/tasks/1", make_request("/api/tasks/1"))
+            chunks = response.body_iterator
+            first = await asyncio.wait_for(chunks.__anext__(), 1.0)
+            streamed_early = not finished
+            release.set()
+            rest = [chunk async for chunk in chunks]
+            return first, rest, streamed_early, finished
+
+        first, rest, streamed_early, finished = asyncio.run(run())
+        assert first == b"first"
+        assert rest == [b"second"]
+        assert streamed_early
+        assert finished == [True]
+
+# ============================================
+# Тести single-flight та хеджування маршрутів
+# ============================================
+
+class TestProxyGet:
+    """Тести GET /api/tasks: потік за замовчуванням, single-flight за прапорцем COALESCING"""
+
+    def test_streams_by_default(self, upstream):
+        """Тест: без COALESCING відповідь /api/tasks передається потоком"""
+        async def run():
+            release = asyncio.Event()
+
+            async def body():
+                yield b"[{"
+                await release.wait()
+                yield b"}]"
+
+            upstream(lambda request: httpx.Response(200, content=body()))
+            response = await gateway.tasks_proxy(make_request("/api/tasks"))
+            first = await asyncio.wait_for(response.body_iterator.__anext__(), 1.0)
+            release.set()
+            rest = [chunk async for chunk in response.body_iterator]
+            return response, first, rest
+
+        response, first, rest = asyncio.run(run())
+        assert isinstance(response, StreamingResponse)
+        assert first == b"[{" and rest == [b"}]"]
+
+    def test_coalescing_when_enabled(self, upstream, monkeypatch):
+        """Тест: з COALESCING однакові одночасні GET отримують відповідь одного upstream-виклику"""
+        monkeypatch.setitem(gateway.COALESCING, "enabled", True)
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, content=chunked(b'[{"idTask": 1}]'),
+                                  headers={"content-type": "application/json"})
+
+        upstream(handler)
+
+        async def run():
+            transport = httpx.ASGITransport(app=gateway.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+                return await asyncio.gather(*(client.get("/api/tasks") for _ in range(5)))
+
+        responses = asyncio.run(run())
+        assert calls == ["/tasks"]
+        assert [r.json() for r in responses] == [[{"idTask": 1}]] * 5
+        assert gateway.single_flight.stats()["coalescing_ratio"] > 0
+
+        metrics_text = gateway_get("/metrics").text
+        ratio = gateway.single_flight.stats()["coalescing_ratio"]
+        assert f"gateway_single_flight_coalescing_ratio {ratio!r}" in metrics_text
+
+    def test_hedged_get_streams_winner(self, upstream, monkeypatch):
+        """Тест: хедж за часом до заголовків; тіло переможця йде потоком, запит, що програв, звільняється"""
+        monkeypatch.setattr(gateway, "hedger", Hedger(RetryBudget(), HedgeDelay(default_ms=20.0)))
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.port)
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+            return httpx.Response(200, content=chunked(f"from {request.url.port}".encode()))
+
+        upstream(handler)
+        monkeypatch.setitem(gateway.routing._routes, "task-service",
+                            [Instance("task-service", "10.0.0.1", 9000), Instance("task-service", "10.0.0.2", 9100)])
+
+        async def run():
+            response = await gateway.tasks_proxy(make_request("/api/tasks"))
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            await asyncio.sleep(0.01)
+            return response, body
+
+        response, body = asyncio.run(run())
+        assert isinstance(response, StreamingResponse)
+        assert len(calls) == 2 and body == f"from {calls[1]}".encode()
+        assert gateway.hedger.hedge_wins == 1
+        assert gateway.bulkheads.get("interactive").in_flight == 0
+
+# ============================================
+# Тести /metrics
+# ============================================
+
+class TestMetrics:
+    """Тести метрик Prometheus"""
+
+    def test_upstream_series_have_route(self, upstream):
+        """Тест: метрики upstream мають мітку route - шаблон маршруту gateway"""
+        upstream(lambda request: httpx.Response(200, content=chunked(b"{}")))
+
+        assert gateway_get("/api/tasks/42").status_code == 200
+        text = gateway_get("/metrics").text
+
+        labels = 'service="task-service",instance="http://10.0.0.1:9000",route_class="interactive",route="/api/tasks/{task_id}"'
+        assert f"gateway_upstream_requests_total{{{labels},status=\"200\"}}" in text
+        assert f"gateway_upstream_duration_seconds_count{{{labels}}}" in text
+        assert f"gateway_upstream_in_flight{{{labels}}} 0" in text
+        assert "/api/tasks/42" not in text
+
+# ============================================
+# Тести circuit breaker
+# ============================================
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Керований час для circuit_breaker (time.monotonic)."""
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_breaker(**settings) -> CircuitBreaker:
+    defaults = dict(window=4, min_calls=4, failure_rate=0.5, slow_call_ms=100.0,
+                    slow_call_rate=0.75, open_seconds=5.0, max_open_seconds=20.0)
+    defaults.update(settings)
+    return CircuitBreaker(**defaults)
+
+
+def call(breaker: CircuitBreaker, failed: bool = False, elapsed_ms: float = 1.0):
+    breaker.record(breaker.on_start(), failed, elapsed_ms)
+
+
+class TestCircuitBreaker:
+    """Тести станів CLOSED / OPEN / HALF_OPEN"""
+
+    def test_trips_on_failure_rate(self, clock):
+        """Тест: частка помилок досягла порогу після min_calls - OPEN"""
+        breaker = make_breaker()
+        for failed in (True, False, True):
+            call(breaker, failed)
+        assert breaker.state == CLOSED
+
+        call(breaker, failed=False)
+
+        assert breaker.state == OPEN
+        assert not breaker.available()
+
+    def test_trips_on_slow_calls(self, clock):
+        """Тест: повільні виклики також відкривають breaker"""
+        breaker = make_breaker()
+        for _ in range(4):
+            call(breaker, elapsed_ms=150.0)
+
+        assert breaker.state == OPEN
+
+    def test_half_open_probe_closes(self, clock):
+        """Тест: після паузи один пробний запит, успіх закриває breaker"""
+        breaker = make_breaker()
+        for _ in range(4):
+            call(breaker, failed=True)
+        clock[0] += 5.0
+        assert breaker.available()
+
+        generation = breaker.on_start()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.available()  # half_open_probes = 1
+        breaker.record(generation, False, 1.0)
+
+        assert breaker.state == CLOSED
+        assert breaker.available()
+
+    def test_failed_probe_doubles_open_time(self, clock):
+        """Тест: невдала проба знову відкриває breaker на подвоєний час"""
+        breaker = make_breaker()
+        for _ in range(4):
+            call(breaker, failed=True)
+        clock[0] += 5.0
+        call(breaker, failed=True)
+
+        assert breaker.state == OPEN
+        clock[0] += 5.0
+        assert not breaker.available()
+        clock[0] += 5.0
+        assert breaker.available()
+
+    def test_stale_result_is_not_probe(self, clock):
+        """Тест: запит, розпочатий до спрацювання, не вирішує долю HALF_OPEN"""
+        breaker = make_breaker()
+        slow_generation = breaker.on_start()
+        for _ in range(4):
+            call(breaker, failed=True)
+        clock[0] += 5.0
+        probe_generation = breaker.on_start()
+
+        breaker.record(slow_generation, False, 1.0)
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.stale == 1
+        breaker.record(probe_generation, True, 1.0)
+        assert breaker.state == OPEN
+
+    def test_cancelled_probe_frees_slot(self, clock):
+        """Тест: скасована проба (програв хедж) звільняє місце для нової"""
+        breaker = make_breaker()
+        for _ in range(4):
+            call(breaker, failed=True)
+        clock[0] += 5.0
+
+        breaker.cancel(breaker.on_start())
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.available()
+
+    def test_route_classes_isolated(self, upstream, monkeypatch):
+        """Тест: повільні analytics-запити відкривають breaker лише свого класу - interactive працює"""
+        monkeypatch.setattr(gateway, "breakers", BreakerRegistry(
+            window=4, min_calls=4, failure_rate=0.5, slow_call_ms=10.0, slow_call_rate=0.75,
+            open_seconds=60.0, max_open_seconds=60.0))
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/statistics":
+                await asyncio.sleep(0.03)
+            return httpx.Response(200, content=chunked(b"{}"), headers={"content-type": "application/json"})
+
+        upstream(handler)
+        for _ in range(4):
+            assert gateway_get("/api/notifications/statistics").status_code == 200
+
+        url = gateway.routing.instances("notification-service")[0].url
+        assert gateway.breakers.state(url) == {"analytics": OPEN}
+        assert gateway_get("/api/notifications/statistics").status_code == 503
+        assert gateway_get("/api/notifications/deadlines").status_code == 200
+        assert gateway.breakers.state(url) == {"analytics": OPEN, "interactive": CLOSED}
+
+
+# ============================================
+# Тести хеджування та повторів
+# ============================================
+
+class TestHedging:
+    """Тести HedgeDelay та Hedger"""
+
+    def test_delay_cached_between_refreshes(self):
+        """Тест: перцентиль перераховується раз на refresh_every вимірювань"""
+        delays = HedgeDelay(percentile=75, min_samples=4, default_ms=100.0, min_ms=1.0, refresh_every=8)
+        for _ in range(3):
+            delays.record("svc", 10.0)
+        assert delays.delay_ms("svc") == 100.0
+
+        delays.record("svc", 10.0)
+        assert delays.delay_ms("svc") == 10.0
+        for _ in range(3):
+            delays.record("svc", 50.0)
+        assert delays.delay_ms("svc") == 10.0  # ще не перераховано
+
+        delays.record("svc", 50.0)  # 8-ме вимірювання
+        assert delays.delay_ms("svc") == 50.0
+
+    def test_hedge_wins_and_loser_error_retrieved(self):
+        """Тест: повільний запит хеджується; помилка скасованого не губиться в логах"""
+        errors = []
+
+        async def attempt(tried):
+            tried.append(f"url-{len(tried)}")
+            if len(tried) == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    raise RuntimeError("connection closed during cancel")
+            return 200, [], b"hedge"
+
+        async def run():
+            asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+            hedger = Hedger(RetryBudget(), HedgeDelay(default_ms=10.0), max_retries=1)
+            result = await hedger.run("svc", attempt)
+            await asyncio.sleep(0.01)
+            return hedger, result
+
+        hedger, result = asyncio.run(run())
+        gc.collect()
+
+        assert result[2] == b"hedge"
+        assert hedger.hedges == 1 and hedger.hedge_wins == 1
+        assert errors == []
+
+    def test_retry_on_5xx_within_budget(self):
+        """Тест: 5xx повторюється на іншому екземплярі, поки є бюджет"""
+        async def attempt(tried):
+            tried.append(f"url-{len(tried)}")
+            return (503 if len(tried) == 1 else 200), [], b""
+
+        hedger = Hedger(RetryBudget(ratio=0.1, max_tokens=1.0), HedgeDelay(default_ms=1000.0), max_retries=1)
+
+        assert asyncio.run(hedger.run("svc", attempt))[0] == 200
+        assert hedger.retries == 1
+        assert asyncio.run(hedger.run("svc", attempt))[0] == 503  # бюджет вичерпано
+        assert hedger.budget_exhausted == 1
+
+    def test_discard_results_not_returned(self):
+        """Тест: невдалий результат перед повтором передається discard, повернений - ні"""
+        discarded = []
+
+        async def attempt(tried):
+            tried.append(f"url-{len(tried)}")
+            return (503 if len(tried) == 1 else 200), f"response-{len(tried)}"
+
+        async def discard(result):
+            discarded.append(result)
+
+        hedger = Hedger(RetryBudget(), HedgeDelay(default_ms=1000.0), max_retries=1)
+
+        assert asyncio.run(hedger.run("svc", attempt, discard=discard)) == (200, "response-2")
+        assert discarded == [(503, "response-1")]
+
+
+# ============================================
+# Тести адаптивного ліміту (AIMD)
+# ============================================
+
+class TestAdaptiveLimiter:
+    """Тести AdaptiveLimiter"""
+
+    def test_sheds_above_limit(self):
+        """Тест: запити понад ліміт відкидаються одразу"""
+        limiter = AdaptiveLimiter(initial_limit=2)
+
+        assert limiter.try_acquire() and limiter.try_acquire()
+        assert not limiter.try_acquire()
+        assert limiter.shed == 1
+
+    def test_additive_increase(self):
+        """Тест: швидкі відповіді при використаному ліміті - +1/limit за запит"""
+        limiter = AdaptiveLimiter(initial_limit=4)
+        for _ in range(4):
+            limiter.try_acquire()
+            limiter.release(time.perf_counter(), 10.0, 200)
+            limiter.try_acquire()  # ліміт використовується: in_flight росте
+
+        assert 4.5 < limiter.limit < 5.5
+        assert limiter.decreases == 0
+
+    def test_no_increase_when_unused(self):
+        """Тест: ліміт не зростає, якщо використовується менше половини"""
+        limiter = AdaptiveLimiter(initial_limit=20)
+        for _ in range(10):
+            limiter.try_acquire()
+            limiter.release(time.perf_counter(), 10.0, 200)
+
+        assert limiter.limit == 20
+
+    def test_multiplicative_decrease_once_per_generation(self):
+        """Тест: 503 зменшує ліміт; сигнали від старіших запитів ігноруються"""
+        limiter = AdaptiveLimiter(initial_limit=20, backoff=0.5, min_limit=2)
+        old_started = time.perf_counter()
+        limiter.try_acquire()
+        limiter.try_acquire()
+
+        limiter.release(old_started, 10.0, 503)
+        assert limiter.limit == 10
+        limiter.release(old_started, 10.0, 503)
+        assert limiter.limit == 10
+
+        limiter.try_acquire()
+        limiter.release(time.perf_counter(), 10.0, None)
+        assert limiter.limit == 5
+        assert limiter.decreases == 2
+
+    def test_latency_growth_decreases(self):
+        """Тест: затримка понад tolerance * мінімальну (і понад floor) - зменшення"""
+        limiter = AdaptiveLimiter(initial_limit=10, backoff=0.5, tolerance=2.0, latency_floor_ms=50.0)
+        limiter.try_acquire()
+        limiter.release(time.perf_counter(), 40.0, 200)
+        limiter.try_acquire()
+        limiter.release(time.perf_counter(), 70.0, 200)  # 70 < 2 * 40 - в межах норми
+        assert limiter.limit >= 10
+
+        limiter.try_acquire()
+        limiter.release(time.perf_counter(), 200.0, 200)
+        assert limiter.limit == 5
+
+    def test_min_limit_and_cancel(self):
+        """Тест: ліміт не падає нижче min_limit; скасований запит не змінює ліміт"""
+        limiter = AdaptiveLimiter(initial_limit=3, backoff=0.1, min_limit=2)
+        limiter.try_acquire()
+        limiter.release(time.perf_counter(), 10.0, 504)
+        assert limiter.limit == 2
+
+        limiter.try_acquire()
+        limiter.release(time.perf_counter(), None, None)
+        assert limiter.limit == 2
+        assert limiter.in_flight == 0
+
+    def test_mixed_latency_routes_not_shed(self):
+        """Тест: здоровий upstream зі швидким (2 мс) і повільним (80 мс) маршрутом - без відкидання"""
+        limiter = AdaptiveLimiter(initial_limit=20, min_limit=2)
+        routes = [("/api/tasks/{task_id}", 2.0), ("/api/notifications/deadlines", 80.0)]
+        outstanding = []
+
+        for i in range(2000):
+            route, latency_ms = routes[i % 2]
+            if limiter.try_acquire():
+                outstanding.append((time.perf_counter(), route, latency_ms))
+            if len(outstanding) == 5:
+                started, route, latency_ms = outstanding.pop(0)
+                limiter.release(started, latency_ms, 200, route)
+
+        assert limiter.shed == 0
+        assert limiter.decreases == 0
+        assert limiter.limit >= 20
+        assert limiter.snapshot()["min_latency_ms"] == {
+            "/api/notifications/deadlines": 80.0, "/api/tasks/{task_id}": 2.0
+        }
+
+    def test_slow_route_still_backs_off(self):
+        """Тест: зростання затримки маршруту відносно його власного мінімуму - зменшення"""
+        limiter = AdaptiveLimiter(initial_limit=10, backoff=0.5)
+        for latency_ms in (80.0, 80.0):
+            limiter.try_acquire()
+            limiter.release(time.perf_counter(), latency_ms, 200, "/slow")
+        assert limiter.limit >= 10
+
+        limiter.try_acquire()
+        limiter.release(time.perf_counter(), 400.0, 200, "/slow")
+        assert limiter.limit == 5
+
+
+# ============================================
+# Тести класів маршрутів (bulkhead)
+# ============================================
+
+class TestBulkhead:
+    """Тести черги, пріоритету та повернення місць Bulkhead"""
+
+    def test_queue_then_admit(self):
+        """Тест: понад ліміт запит чекає в черзі й отримує звільнене місце"""
+        async def run():
+            bulkhead = Bulkhead("test", max_concurrent=1, max_queue=1, queue_timeout=1.0)
+            await bulkhead.acquire()
+            waiting = asyncio.create_task(bulkhead.acquire())
+            await asyncio.sleep(0)
+            assert bulkhead.waiting == 1 and not waiting.done()
+
+            bulkhead.release()
+            await waiting
+            return bulkhead
+
+        bulkhead = asyncio.run(run())
+        assert bulkhead.in_flight == 1
+        assert bulkhead.queued == 1 and bulkhead.admitted == 2
+
+    def test_queue_full_rejects(self):
+        """Тест: переповнена черга - BulkheadFull без очікування"""
+        async def run():
+            bulkhead = Bulkhead("test", max_concurrent=1, max_queue=0)
+            await bulkhead.acquire()
+            with pytest.raises(BulkheadFull):
+                await bulkhead.acquire()
+            return bulkhead
+
+        assert asyncio.run(run()).rejected == 1
+
+    def test_queue_timeout(self):
+        """Тест: минув queue_timeout - BulkheadFull, черга звільнена"""
+        async def run():
+            bulkhead = Bulkhead("test", max_concurrent=1, max_queue=4, queue_timeout=0.01)
+            await bulkhead.acquire()
+            with pytest.raises(BulkheadFull):
+                await bulkhead.acquire()
+            return bulkhead
+
+        bulkhead = asyncio.run(run())
+        assert bulkhead.waiting == 0
+        assert bulkhead.in_flight == 1
+
+    def test_cancel_while_waiting(self):
+        """Тест: скасований запит у черзі не займає місця"""
+        async def run():
+            bulkhead = Bulkhead("test", max_concurrent=1, max_queue=4, queue_timeout=1.0)
+            await bulkhead.acquire()
+            waiting = asyncio.create_task(bulkhead.acquire())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            bulkhead.release()
+            return bulkhead
+
+        bulkhead = asyncio.run(run())
+        assert bulkhead.waiting == 0
+        assert bulkhead.in_flight == 0
+
+    def test_cancel_after_slot_granted(self):
+        """Тест: скасування після передачі місця не губить його (повертається або лишається в запиту)"""
+        async def run():
+            bulkhead = Bulkhead("test", max_concurrent=1, max_queue=4, queue_timeout=1.0)
+            await bulkhead.acquire()
+            waiting = asyncio.create_task(bulkhead.acquire())
+            await asyncio.sleep(0)
+            bulkhead.release()  # місце передано waiting
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            return bulkhead, waiting
+
+        bulkhead, waiting = asyncio.run(run())
+        # До Python 3.12 wait_for може віддати результат замість скасування -
+        # тоді місце належить запиту; в обох випадках воно не губиться
+        if waiting.cancelled():
+            assert bulkhead.in_flight == 0
+        else:
+            assert bulkhead.in_flight == 1
+        assert bulkhead.waiting == 0
+
+    def test_priority_between_classes(self):
+        """Тест: поки в черзі interactive є запити, analytics не отримує нових місць"""
+        async def run():
+            group = Bulkheads({
+                "interactive": {"priority": 0, "max_concurrent": 1, "max_queue": 4},
+                "analytics": {"priority": 1, "max_concurrent": 2, "max_queue": 4},
+            })
+            interactive, analytics = group.get("interactive"), group.get("analytics")
+            order = []
+
+            async def acquire(bulkhead):
+                await bulkhead.acquire()
+                order.append(bulkhead.name)
+
+            await interactive.acquire()
+            queued_interactive = asyncio.create_task(acquire(interactive))
+            await asyncio.sleep(0)
+            queued_analytics = asyncio.create_task(acquire(analytics))
+            await asyncio.sleep(0)
+            assert analytics.in_flight == 0 and analytics.waiting == 1
+
+            interactive.release()
+            await asyncio.gather(queued_interactive, queued_analytics)
+            await group.aclose()
+            return order
+
+        assert asyncio.run(run()) == ["interactive", "analytics"]
+
+
+# ============================================
+# Тести таблиці маршрутизації (discovery)
+# ============================================
+
+def service_info(name: str, port: int, status: str = "UP") -> dict:
+    return {"service_name": name, "host": "10.0.0.1", "port": port, "status": status}
+
+
+class FakeRegistry:
+    """Registry для RoutingTable: відповідь /services задає поле services, запити рахуються."""
+
+    def __init__(self, services):
+        self.services = services
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.path)
+        if self.fail:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"services": self.services})
+
+
+def make_table(handler, **settings) -> RoutingTable:
+    table = RoutingTable("http://registry", **settings)
+    table._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return table
+
+
+def ports(instances) -> list:
+    return [i.port for i in instances]
+
+
+class TestRoutingTable:
+    """Тести локальної таблиці маршрутизації gateway"""
+
+    def test_warm_lookups_skip_registry(self):
+        """Тест: після першого заповнення resolve/instances не звертаються до Registry"""
+        registry = FakeRegistry([service_info("task-service", 5001),
+                                 service_info("task-service", 5002, status="DOWN")])
+
+        async def run():
+            table = make_table(registry, refresh_interval=60)
+            await table.start()
+            calls = len(registry.calls)
+            for _ in range(100):
+                assert ports(await table.resolve("task-service")) == [5001]
+                assert ports(table.instances("task-service")) == [5001]
+            await table.stop()
+            return calls
+
+        calls = asyncio.run(run())
+        assert calls == 1
+        assert registry.calls == ["/services"]
+
+    def test_background_refresh_replaces_table(self):
+        """Тест: фонове оновлення підміняє таблицю цілком (старий словник не змінюється)"""
+        registry = FakeRegistry([service_info("task-service", 5001)])
+
+        async def run():
+            table = make_table(registry, refresh_interval=0.01)
+            await table.start()
+            before = table._routes
+            registry.services = [service_info("task-service", 5002),
+                                 service_info("category-service", 5003)]
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if table.instances("category-service"):
+                    break
+            after = table._routes
+            await table.stop()
+            return before, after
+
+        before, after = asyncio.run(run())
+        assert after is not before
+        assert ports(before["task-service"]) == [5001] and "category-service" not in before
+        assert ports(after["task-service"]) == [5002]
+        assert ports(after["category-service"]) == [5003]
+
+    def test_watch_replaces_service_routes(self):
+        """Тест: відповідь /watch одразу замінює екземпляри сервісу в таблиці"""
+        changed = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/services":
+                return httpx.Response(200, json={"services": [service_info("task-service", 5001)]})
+            if request.url.params["index"] == "0":
+                return httpx.Response(200, json={"index": 7, "instances": [
+                    {"host": "10.0.0.2", "port": 5002}
+                ]})
+            # Наступний блокуючий запит чекає на зміни, доки таблицю не зупинять
+            changed.set()
+            await asyncio.sleep(3600)
+
+        async def run():
+            table = make_table(handler, refresh_interval=60, watch=True)
+            await table.start()
+            await asyncio.wait_for(changed.wait(), 1.0)
+            result = [i.url for i in table.instances("task-service")], table.stats()
+            await table.stop()
+            return result
+
+        urls, stats = asyncio.run(run())
+        assert urls == ["http://10.0.0.2:5002"]
+        assert stats["watched_services"] == ["task-service"]
+        assert stats["watch_updates"] == 1
+
+    def test_failed_refresh_keeps_last_routes(self):
+        """Тест: Registry відповідає 500 - таблиця лишається останньою успішною"""
+        registry = FakeRegistry([service_info("task-service", 5001)])
+
+        async def run():
+            table = make_table(registry)
+            await table.refresh()
+            registry.fail = True
+            await table.refresh()
+            result = ports(await table.resolve("task-service")), table.stats()
+            await table.stop()
+            return result
+
+        resolved, stats = asyncio.run(run())
+        assert resolved == [5001]
+        assert stats["refreshes"] == 1
+        assert stats["refresh_errors"] == 1
+        assert stats["last_error"]
+
+    def test_unreachable_registry_keeps_last_routes(self):
+        """Тест: Registry недоступний (помилка з'єднання) - таблиця не змінюється"""
+        registry = FakeRegistry([service_info("task-service", 5001)])
+
+        def handler(request):
+            if registry.fail:
+                raise httpx.ConnectError("connection refused", request=request)
+            return registry(request)
+
+        async def run():
+            table = make_table(handler)
+            await table.refresh()
+            routes = table._routes
+            registry.fail = True
+            await table.refresh()
+            result = table._routes is routes, table.stats()["refresh_errors"]
+            await table.stop()
+            return result
+
+        assert asyncio.run(run()) == (True, 1)
+
+    def test_miss_refresh_rate_limited(self):
+        """Тест: невідомий сервіс оновлює таблицю не частіше ніж раз на miss_refresh_interval"""
+        registry = FakeRegistry([service_info("task-service", 5001)])
+
+        async def run():
+            table = make_table(registry, miss_refresh_interval=60)
+            await table.refresh()
+            for _ in range(10):
+                assert await table.resolve("unknown-service") == []
+            table._last_refresh -= 60
+            await table.resolve("unknown-service")
+            result = table.stats()["miss_refreshes"]
+            await table.stop()
+            return result
+
+        assert asyncio.run(run()) == 1
+        assert len(registry.calls) == 2
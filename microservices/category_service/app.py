@@ -83,11 +83,17 @@ def register_service():
 def heartbeat_loop():
     while True:
         time.sleep(10)
-        if service_id:
-            try:
-                requests.post(f"{REGISTRY_URL}/heartbeat/{service_id}", timeout=5)
-            except:
-                pass
+        if not service_id:
+            register_service()
+            continue
+        try:
+            r = requests.post(f"{REGISTRY_URL}/heartbeat/{service_id}", timeout=5)
+        except Exception:
+            continue
+        # Реєстр не знає екземпляра (eviction або втрата стану) - реєструємося знову
+        if r.status_code == 404:
+            print(f"[{SERVICE_NAME}] Unknown to registry, registering again")
+            register_service()
 
 threading.Thread(target=heartbeat_loop, daemon=True).start()
 
@@ -8,6 +8,7 @@ Notification Service (Мікросервіс сповіщень)
 
 import uvicorn
 import mysql.connector
+from mysql.connector import errorcode
 import requests
 import threading
 import time
@@ -58,6 +59,21 @@ def get_db():
     return mysql.connector.connect(**DB_CONFIG)
 
 
+# Версія колекції завдань для ETag svc_task_core (back/migrations/002_collection_versions.sql):
+# один UPDATE на транзакцію запису, останнім перед COMMIT; рядок - connection_id % 16
+TASKS_VERSION_SHARDS = 16
+BUMP_TASKS_VERSION_SQL = ("UPDATE CollectionVersions SET Version = Version + 1 "
+                          "WHERE Collection = 'tasks' AND Shard = %s")
+
+def bump_tasks_version(conn, cursor):
+    try:
+        cursor.execute(BUMP_TASKS_VERSION_SQL, (conn.connection_id % TASKS_VERSION_SHARDS,))
+    except mysql.connector.ProgrammingError as e:
+        # Міграцію версій не застосовано - ETag не використовується
+        if e.errno != errorcode.ER_NO_SUCH_TABLE:
+            raise
+
+
 # ============== РЕЄСТРАЦІЯ ==============
 service_id = None
 
@@ -78,11 +94,17 @@ def register_service():
 def heartbeat_loop():
     while True:
         time.sleep(10)
-        if service_id:
-            try:
-                requests.post(f"{REGISTRY_URL}/heartbeat/{service_id}", timeout=5)
-            except:
-                pass
+        if not service_id:
+            register_service()
+            continue
+        try:
+            r = requests.post(f"{REGISTRY_URL}/heartbeat/{service_id}", timeout=5)
+        except Exception:
+            continue
+        # Реєстр не знає екземпляра (eviction або втрата стану) - реєструємося знову
+        if r.status_code == 404:
+            print(f"[{SERVICE_NAME}] Unknown to registry, registering again")
+            register_service()
 
 threading.Thread(target=heartbeat_loop, daemon=True).start()
 
@@ -149,17 +171,20 @@ def analyze_overdue():
         """, (now,))
         overdue = cursor.fetchall()
         
+        updated_count = 0
         if overdue:
             ids = [t['idTask'] for t in overdue]
             placeholders = ','.join(['%s'] * len(ids))
             cursor.execute(f"UPDATE Tasks SET Status = 'Overdue' WHERE idTask IN ({placeholders})", ids)
+            updated_count = cursor.rowcount
+            bump_tasks_version(conn, cursor)
             conn.commit()
         
         return {
             "success": True,
             "analyzed_at": now.isoformat(),
             "overdue_count": len(overdue),
-            "updated_count": cursor.rowcount if overdue else 0,
+            "updated_count": updated_count,
             "tasks": overdue
         }
     finally:
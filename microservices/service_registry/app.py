@@ -7,13 +7,18 @@ Service Registry (Реєстр Сервісів)
 Порт: 8500
 """
 
+import asyncio
+import heapq
+import math
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Response
 from pydantic import BaseModel
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+import os
 import threading
 import time
+from storage import RegistryStore
 
 app = FastAPI(
     title="Service Registry",
@@ -25,9 +30,53 @@ app = FastAPI(
 services_registry: Dict[str, dict] = {}
 lock = threading.Lock()
 
+# Індекс service_name -> service_id екземплярів (у порядку реєстрації); змінюється під lock
+services_by_name: Dict[str, Dict[str, None]] = {}
+
+# Знімки для читання без блокування: service_name -> кортеж (host, port) UP-екземплярів.
+# Записувачі під lock будують новий кортеж і замінюють його одним присвоєнням
+# (copy-on-write), тому discover читає узгоджений знімок, не чекаючи на lock
+up_instances: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+
+# Індекс змін (як X-Consul-Index): зростає при кожній зміні набору UP-екземплярів
+# будь-якого сервісу; service_index - індекс останньої зміни конкретного сервісу.
+# Початкове значення - час старту в мікросекундах: після перезапуску індекси не
+# повторюють виданих раніше, тож /watch зі старим index відповідає одразу
+registry_index = time.time_ns() // 1000
+service_index: Dict[str, int] = {}
+
+# Черга дедлайнів (heap) для TTL: (час epoch, service_id). Актуальний дедлайн
+# екземпляра - expiry_deadlines[service_id]; інші записи в heap застарілі й пропускаються.
+# Heartbeat лише оновлює last_heartbeat, дедлайн переноситься ліниво при витяганні.
+# Дедлайни округлюються вгору до EXPIRY_TICK: одне пробудження обробляє весь такт
+expiry_heap: List[Tuple[float, str]] = []
+expiry_deadlines: Dict[str, float] = {}
+expiry_condition = threading.Condition(lock)
+
+# Очікувачі /watch: service_name -> asyncio.Event (живуть у циклі подій uvicorn)
+watch_events: Dict[str, asyncio.Event] = {}
+event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Максимальний час очікування /watch (секунди)
+WATCH_MAX_TIMEOUT = 300
+
 # Час життя реєстрації (секунди)
 SERVICE_TTL = 30
 
+# Скільки секунд сервіс зі статусом DOWN лишається в реєстрі до видалення
+EVICTION_GRACE = 90
+
+# Крок округлення дедлайнів expiry (секунди)
+EXPIRY_TICK = 1.0
+
+# Каталог зі знімком та журналом стану реєстру (див. storage.py)
+DATA_DIR = os.environ.get(
+    "REGISTRY_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+)
+SNAPSHOT_INTERVAL = 60.0
+FLUSH_INTERVAL = 1.0
+
 
 class ServiceRegistration(BaseModel):
     """Модель для реєстрації сервісу"""
@@ -50,6 +99,98 @@ class ServiceInfo(BaseModel):
     metadata: Optional[dict] = None
 
 
+class HeartbeatBatch(BaseModel):
+    """Пакет heartbeat-ів кількох екземплярів"""
+    service_ids: List[str]
+
+
+# ============================================================================
+# ІНДЕКС ТА ЗНІМКИ ДЛЯ DISCOVERY
+# ============================================================================
+
+def publish_locked(service_name: str):
+    """
+    Оновлює знімок UP-екземплярів сервісу. Викликається під lock після
+    зміни складу або статусу екземплярів service_name.
+    """
+    global registry_index
+    instances = tuple(
+        (services_registry[service_id]["host"], services_registry[service_id]["port"])
+        for service_id in services_by_name.get(service_name, ())
+        if services_registry[service_id]["status"] == "UP"
+    )
+    if instances == up_instances.get(service_name, ()):
+        return
+    if instances:
+        up_instances[service_name] = instances
+    else:
+        up_instances.pop(service_name, None)
+    
+    registry_index += 1
+    service_index[service_name] = registry_index
+    if event_loop is not None:
+        # Записувачі працюють у потоках (threadpool, фонова перевірка) - будимо
+        # очікувачів у циклі подій
+        event_loop.call_soon_threadsafe(wake_watchers, service_name)
+
+
+def schedule_expiry_locked(service_id: str, deadline: float):
+    """Запланувати перевірку екземпляра на перший такт не раніше deadline (під lock)."""
+    deadline = math.ceil(deadline / EXPIRY_TICK) * EXPIRY_TICK
+    earliest = expiry_heap[0][0] if expiry_heap else math.inf
+    expiry_deadlines[service_id] = deadline
+    heapq.heappush(expiry_heap, (deadline, service_id))
+    if deadline < earliest:
+        # Новий найближчий такт - будимо потік expiry раніше
+        expiry_condition.notify()
+
+
+def remove_service_locked(service_id: str) -> str:
+    """
+    Видалення екземпляра з реєстру, індексу та журналу (під lock). На диск запис
+    скидає store.flush(): deregister - одразу після lock, видалення потоком
+    expiry - фоновий потік сховища.
+    """
+    service_name = services_registry.pop(service_id)["service_name"]
+    expiry_deadlines.pop(service_id, None)
+    store.append_deregister(service_id)
+    instances = services_by_name.get(service_name, {})
+    instances.pop(service_id, None)
+    if not instances:
+        services_by_name.pop(service_name, None)
+    publish_locked(service_name)
+    return service_name
+
+
+def renew_locked(service_id: str, now: datetime) -> bool:
+    """Оновлення heartbeat екземпляра (під lock). False - екземпляр невідомий."""
+    info = services_registry.get(service_id)
+    if info is None:
+        return False
+    info["last_heartbeat"] = now
+    store.append_heartbeat(service_id, now)
+    if info["status"] != "UP":
+        info["status"] = "UP"
+        publish_locked(info["service_name"])
+        # Запланована перевірка стосується видалення (пізніше за TTL) - переносимо
+        schedule_expiry_locked(service_id, now.timestamp() + SERVICE_TTL)
+    return True
+
+
+def wake_watchers(service_name: str):
+    """Будить /watch сервісу (виконується в циклі подій)."""
+    event = watch_events.pop(service_name, None)
+    if event is not None:
+        event.set()
+
+
+def instances_view(service_name: str) -> list:
+    return [
+        {"host": host, "port": port, "url": f"http://{host}:{port}"}
+        for host, port in up_instances.get(service_name, ())
+    ]
+
+
 # ============================================================================
 # ЕНДПОІНТИ РЕЄСТРУ
 # ============================================================================
@@ -76,14 +217,40 @@ def register_service(registration: ServiceRegistration):
             "last_heartbeat": now,
             "metadata": registration.metadata
         }
-        
-        print(f"[Registry] Registered: {registration.service_name} at {registration.host}:{registration.port}")
-        
-        return {
-            "success": True,
-            "service_id": service_id,
-            "message": f"Service '{registration.service_name}' registered successfully"
+        store.append_register(service_id, services_registry[service_id])
+        services_by_name.setdefault(registration.service_name, {})[service_id] = None
+        publish_locked(registration.service_name)
+        schedule_expiry_locked(service_id, now.timestamp() + SERVICE_TTL)
+    
+    # fsync журналу поза lock: heartbeat-и та discovery не чекають на диск
+    store.flush()
+    print(f"[Registry] Registered: {registration.service_name} at {registration.host}:{registration.port}")
+    
+    return {
+        "success": True,
+        "service_id": service_id,
+        "message": f"Service '{registration.service_name}' registered successfully"
+    }
+
+
+@app.post("/heartbeat/batch", tags=["Registry"])
+def heartbeat_batch(batch: HeartbeatBatch):
+    """
+    Heartbeat кількох екземплярів одним запитом (одне захоплення lock).
+    
+    Input: service_ids
+    Output: Результат для кожного ID: "ok" або "not_found" (потрібна повторна реєстрація)
+    
+    Оголошено до /heartbeat/{service_id}, інакше "batch" сприймався б як service_id.
+    """
+    with lock:
+        now = datetime.now()
+        results = {
+            service_id: "ok" if renew_locked(service_id, now) else "not_found"
+            for service_id in batch.service_ids
         }
+    
+    return {"success": True, "results": results}
 
 
 @app.post("/heartbeat/{service_id}", tags=["Registry"])
@@ -95,12 +262,9 @@ def heartbeat(service_id: str):
     Output: Статус оновлення
     """
     with lock:
-        if service_id not in services_registry:
+        if not renew_locked(service_id, datetime.now()):
             raise HTTPException(status_code=404, detail="Service not found")
         
-        services_registry[service_id]["last_heartbeat"] = datetime.now()
-        services_registry[service_id]["status"] = "UP"
-        
         return {"success": True, "message": "Heartbeat received"}
 
 
@@ -116,10 +280,12 @@ def deregister_service(service_id: str):
         if service_id not in services_registry:
             raise HTTPException(status_code=404, detail="Service not found")
         
-        del services_registry[service_id]
-        print(f"[Registry] Deregistered: {service_id}")
-        
-        return {"success": True, "message": "Service deregistered"}
+        remove_service_locked(service_id)
+    
+    store.flush()
+    print(f"[Registry] Deregistered: {service_id}")
+    
+    return {"success": True, "message": "Service deregistered"}
 
 
 @app.get("/discover/{service_name}", tags=["Discovery"])
@@ -129,22 +295,66 @@ def discover_service(service_name: str):
     
     Input: service_name
     Output: host, port активного сервісу або помилка
+    
+    Читає знімок up_instances без блокування: O(1) і не чекає на
+    реєстрацію, heartbeat чи фонову перевірку.
     """
-    with lock:
-        for service_id, info in services_registry.items():
-            if info["service_name"] == service_name and info["status"] == "UP":
-                return {
-                    "success": True,
-                    "service_name": service_name,
-                    "host": info["host"],
-                    "port": info["port"],
-                    "url": f"http://{info['host']}:{info['port']}"
-                }
-        
+    instances = up_instances.get(service_name)
+    if not instances:
         raise HTTPException(
             status_code=404, 
             detail=f"Service '{service_name}' not found or unavailable"
         )
+    
+    host, port = instances[0]
+    return {
+        "success": True,
+        "service_name": service_name,
+        "host": host,
+        "port": port,
+        "url": f"http://{host}:{port}"
+    }
+
+
+@app.get("/watch/{service_name}", tags=["Discovery"])
+async def watch_service(
+    service_name: str,
+    response: Response,
+    index: int = Query(0, ge=0),
+    timeout: float = Query(30.0, gt=0, le=WATCH_MAX_TIMEOUT)
+):
+    """
+    Блокуючий запит (long-poll) змін UP-екземплярів сервісу.
+    
+    Input: service_name, index - останній отриманий індекс (0 - без очікування),
+           timeout - максимальний час очікування, секунди
+    Output: index, список UP-екземплярів; відповідь повертається одразу, якщо
+            індекс сервісу відрізняється від index, інакше - після зміни або
+            тайм-ауту (з тим самим індексом)
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    current = service_index.get(service_name, 1)
+    while index and current == index:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        event = watch_events.get(service_name)
+        if event is None:
+            event = watch_events[service_name] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), remaining)
+        except asyncio.TimeoutError:
+            break
+        current = service_index.get(service_name, 1)
+    
+    response.headers["X-Registry-Index"] = str(current)
+    return {
+        "success": True,
+        "service_name": service_name,
+        "index": current,
+        "instances": instances_view(service_name)
+    }
 
 
 @app.get("/services", tags=["Registry"])
@@ -169,7 +379,8 @@ def health_check():
     return {
         "status": "healthy",
         "service": "service-registry",
-        "registered_services": len(services_registry)
+        "registered_services": len(services_registry),
+        "storage": store.stats()
     }
 
 
@@ -177,17 +388,106 @@ def health_check():
 # ФОНОВА ЗАДАЧА - ПЕРЕВІРКА HEARTBEAT
 # ============================================================================
 
+def expire_due_locked(now: float) -> set:
+    """
+    Обробка дедлайнів, що настали (під lock). Кожен живий екземпляр витягується
+    й переноситься раз на SERVICE_TTL (n / SERVICE_TTL записів за секунду, по
+    O(log n)), але пачками - одне пробудження на EXPIRY_TICK.
+    - UP без heartbeat протягом SERVICE_TTL -> DOWN, наступна перевірка - видалення;
+    - DOWN без heartbeat протягом SERVICE_TTL + EVICTION_GRACE -> видалення;
+    - був heartbeat -> дедлайн переноситься.
+    
+    Returns:
+        set: Назви сервісів, набір екземплярів яких змінився
+    """
+    changed = set()
+    while expiry_heap and expiry_heap[0][0] <= now:
+        deadline, service_id = heapq.heappop(expiry_heap)
+        if expiry_deadlines.get(service_id) != deadline:
+            continue  # застарілий запис
+        del expiry_deadlines[service_id]
+        info = services_registry.get(service_id)
+        if info is None:
+            continue
+        
+        expires_at = info["last_heartbeat"].timestamp() + SERVICE_TTL
+        if info["status"] == "UP":
+            if expires_at > now:
+                schedule_expiry_locked(service_id, expires_at)
+                continue
+            info["status"] = "DOWN"
+            changed.add(info["service_name"])
+            schedule_expiry_locked(service_id, expires_at + EVICTION_GRACE)
+            print(f"[Registry] Service DOWN: {service_id} (no heartbeat for {now - expires_at + SERVICE_TTL:.0f}s)")
+        elif expires_at + EVICTION_GRACE > now:
+            schedule_expiry_locked(service_id, expires_at + EVICTION_GRACE)
+        else:
+            remove_service_locked(service_id)
+            print(f"[Registry] Evicted: {service_id} (DOWN for {now - expires_at:.0f}s)")
+    
+    for service_name in changed:
+        publish_locked(service_name)
+    return changed
+
+
 def check_services_health():
-    """Періодична перевірка здоров'я сервісів"""
-    while True:
-        time.sleep(10)
-        with lock:
-            now = datetime.now()
-            for service_id, info in services_registry.items():
-                elapsed = (now - info["last_heartbeat"]).total_seconds()
-                if elapsed > SERVICE_TTL:
-                    info["status"] = "DOWN"
-                    print(f"[Registry] Service DOWN: {service_id} (no heartbeat for {elapsed:.0f}s)")
+    """
+    Потік expiry: спить до найближчого дедлайну в heap (або до появи
+    ближчого) і позначає DOWN / видаляє екземпляри саме в момент закінчення TTL.
+    """
+    with expiry_condition:
+        while True:
+            expire_due_locked(time.time())
+            timeout = expiry_heap[0][0] - time.time() if expiry_heap else None
+            if timeout is None or timeout > 0:
+                expiry_condition.wait(timeout)
+
+
+@app.on_event("startup")
+async def capture_event_loop():
+    global event_loop
+    event_loop = asyncio.get_running_loop()
+
+
+@app.on_event("shutdown")
+def close_store():
+    store.close()
+
+
+# ============================================================================
+# ЗБЕРЕЖЕННЯ СТАНУ
+# ============================================================================
+
+def restore_registry() -> int:
+    """
+    Відновлення реєстрацій зі знімка та журналу. Статус визначається за
+    часом останнього heartbeat, індекс і знімки для discovery будуються заново.
+    Поки Реєстр не працював, heartbeat-и не доходили, тому жоден екземпляр не
+    видаляється раніше, ніж через SERVICE_TTL після старту: живі встигнуть
+    надіслати heartbeat і знову стати UP.
+    """
+    restored = store.restore()
+    with lock:
+        now = datetime.now()
+        for service_id, info in services_registry.items():
+            elapsed = (now - info["last_heartbeat"]).total_seconds()
+            info["status"] = "UP" if elapsed <= SERVICE_TTL else "DOWN"
+            services_by_name.setdefault(info["service_name"], {})[service_id] = None
+            expires_at = info["last_heartbeat"].timestamp() + SERVICE_TTL
+            if info["status"] == "UP":
+                schedule_expiry_locked(service_id, expires_at)
+            else:
+                schedule_expiry_locked(service_id, max(expires_at + EVICTION_GRACE, now.timestamp() + SERVICE_TTL))
+        for service_name in list(services_by_name):
+            publish_locked(service_name)
+    print(f"[Registry] Restored {restored} services in {store.last_restore_ms} ms")
+    return restored
+
+
+store = RegistryStore(DATA_DIR, services_registry, lock,
+                      snapshot_interval=SNAPSHOT_INTERVAL, flush_interval=FLUSH_INTERVAL)
+restore_registry()
+store.start()
 
 
 # Запуск фонової перевірки
@@ -0,0 +1,117 @@
+"""
+Мікробенчмарк Service Discovery (bench_discover.py)
+
+Порівнює пропускну здатність discover_service (індекс + знімки без блокування)
+з попереднім лінійним пошуком під глобальним lock при 10, 1 000 та 10 000
+зареєстрованих екземплярів: без конкуренції та паралельно з потоком, що
+безперервно надсилає heartbeat (записувач, який тримає lock).
+
+Запуск:
+    python bench_discover.py
+    python bench_discover.py --sizes 10 1000 10000 --seconds 1.0
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+
+from fastapi import HTTPException
+
+# Бенчмарк не повинен змінювати збережений стан реєстру (storage.py)
+os.environ["REGISTRY_DATA_DIR"] = tempfile.mkdtemp(prefix="registry-bench-")
+
+import app as registry
+from app import ServiceRegistration, discover_service, heartbeat, register_service
+
+
+def discover_linear(service_name: str) -> dict:
+    """Попередня реалізація discover: лінійний пошук під глобальним lock."""
+    with registry.lock:
+        for service_id, info in registry.services_registry.items():
+            if info["service_name"] == service_name and info["status"] == "UP":
+                return {
+                    "success": True,
+                    "service_name": service_name,
+                    "host": info["host"],
+                    "port": info["port"],
+                    "url": f"http://{info['host']}:{info['port']}"
+                }
+        raise HTTPException(status_code=404, detail=f"Service '{service_name}' not found or unavailable")
+
+
+def populate(size: int) -> tuple:
+    """
+    Реєструє size екземплярів: 10 на сервіс, шуканий сервіс - останнім
+    (найгірший випадок для лінійного пошуку).
+
+    Returns:
+        tuple: (назва шуканого сервісу, service_id для heartbeat)
+    """
+    with registry.lock:
+        registry.services_registry.clear()
+        registry.services_by_name.clear()
+        registry.up_instances.clear()
+    service_ids = []
+    # register_service друкує кожну реєстрацію
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(size):
+            name = f"service-{i // 10}"
+            result = register_service(ServiceRegistration(service_name=name, host="10.0.0.1", port=10000 + i))
+            service_ids.append(result["service_id"])
+    return f"service-{(size - 1) // 10}", service_ids
+
+
+def measure(discover, service_name: str, seconds: float) -> float:
+    """Кількість викликів discover за секунду."""
+    calls = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            discover(service_name)
+        calls += 100
+    return calls / seconds
+
+
+def with_writer(service_ids: list, func):
+    """Виконує func, поки окремий потік безперервно надсилає heartbeat."""
+    running = True
+
+    def writer():
+        i = 0
+        while running:
+            heartbeat(service_ids[i % len(service_ids)])
+            i += 1
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    try:
+        return func()
+    finally:
+        running = False
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover throughput benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'instances':>10} {'linear':>14} {'indexed':>14} {'linear+writer':>15} {'indexed+writer':>15}")
+    for size in args.sizes:
+        service_name, service_ids = populate(size)
+        results = [
+            measure(discover_linear, service_name, args.seconds),
+            measure(discover_service, service_name, args.seconds),
+            with_writer(service_ids, lambda: measure(discover_linear, service_name, args.seconds)),
+            with_writer(service_ids, lambda: measure(discover_service, service_name, args.seconds)),
+        ]
+        print(f"{size:>10} " + " ".join(f"{value:>12,.0f}/s" for value in results))
+
+
+if __name__ == "__main__":
+    main()
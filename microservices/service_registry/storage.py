@@ -0,0 +1,288 @@
+"""
+Збереження стану Service Registry (storage.py)
+
+Стан реєстру (services_registry) зберігається у локальному каталозі:
+- snapshot.json - компактний знімок усіх реєстрацій;
+- registry.<generation>.log - журнал змін після знімка (JSON Lines, лише дописування).
+
+Під lock реєстру записи лише дописуються в буфер журналу. На диск їх скидає
+flush() (flush + fsync) вже поза lock: реєстрація та видалення через API
+відповідають після flush(), heartbeat-и та видалення потоком expiry скидає
+фоновий потік раз на flush_interval секунд. Одночасні flush() об'єднуються
+(group commit): поки виконується fsync, інші чекають і потім одним fsync
+скидають усе, що встигли дописати, тому fsync не блокує реєстр і не
+виконується на кожен запис.
+
+Знімок створюється раз на snapshot_interval секунд або коли журнал перевищує
+max_log_records записів: під lock реєстру копіюються записи стану і
+починається новий журнал (generation + 1); далі поза lock старий журнал
+скидається на диск, стан кодується в JSON, знімок пишеться у тимчасовий файл,
+fsync та атомарно перейменовується, після чого старі журнали видаляються.
+При старті стан відновлюється зі знімка та журналів з generation не меншим
+за знімок.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict
+
+# Поля запису реєстру, що зберігаються як datetime
+DATETIME_FIELDS = ("registered_at", "last_heartbeat")
+
+SNAPSHOT_FILE = "snapshot.json"
+
+
+def encode_entry(entry: dict) -> dict:
+    return {key: value.isoformat() if key in DATETIME_FIELDS else value for key, value in entry.items()}
+
+
+def decode_entry(entry: dict) -> dict:
+    for key in DATETIME_FIELDS:
+        entry[key] = datetime.fromisoformat(entry[key])
+    return entry
+
+
+class RegistryStore:
+    """
+    Args:
+        directory: Каталог даних
+        registry: Словник стану реєстру (service_id -> запис)
+        lock: Lock реєстру; append_* викликаються під ним
+        snapshot_interval: Період створення знімка (секунди)
+        flush_interval: Період скидання буфера журналу з fsync (секунди)
+        max_log_records: Кількість записів журналу, після якої знімок створюється позачергово
+    """
+
+    def __init__(self, directory: str, registry: Dict[str, dict], lock: threading.Lock,
+                 snapshot_interval: float = 60.0, flush_interval: float = 1.0,
+                 max_log_records: int = 50000):
+        self.directory = directory
+        self.registry = registry
+        self.lock = lock
+        self.snapshot_interval = snapshot_interval
+        self.flush_interval = flush_interval
+        self.max_log_records = max_log_records
+        self.generation = 0
+        self._log = None
+        self._log_records = 0
+        # Лічильники записів: дописано в журнал і скинуто на диск з fsync
+        self._appended = 0
+        self._synced = 0
+        # Порядок захоплення: _sync_lock -> lock реєстру -> _io_lock
+        self._io_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._thread = None
+        self._running = False
+        self.snapshots = 0
+        self.last_restore_ms = None
+        os.makedirs(directory, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Відновлення
+    # ------------------------------------------------------------------
+
+    def restore(self) -> int:
+        """
+        Відновлює стан реєстру зі знімка та журналів і відкриває журнал для запису.
+
+        Returns:
+            int: Кількість відновлених реєстрацій
+        """
+        started = time.perf_counter()
+        state: Dict[str, dict] = {}
+        generation = 0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            generation = snapshot["generation"]
+            state = snapshot["services"]
+
+        for log_generation in self._log_generations():
+            if log_generation < generation:
+                continue
+            self._replay(os.path.join(self.directory, f"registry.{log_generation}.log"), state)
+            generation = log_generation
+
+        with self.lock:
+            self.registry.clear()
+            for service_id, entry in state.items():
+                self.registry[service_id] = decode_entry(entry)
+
+        # Новий журнал після відновлених: записи старих уже враховано
+        self.generation = generation + 1
+        self._open_log()
+        self.last_restore_ms = round((time.perf_counter() - started) * 1000, 2)
+        return len(state)
+
+    def _log_generations(self) -> list:
+        generations = []
+        for name in os.listdir(self.directory):
+            if name.startswith("registry.") and name.endswith(".log"):
+                try:
+                    generations.append(int(name[len("registry."):-len(".log")]))
+                except ValueError:
+                    pass
+        return sorted(generations)
+
+    @staticmethod
+    def _read_log(path: str) -> list:
+        with open(path, encoding="utf-8") as f:
+            data = f.read()
+        try:
+            # Увесь журнал одним json.loads - у кілька разів швидше, ніж по рядку
+            return json.loads("[" + data.rstrip("\n").replace("\n", ",") + "]")
+        except ValueError:
+            pass
+        records = []
+        for line in data.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # Обірваний останній рядок після аварійної зупинки
+                break
+        return records
+
+    @classmethod
+    def _replay(cls, path: str, state: Dict[str, dict]):
+        for record in cls._read_log(path):
+            op = record["op"]
+            if op == "heartbeat":
+                entry = state.get(record["id"])
+                if entry is not None:
+                    entry["last_heartbeat"] = record["ts"]
+            elif op == "register":
+                state[record["id"]] = record["entry"]
+            elif op == "deregister":
+                state.pop(record["id"], None)
+
+    # ------------------------------------------------------------------
+    # Журнал
+    # ------------------------------------------------------------------
+
+    def _open_log(self):
+        path = os.path.join(self.directory, f"registry.{self.generation}.log")
+        self._log = open(path, "a", encoding="utf-8")
+        self._log_records = 0
+
+    def _write(self, record: dict):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._io_lock:
+            self._log.write(line)
+            self._log_records += 1
+            self._appended += 1
+
+    def append_register(self, service_id: str, entry: dict):
+        self._write({"op": "register", "id": service_id, "entry": encode_entry(entry)})
+
+    def append_deregister(self, service_id: str):
+        self._write({"op": "deregister", "id": service_id})
+
+    def append_heartbeat(self, service_id: str, ts: datetime):
+        self._write({"op": "heartbeat", "id": service_id, "ts": ts.isoformat()})
+
+    def flush(self):
+        """
+        Скидає на диск усі записи, дописані до виклику (group commit).
+        Викликається без lock реєстру: fsync не затримує інші запити.
+        """
+        target = self._appended
+        with self._sync_lock:
+            # Поки чекали, наші записи міг скинути fsync іншого потоку
+            if self._synced >= target or self._log is None:
+                return
+            with self._io_lock:
+                self._log.flush()
+                log = self._log
+                appended = self._appended
+            # Журнал не закриється під час fsync: ротація та close чекають на _sync_lock
+            os.fsync(log.fileno())
+            self._synced = appended
+
+    # ------------------------------------------------------------------
+    # Знімки
+    # ------------------------------------------------------------------
+
+    def snapshot(self):
+        """Компактний знімок стану та видалення журналів, які він покриває."""
+        with self._sync_lock:
+            with self.lock:
+                # Під lock - лише копії записів (значення незмінні), кодування - поза ним
+                entries = [(service_id, dict(entry)) for service_id, entry in self.registry.items()]
+                with self._io_lock:
+                    self._log.flush()
+                    old_log = self._log
+                    appended = self._appended
+                    self.generation += 1
+                    self._open_log()
+                generation = self.generation
+            os.fsync(old_log.fileno())
+            old_log.close()
+            self._synced = appended
+        services = {service_id: encode_entry(entry) for service_id, entry in entries}
+
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"generation": generation, "services": services}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._fsync_directory()
+
+        for log_generation in self._log_generations():
+            if log_generation < generation:
+                os.remove(os.path.join(self.directory, f"registry.{log_generation}.log"))
+        self.snapshots += 1
+
+    def _fsync_directory(self):
+        if not hasattr(os, "O_DIRECTORY"):
+            return  # Windows: перейменування вже атомарне
+        fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # ------------------------------------------------------------------
+    # Фоновий потік
+    # ------------------------------------------------------------------
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        last_snapshot = time.monotonic()
+        while self._running:
+            time.sleep(self.flush_interval)
+            try:
+                if (time.monotonic() - last_snapshot >= self.snapshot_interval
+                        or self._log_records >= self.max_log_records):
+                    self.snapshot()
+                    last_snapshot = time.monotonic()
+                else:
+                    self.flush()
+            except Exception as e:
+                print(f"[Registry] Storage error: {e}")
+
+    def close(self):
+        self._running = False
+        self.flush()
+        with self._sync_lock, self._io_lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "generation": self.generation,
+            "log_records": self._log_records,
+            "snapshots": self.snapshots,
+            "last_restore_ms": self.last_restore_ms,
+        }
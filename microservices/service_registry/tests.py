@@ -0,0 +1,595 @@
+"""
+Модуль тестування Service Registry (tests.py)
+Практична робота №4 - Simple Task Manager
+
+Тести запускаються з каталогу сервісу: cd service_registry && python -m pytest tests.py
+Стан реєстру зберігається у тимчасовому каталозі (REGISTRY_DATA_DIR).
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+import httpx
+
+os.environ["REGISTRY_DATA_DIR"] = tempfile.mkdtemp(prefix="registry-tests-")
+
+import app as registry
+import storage
+from storage import RegistryStore
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "shared"))
+from registry_client import AsyncHeartbeat
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    """Порожній реєстр для кожного тесту (журнал на диску не очищується)."""
+    with registry.lock:
+        registry.services_registry.clear()
+        registry.services_by_name.clear()
+        registry.up_instances.clear()
+        registry.service_index.clear()
+        registry.expiry_heap.clear()
+        registry.expiry_deadlines.clear()
+    yield
+
+
+def registration(service_name: str = "task-service", port: int = 8001) -> dict:
+    return {"service_name": service_name, "host": "localhost", "port": port, "version": "1.0.0"}
+
+
+def run_with_client(scenario):
+    """
+    Виконує scenario(client) з ASGI-клієнтом. event_loop реєстру вказує на цикл
+    тесту (як після startup), тож записувачі з threadpool будять /watch.
+    """
+    async def run():
+        registry.event_loop = asyncio.get_running_loop()
+        try:
+            transport = httpx.ASGITransport(app=registry.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://registry") as client:
+                return await scenario(client)
+        finally:
+            registry.event_loop = None
+    return asyncio.run(run())
+
+
+# ============================================
+# Тести /watch
+# ============================================
+
+class TestWatch:
+    """Тести блокуючих запитів змін"""
+
+    def test_watch_without_index_returns_immediately(self):
+        """Тест: index=0 - поточний стан без очікування"""
+        async def scenario(client):
+            await client.post("/register", json=registration())
+            return await client.get("/watch/task-service", params={"index": 0, "timeout": 5})
+
+        response = run_with_client(scenario)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["index"] == registry.service_index["task-service"]
+        assert response.headers["X-Registry-Index"] == str(body["index"])
+        assert [instance["port"] for instance in body["instances"]] == [8001]
+
+    def test_watch_wakes_on_register(self):
+        """Тест: очікування з поточним індексом завершується після реєстрації"""
+        async def scenario(client):
+            first = await client.get("/watch/task-service", params={"index": 0})
+            index = first.json()["index"]
+            waiter = asyncio.create_task(
+                client.get("/watch/task-service", params={"index": index, "timeout": 5})
+            )
+            await asyncio.sleep(0.1)
+            assert not waiter.done()
+
+            await client.post("/register", json=registration())
+            return index, await asyncio.wait_for(waiter, 2)
+
+        index, response = run_with_client(scenario)
+
+        body = response.json()
+        assert body["index"] != index
+        assert [instance["port"] for instance in body["instances"]] == [8001]
+
+    def test_watch_times_out_with_same_index(self):
+        """Тест: без змін відповідь після тайм-ауту з тим самим індексом"""
+        async def scenario(client):
+            await client.post("/register", json=registration())
+            index = registry.service_index["task-service"]
+            response = await client.get("/watch/task-service", params={"index": index, "timeout": 0.1})
+            return index, response
+
+        index, response = run_with_client(scenario)
+
+        assert response.json()["index"] == index
+
+    def test_index_not_repeated_after_restart(self):
+        """Тест: після перезапуску індекс сервісу відрізняється від виданого до нього"""
+        data_dir = tempfile.mkdtemp(prefix="registry-restart-")
+        first = run_registry_process(data_dir, (
+            "app.register_service(app.ServiceRegistration(service_name='task-service', "
+            "host='localhost', port=8001, version='1.0.0')); app.store.close()"
+        ))
+        second = run_registry_process(data_dir, "")
+
+        assert first != second
+
+
+def run_registry_process(data_dir: str, statements: str) -> int:
+    """Окремий процес реєстру над data_dir; повертає індекс task-service."""
+    code = f"import app; {statements}\nprint(app.service_index.get('task-service'))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.abspath(registry.__file__)),
+        env={**os.environ, "REGISTRY_DATA_DIR": data_dir},
+        capture_output=True, text=True, timeout=60, check=True
+    )
+    return int(result.stdout.strip().splitlines()[-1])
+
+
+# ============================================
+# Тести індексу discovery
+# ============================================
+
+def register(port: int = 8001) -> str:
+    return registry.register_service(registry.ServiceRegistration(**registration(port=port)))["service_id"]
+
+
+def expire_at(now: float) -> set:
+    with registry.lock:
+        return registry.expire_due_locked(now)
+
+
+def discovered_port(service_name: str) -> int:
+    return registry.discover_service(service_name)["port"]
+
+
+class TestDiscoveryIndex:
+    """Тести індексу services_by_name та знімків up_instances (copy-on-write)"""
+
+    def test_discover_only_up_instances_of_service(self):
+        """Тест: discover повертає лише UP-екземпляри потрібного сервісу"""
+        stale = register(8001)
+        registered = registry.services_registry[stale]["last_heartbeat"].timestamp()
+        expire_at(registered + registry.SERVICE_TTL + registry.EXPIRY_TICK)
+        register(8002)
+        registry.register_service(registry.ServiceRegistration(**registration("category-service", 8101)))
+
+        assert registry.services_registry[stale]["status"] == "DOWN"
+        assert discovered_port("task-service") == 8002
+        assert discovered_port("category-service") == 8101
+        assert registry.up_instances["task-service"] == (("localhost", 8002),)
+        with pytest.raises(registry.HTTPException) as error:
+            registry.discover_service("notification-service")
+        assert error.value.status_code == 404
+
+    def test_index_follows_register_down_and_evict(self):
+        """Тест: індекс і знімок оновлюються при реєстрації, DOWN та видаленні"""
+        service_id = register(8001)
+        registered_index = registry.service_index["task-service"]
+        assert list(registry.services_by_name["task-service"]) == [service_id]
+        assert registry.up_instances["task-service"] == (("localhost", 8001),)
+
+        registered = registry.services_registry[service_id]["last_heartbeat"].timestamp()
+        expire_at(registered + registry.SERVICE_TTL + registry.EXPIRY_TICK)
+        down_index = registry.service_index["task-service"]
+        assert down_index > registered_index
+        assert "task-service" not in registry.up_instances
+        # DOWN-екземпляр лишається в індексі до видалення
+        assert list(registry.services_by_name["task-service"]) == [service_id]
+
+        expire_at(registered + registry.SERVICE_TTL + registry.EVICTION_GRACE + registry.EXPIRY_TICK)
+        assert "task-service" not in registry.services_by_name
+        # Набір UP-екземплярів не змінився - індекс теж
+        assert registry.service_index["task-service"] == down_index
+
+    def test_deregister_replaces_snapshot(self):
+        """Тест: видалення екземпляра публікує новий кортеж, старий знімок не змінюється"""
+        first = register(8001)
+        register(8002)
+        before = registry.up_instances["task-service"]
+
+        registry.deregister_service(first)
+
+        assert before == (("localhost", 8001), ("localhost", 8002))
+        assert registry.up_instances["task-service"] == (("localhost", 8002),)
+        assert discovered_port("task-service") == 8002
+
+    def test_discover_does_not_take_lock(self):
+        """Тест: discover відповідає, поки lock утримує записувач"""
+        register(8001)
+        result = []
+
+        with registry.lock:
+            reader = threading.Thread(target=lambda: result.append(discovered_port("task-service")))
+            reader.start()
+            reader.join(timeout=2)
+            finished = not reader.is_alive()
+
+        assert finished
+        assert result == [8001]
+
+    def test_readers_see_consistent_snapshots(self):
+        """Тест: під час реєстрацій і видалень читачі бачать лише цілі знімки"""
+        register(8001)
+        stop = threading.Event()
+        seen = set()
+
+        def writer():
+            while not stop.is_set():
+                service_id = register(8002)
+                registry.deregister_service(service_id)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(20000):
+                seen.add(registry.up_instances["task-service"])
+                assert discovered_port("task-service") == 8001
+        finally:
+            stop.set()
+            thread.join()
+
+        assert seen <= {(("localhost", 8001),), (("localhost", 8001), ("localhost", 8002))}
+
+
+# ============================================
+# Тести TTL та видалення
+# ============================================
+
+class TestExpiry:
+    """Тести черги дедлайнів: DOWN після TTL, видалення після grace"""
+
+    def test_down_after_ttl(self):
+        """Тест: без heartbeat екземпляр стає DOWN через SERVICE_TTL"""
+        service_id = register()
+        registered = registry.services_registry[service_id]["last_heartbeat"].timestamp()
+
+        assert expire_at(registered + registry.SERVICE_TTL - 1) == set()
+        assert registry.services_registry[service_id]["status"] == "UP"
+
+        assert expire_at(registered + registry.SERVICE_TTL + registry.EXPIRY_TICK) == {"task-service"}
+        assert registry.services_registry[service_id]["status"] == "DOWN"
+        assert "task-service" not in registry.up_instances
+
+    def test_evicted_after_grace(self):
+        """Тест: DOWN-екземпляр видаляється лише після EVICTION_GRACE"""
+        service_id = register()
+        registered = registry.services_registry[service_id]["last_heartbeat"].timestamp()
+        expire_at(registered + registry.SERVICE_TTL + registry.EXPIRY_TICK)
+
+        expire_at(registered + registry.SERVICE_TTL + registry.EVICTION_GRACE - 1)
+        assert service_id in registry.services_registry
+
+        expire_at(registered + registry.SERVICE_TTL + registry.EVICTION_GRACE + registry.EXPIRY_TICK)
+        assert service_id not in registry.services_registry
+        assert "task-service" not in registry.services_by_name
+        with pytest.raises(registry.HTTPException) as error:
+            registry.heartbeat(service_id)
+        assert error.value.status_code == 404
+
+    def test_heartbeat_moves_deadline(self):
+        """Тест: heartbeat переносить дедлайн при витяганні з heap"""
+        service_id = register()
+        registered = registry.services_registry[service_id]["last_heartbeat"].timestamp()
+        with registry.lock:
+            registry.renew_locked(service_id, datetime.fromtimestamp(registered + 10))
+
+        assert expire_at(registered + registry.SERVICE_TTL + registry.EXPIRY_TICK) == set()
+        assert registry.services_registry[service_id]["status"] == "UP"
+        assert registry.expiry_deadlines[service_id] >= registered + 10 + registry.SERVICE_TTL
+
+        expire_at(registered + 10 + registry.SERVICE_TTL + registry.EXPIRY_TICK)
+        assert registry.services_registry[service_id]["status"] == "DOWN"
+
+    def test_heartbeat_after_down_restores_up(self):
+        """Тест: heartbeat DOWN-екземпляра повертає його в discovery"""
+        service_id = register()
+        registered = registry.services_registry[service_id]["last_heartbeat"].timestamp()
+        expire_at(registered + registry.SERVICE_TTL + registry.EXPIRY_TICK)
+
+        with registry.lock:
+            registry.renew_locked(service_id, datetime.fromtimestamp(registered + 40))
+
+        assert registry.services_registry[service_id]["status"] == "UP"
+        assert registry.up_instances["task-service"] == (("localhost", 8001),)
+        # Запланована перевірка видалення застаріла - діє новий TTL від heartbeat
+        expire_at(registered + 40 + registry.SERVICE_TTL - 1)
+        assert registry.services_registry[service_id]["status"] == "UP"
+
+    def test_deadlines_share_tick(self):
+        """Тест: дедлайни округлюються до такту, тож одне пробудження обробляє пачку"""
+        first, second = register(8001), register(8002)
+
+        deadlines = {registry.expiry_deadlines[first], registry.expiry_deadlines[second]}
+        assert all(deadline % registry.EXPIRY_TICK == 0 for deadline in deadlines)
+
+        expire_at(max(deadlines))
+        assert registry.services_registry[first]["status"] == "DOWN"
+        assert registry.services_registry[second]["status"] == "DOWN"
+
+    def test_restored_stale_entry_kept_for_ttl(self, monkeypatch):
+        """Тест: екземпляр зі старого знімка не видаляється одразу після перезапуску"""
+        stale = datetime.now() - timedelta(minutes=3)
+
+        def restore():
+            registry.services_registry["task-service_localhost_8001"] = make_entry(
+                "task-service_localhost_8001", stale)
+            return 1
+        monkeypatch.setattr(registry.store, "restore", restore)
+        registry.restore_registry()
+        restarted = time.time()
+
+        assert registry.services_registry["task-service_localhost_8001"]["status"] == "DOWN"
+        expire_at(restarted + registry.SERVICE_TTL - 1)
+        assert "task-service_localhost_8001" in registry.services_registry
+
+        with registry.lock:
+            registry.renew_locked("task-service_localhost_8001", datetime.fromtimestamp(restarted + 10))
+        expire_at(restarted + registry.SERVICE_TTL + registry.EXPIRY_TICK)
+        assert registry.services_registry["task-service_localhost_8001"]["status"] == "UP"
+
+    def test_restored_stale_entry_evicted_without_heartbeat(self, monkeypatch):
+        """Тест: без heartbeat відновлений екземпляр видаляється після першого TTL"""
+        stale = datetime.now() - timedelta(minutes=3)
+
+        def restore():
+            registry.services_registry["task-service_localhost_8001"] = make_entry(
+                "task-service_localhost_8001", stale)
+            return 1
+        monkeypatch.setattr(registry.store, "restore", restore)
+        registry.restore_registry()
+
+        expire_at(time.time() + registry.SERVICE_TTL + registry.EXPIRY_TICK)
+        assert "task-service_localhost_8001" not in registry.services_registry
+
+
+# ============================================
+# Тести пакетних heartbeat-ів
+# ============================================
+
+class TestHeartbeatBatch:
+    """Тести POST /heartbeat/batch та AsyncHeartbeat"""
+
+    def test_batch_reports_ok_and_not_found(self):
+        """Тест: відомі екземпляри - ok, невідомі - not_found"""
+        service_id = register()
+
+        result = registry.heartbeat_batch(registry.HeartbeatBatch(service_ids=[service_id, "ghost_localhost_1"]))
+
+        assert result["results"] == {service_id: "ok", "ghost_localhost_1": "not_found"}
+
+    def test_batch_restores_down_instance(self):
+        """Тест: пакетний heartbeat повертає DOWN-екземпляр у discovery"""
+        service_id = register()
+        registered = registry.services_registry[service_id]["last_heartbeat"].timestamp()
+        expire_at(registered + registry.SERVICE_TTL + registry.EXPIRY_TICK)
+
+        registry.heartbeat_batch(registry.HeartbeatBatch(service_ids=[service_id]))
+
+        assert registry.services_registry[service_id]["status"] == "UP"
+        assert registry.up_instances["task-service"] == (("localhost", 8001),)
+
+    def test_async_heartbeat_reregisters_evicted(self):
+        """Тест: AsyncHeartbeat реєструє знову екземпляр, видалений Реєстром"""
+        async def scenario():
+            heartbeat = AsyncHeartbeat(registry_url="http://registry")
+            heartbeat._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=registry.app),
+                                                  base_url="http://registry")
+            service_id = await heartbeat.register("task-service", "localhost", 8001)
+            with registry.lock:
+                registry.remove_service_locked(service_id)
+
+            results = await heartbeat.beat()
+            await heartbeat.stop(deregister=False)
+            return service_id, results, heartbeat.stats()
+
+        service_id, results, stats = asyncio.run(scenario())
+
+        assert results == {service_id: "not_found"}
+        assert service_id in registry.services_registry
+        assert stats["instances"] == [service_id]
+        assert stats["reregistered"] == 1
+
+    def test_async_heartbeat_keeps_registration_when_retry_fails(self):
+        """Тест: невдала повторна реєстрація не втрачає екземпляр - повтор у наступному циклі"""
+        registry_up = {"register": True}
+        known = set()
+
+        def handler(request):
+            if request.url.path == "/register":
+                if not registry_up["register"]:
+                    return httpx.Response(503)
+                known.add("task-service_localhost_8001")
+                return httpx.Response(200, json={"service_id": "task-service_localhost_8001"})
+            ids = json.loads(request.content)["service_ids"]
+            return httpx.Response(200, json={"results": {
+                service_id: "ok" if service_id in known else "not_found" for service_id in ids
+            }})
+
+        async def scenario():
+            heartbeat = AsyncHeartbeat(registry_url="http://registry")
+            heartbeat._client = httpx.AsyncClient(transport=httpx.MockTransport(handler),
+                                                  base_url="http://registry")
+            await heartbeat.register("task-service", "localhost", 8001)
+            known.clear()  # Реєстр втратив стан
+            registry_up["register"] = False
+            first = await heartbeat.beat()
+            instances_after_failure = heartbeat.stats()["instances"]
+            registry_up["register"] = True
+            second = await heartbeat.beat()
+            third = await heartbeat.beat()
+            await heartbeat.stop(deregister=False)
+            return first, instances_after_failure, second, third, heartbeat.stats()
+
+        first, instances_after_failure, second, third, stats = asyncio.run(scenario())
+
+        assert first == {"task-service_localhost_8001": "not_found"}
+        assert instances_after_failure == ["task-service_localhost_8001"]
+        assert second == {"task-service_localhost_8001": "not_found"}
+        assert third == {"task-service_localhost_8001": "ok"}
+        assert stats["reregistered"] == 1
+
+
+# ============================================
+# Тести RegistryStore
+# ============================================
+
+def make_entry(service_id: str, last_heartbeat: datetime) -> dict:
+    service_name, host, port = service_id.split("_")
+    return {
+        "service_name": service_name, "host": host, "port": int(port), "version": "1.0.0",
+        "status": "UP", "registered_at": last_heartbeat, "last_heartbeat": last_heartbeat,
+        "metadata": {}
+    }
+
+
+def open_store(directory: str) -> RegistryStore:
+    """Сховище над directory з відновленим станом (без фонового потоку)."""
+    store = RegistryStore(directory, {}, threading.Lock())
+    store.restore()
+    return store
+
+
+class TestRegistryStore:
+    """Тести журналу, знімків та відновлення стану"""
+
+    def test_restore_skips_torn_last_line(self, tmp_path):
+        """Тест: обірваний останній рядок журналу відкидається, решта відновлюється"""
+        started = datetime(2026, 1, 1, 12, 0, 0)
+        store = open_store(str(tmp_path))
+        store.append_register("task_localhost_8001", make_entry("task_localhost_8001", started))
+        store.append_register("task_localhost_8002", make_entry("task_localhost_8002", started))
+        store.append_heartbeat("task_localhost_8001", started + timedelta(seconds=10))
+        store.close()
+        log_path = tmp_path / f"registry.{store.generation}.log"
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write('{"op":"deregister","id":"task_loc')
+
+        restored = open_store(str(tmp_path))
+
+        assert sorted(restored.registry) == ["task_localhost_8001", "task_localhost_8002"]
+        assert restored.registry["task_localhost_8001"]["last_heartbeat"] == started + timedelta(seconds=10)
+        # Записи після відновлення йдуть у новий журнал, а не після обірваного рядка
+        assert restored.generation == store.generation + 1
+        restored.append_deregister("task_localhost_8002")
+        restored.close()
+        assert sorted(open_store(str(tmp_path)).registry) == ["task_localhost_8001"]
+
+    def test_restore_across_snapshot(self, tmp_path):
+        """Тест: знімок + журнал нового покоління; старі журнали видалено"""
+        started = datetime(2026, 1, 1, 12, 0, 0)
+        store = open_store(str(tmp_path))
+        store.registry["task_localhost_8001"] = make_entry("task_localhost_8001", started)
+        store.append_register("task_localhost_8001", store.registry["task_localhost_8001"])
+        store.registry["task_localhost_8002"] = make_entry("task_localhost_8002", started)
+        store.append_register("task_localhost_8002", store.registry["task_localhost_8002"])
+        old_generation = store.generation
+
+        store.snapshot()
+        store.append_deregister("task_localhost_8001")
+        store.append_heartbeat("task_localhost_8002", started + timedelta(seconds=10))
+        store.append_register("task_localhost_8003", make_entry("task_localhost_8003", started))
+        store.close()
+
+        assert store.generation == old_generation + 1
+        assert not (tmp_path / f"registry.{old_generation}.log").exists()
+        restored = open_store(str(tmp_path))
+        assert sorted(restored.registry) == ["task_localhost_8002", "task_localhost_8003"]
+        assert restored.registry["task_localhost_8002"]["last_heartbeat"] == started + timedelta(seconds=10)
+
+    def test_restore_after_failed_snapshot(self, tmp_path, monkeypatch):
+        """Тест: збій між переходом на новий журнал і записом знімка - читаються обидва журнали"""
+        started = datetime(2026, 1, 1, 12, 0, 0)
+        store = open_store(str(tmp_path))
+        store.append_register("task_localhost_8001", make_entry("task_localhost_8001", started))
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+        monkeypatch.setattr(storage.os, "replace", fail_replace)
+        with pytest.raises(OSError):
+            store.snapshot()
+        monkeypatch.undo()
+        store.append_register("task_localhost_8002", make_entry("task_localhost_8002", started))
+        store.close()
+
+        restored = open_store(str(tmp_path))
+        assert sorted(restored.registry) == ["task_localhost_8001", "task_localhost_8002"]
+
+    def test_register_fsync_outside_registry_lock(self, monkeypatch):
+        """Тест: реєстрація та видалення скидають журнал на диск після звільнення lock"""
+        fsyncs = []
+        real_fsync = os.fsync
+
+        def fsync(fd):
+            fsyncs.append(registry.lock.locked())
+            real_fsync(fd)
+        monkeypatch.setattr(storage.os, "fsync", fsync)
+
+        service_id = register(8001)
+        registry.deregister_service(service_id)
+
+        assert fsyncs and not any(fsyncs)
+        # Відповідь - лише після того, як записи скинуто на диск
+        assert registry.store._synced == registry.store._appended
+
+    def test_concurrent_flushes_grouped(self, tmp_path, monkeypatch):
+        """Тест: одночасні flush() об'єднуються - fsync значно менше, ніж записів"""
+        store = open_store(str(tmp_path))
+        started = datetime(2026, 1, 1, 12, 0, 0)
+        fsyncs = []
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            fsyncs.append(fd)
+            time.sleep(0.05)
+            real_fsync(fd)
+        monkeypatch.setattr(storage.os, "fsync", slow_fsync)
+
+        def writer(port):
+            service_id = f"task_localhost_{port}"
+            with store.lock:
+                store.append_register(service_id, make_entry(service_id, started))
+            store.flush()
+
+        threads = [threading.Thread(target=writer, args=(8000 + i,)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.flush()
+        store.close()
+
+        assert len(fsyncs) <= 3
+        assert len(open_store(str(tmp_path)).registry) == 10
+
+    def test_snapshot_encodes_outside_lock(self, tmp_path, monkeypatch):
+        """Тест: під lock знімок лише копіює записи; кодування та fsync - поза ним"""
+        store = open_store(str(tmp_path))
+        started = datetime(2026, 1, 1, 12, 0, 0)
+        for port in (8001, 8002):
+            service_id = f"task_localhost_{port}"
+            store.registry[service_id] = make_entry(service_id, started)
+            store.append_register(service_id, store.registry[service_id])
+        locked = []
+        real_encode, real_fsync = storage.encode_entry, os.fsync
+        monkeypatch.setattr(storage, "encode_entry",
+                            lambda entry: locked.append(store.lock.locked()) or real_encode(entry))
+        monkeypatch.setattr(storage.os, "fsync", lambda fd: locked.append(store.lock.locked()) or real_fsync(fd))
+
+        store.snapshot()
+        store.close()
+
+        assert locked and not any(locked)
+        assert sorted(open_store(str(tmp_path)).registry) == ["task_localhost_8001", "task_localhost_8002"]
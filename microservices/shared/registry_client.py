@@ -3,10 +3,12 @@
 Використовується всіма мікросервісами для реєстрації та discovery.
 """
 
+import asyncio
+import httpx
 import requests
 import threading
 import time
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 
 class RegistryClient:
@@ -28,6 +30,13 @@ class RegistryClient:
     
     def register(self) -> bool:
         """Реєстрація сервісу в реєстрі"""
+        if self._send_registration():
+            self._start_heartbeat()
+            return True
+        return False
+    
+    def _send_registration(self) -> bool:
+        """POST /register; при успіху запам'ятовує service_id"""
         try:
             response = requests.post(
                 f"{self.REGISTRY_URL}/register",
@@ -43,7 +52,6 @@ class RegistryClient:
                 data = response.json()
                 self.service_id = data.get("service_id")
                 print(f"[{self.service_name}] Registered with ID: {self.service_id}")
-                self._start_heartbeat()
                 return True
         except Exception as e:
             print(f"[{self.service_name}] Registration failed: {e}")
@@ -66,17 +74,24 @@ class RegistryClient:
         self._heartbeat_thread.start()
     
     def _heartbeat_loop(self):
-        """Цикл відправки heartbeat"""
+        """
+        Цикл відправки heartbeat. Якщо Registry не знає екземпляра (404 після
+        eviction або втрати стану), реєстрація повторюється.
+        """
         while self._running:
             time.sleep(10)
-            if self.service_id:
-                try:
-                    requests.post(
-                        f"{self.REGISTRY_URL}/heartbeat/{self.service_id}",
-                        timeout=5
-                    )
-                except:
-                    pass
+            if not self._running:
+                break
+            try:
+                response = requests.post(
+                    f"{self.REGISTRY_URL}/heartbeat/{self.service_id}",
+                    timeout=5
+                )
+            except Exception:
+                continue
+            if response.status_code == 404:
+                print(f"[{self.service_name}] Unknown to registry, registering again")
+                self._send_registration()
     
     @staticmethod
     def discover(service_name: str) -> Optional[str]:
@@ -96,3 +111,148 @@ class RegistryClient:
         except Exception as e:
             print(f"[Discovery] Failed to discover {service_name}: {e}")
         return None
+    
+    @staticmethod
+    def watch(service_name: str, index: int = 0, timeout: float = 30.0) -> Optional[Tuple[int, List[str]]]:
+        """
+        Блокуючий запит змін сервісу (GET /watch/{service_name}).
+        Registry відповідає, щойно набір UP-екземплярів відрізняється від
+        стану з індексом index, або після timeout секунд.
+        
+        Returns:
+            (новий індекс, URL UP-екземплярів) або None при помилці
+        """
+        try:
+            response = requests.get(
+                f"{RegistryClient.REGISTRY_URL}/watch/{service_name}",
+                params={"index": index, "timeout": timeout},
+                timeout=timeout + 5
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return data["index"], [instance["url"] for instance in data["instances"]]
+        except Exception as e:
+            print(f"[Discovery] Watch failed for {service_name}: {e}")
+        return None
+
+
+class AsyncHeartbeat:
+    """
+    Heartbeat на asyncio для кількох екземплярів в одному процесі.
+    
+    Раз на interval секунд усі зареєстровані екземпляри оновлюються одним
+    запитом POST /heartbeat/batch через keep-alive з'єднання httpx.AsyncClient
+    (замість окремого потоку та запиту на кожен екземпляр). Екземпляр, який
+    Registry вже видалив (not_found), реєструється знову; якщо повторна
+    реєстрація не вдалася, він лишається в пакеті до наступного циклу.
+    """
+    
+    def __init__(self, interval: float = 10.0, timeout: float = 5.0,
+                 registry_url: Optional[str] = None):
+        self.interval = interval
+        self._client = httpx.AsyncClient(base_url=registry_url or RegistryClient.REGISTRY_URL,
+                                         timeout=timeout)
+        self._registrations: Dict[str, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._batches = 0
+        self._errors = 0
+        self._reregistered = 0
+    
+    async def register(self, service_name: str, host: str, port: int,
+                       version: str = "1.0.0", metadata: Optional[dict] = None) -> Optional[str]:
+        """
+        Реєстрація екземпляра та додавання його до пакета heartbeat-ів.
+        
+        Returns:
+            service_id або None при помилці
+        """
+        registration = {
+            "service_name": service_name,
+            "host": host,
+            "port": port,
+            "version": version,
+            "metadata": metadata
+        }
+        try:
+            response = await self._client.post("/register", json=registration)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"[{service_name}] Registration failed: {e}")
+            return None
+        service_id = response.json()["service_id"]
+        self._registrations[service_id] = registration
+        print(f"[{service_name}] Registered with ID: {service_id}")
+        return service_id
+    
+    async def deregister(self, service_id: str):
+        """Видалення екземпляра з реєстру та з пакета"""
+        if self._registrations.pop(service_id, None) is None:
+            return
+        try:
+            await self._client.delete(f"/deregister/{service_id}")
+        except Exception:
+            pass
+    
+    async def beat(self) -> Dict[str, str]:
+        """
+        Один пакетний heartbeat усіх екземплярів.
+        
+        Returns:
+            {service_id: "ok" | "not_found"}
+        """
+        if not self._registrations:
+            return {}
+        response = await self._client.post(
+            "/heartbeat/batch", json={"service_ids": list(self._registrations)}
+        )
+        response.raise_for_status()
+        self._batches += 1
+        results = response.json()["results"]
+        for service_id, result in results.items():
+            registration = self._registrations.get(service_id)
+            if result == "not_found" and registration is not None:
+                # Registry видалив екземпляр (перезапуск без даних або eviction)
+                new_id = await self.register(**registration)
+                if new_id is None:
+                    continue
+                if new_id != service_id:
+                    self._registrations.pop(service_id, None)
+                self._reregistered += 1
+        return results
+    
+    def start(self):
+        """Запуск фонового heartbeat у поточному циклі подій"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self, deregister: bool = True):
+        """Зупинка heartbeat та (за замовчуванням) видалення всіх реєстрацій"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if deregister:
+            for service_id in list(self._registrations):
+                await self.deregister(service_id)
+        await self._client.aclose()
+    
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.beat()
+            except Exception as e:
+                # Registry недоступний: спробуємо в наступному циклі
+                self._errors += 1
+                print(f"[Heartbeat] Batch heartbeat failed: {e}")
+    
+    def stats(self) -> dict:
+        return {
+            "instances": sorted(self._registrations),
+            "batches": self._batches,
+            "errors": self._errors,
+            "reregistered": self._reregistered,
+        }
@@ -8,6 +8,7 @@ Task Service (Мікросервіс управління завданнями)
 
 import uvicorn
 import mysql.connector
+from mysql.connector import errorcode
 import requests
 import threading
 import time
@@ -73,6 +74,21 @@ def get_db():
     return mysql.connector.connect(**DB_CONFIG)
 
 
+# Версія колекції завдань для ETag svc_task_core (back/migrations/002_collection_versions.sql):
+# один UPDATE на транзакцію запису, останнім перед COMMIT; рядок - connection_id % 16
+TASKS_VERSION_SHARDS = 16
+BUMP_TASKS_VERSION_SQL = ("UPDATE CollectionVersions SET Version = Version + 1 "
+                          "WHERE Collection = 'tasks' AND Shard = %s")
+
+def bump_tasks_version(conn, cursor):
+    try:
+        cursor.execute(BUMP_TASKS_VERSION_SQL, (conn.connection_id % TASKS_VERSION_SHARDS,))
+    except mysql.connector.ProgrammingError as e:
+        # Міграцію версій не застосовано - ETag не використовується
+        if e.errno != errorcode.ER_NO_SUCH_TABLE:
+            raise
+
+
 # ============== РЕЄСТРАЦІЯ ==============
 service_id = None
 
@@ -93,11 +109,17 @@ def register_service():
 def heartbeat_loop():
     while True:
         time.sleep(10)
-        if service_id:
-            try:
-                requests.post(f"{REGISTRY_URL}/heartbeat/{service_id}", timeout=5)
-            except:
-                pass
+        if not service_id:
+            register_service()
+            continue
+        try:
+            r = requests.post(f"{REGISTRY_URL}/heartbeat/{service_id}", timeout=5)
+        except Exception:
+            continue
+        # Реєстр не знає екземпляра (eviction або втрата стану) - реєструємося знову
+        if r.status_code == 404:
+            print(f"[{SERVICE_NAME}] Unknown to registry, registering again")
+            register_service()
 
 threading.Thread(target=heartbeat_loop, daemon=True).start()
 
@@ -118,8 +140,10 @@ def create_task(task: TaskCreate):
             INSERT INTO Tasks (User_ID, Category_ID, Title, Priority, Status, DueDate, CreatedAt)
             VALUES (%s, %s, %s, %s, 'Pending', %s, NOW())
         """, (task.user_id, task.category_id, task.title, task.priority, task.due_date))
+        task_id = cursor.lastrowid
+        bump_tasks_version(conn, cursor)
         conn.commit()
-        return APIResponse(success=True, task_id=cursor.lastrowid, message="Task created")
+        return APIResponse(success=True, task_id=task_id, message="Task created")
     except Exception as e:
         conn.rollback()
         raise HTTPException(status_code=500, detail=str(e))
@@ -188,8 +212,11 @@ def update_status(task_id: int, new_status: str):
     cursor = conn.cursor()
     try:
         cursor.execute("UPDATE Tasks SET Status = %s WHERE idTask = %s", (new_status, task_id))
+        updated = cursor.rowcount
+        if updated:
+            bump_tasks_version(conn, cursor)
         conn.commit()
-        if cursor.rowcount == 0:
+        if updated == 0:
             raise HTTPException(status_code=404, detail="Task not found")
         return APIResponse(success=True, task_id=task_id, message=f"Status updated to {new_status}")
     finally:
@@ -204,8 +231,11 @@ def delete_task(task_id: int):
     cursor = conn.cursor()
     try:
         cursor.execute("DELETE FROM Tasks WHERE idTask = %s", (task_id,))
+        deleted = cursor.rowcount
+        if deleted:
+            bump_tasks_version(conn, cursor)
         conn.commit()
-        if cursor.rowcount == 0:
+        if deleted == 0:
             raise HTTPException(status_code=404, detail="Task not found")
         return APIResponse(success=True, task_id=task_id, message="Task deleted")
     finally: